@@ -0,0 +1,103 @@
+"""Benchmark for the latency of `myver --current`.
+
+Run with `python -m benchmarks.bench_current`. The process time is the
+wall time of `python -m myver -c` minus the wall time of starting an
+empty interpreter, which is the part that myver is responsible for.
+"""
+import contextlib
+import io
+import os
+import subprocess
+import sys
+import tempfile
+import textwrap
+import time
+
+from myver.cli import cli_entry
+
+RUNS = 20
+TARGET = 0.030
+
+CONFIG = textwrap.dedent("""\
+    files:
+        - path: 'setup.py'
+        - path: 'docs/*.md'
+          patterns:
+            - 'MyVer {{ version }}'
+        - path: 'myver/__init__.py'
+          patterns:
+            - "__version__ = '{{ version }}'"
+
+    parts:
+        major:
+            value: 3
+            requires: minor
+        minor:
+            value: 9
+            prefix: '.'
+            requires: patch
+        patch:
+            value: 2
+            prefix: '.'
+        pre:
+            value: alpha
+            prefix: '-'
+            requires: prenum
+            identifier:
+                strings: [ 'alpha', 'beta', 'rc' ]
+        prenum:
+            value: 1
+            prefix: '.'
+            number:
+                start: 1
+        build:
+            value: null
+            prefix: '+'
+            number:
+                label: 'build'
+                label-suffix: '.'
+                start: 1
+""")
+
+
+def best_wall_time(args, cwd: str) -> float:
+    env = {**os.environ, 'PYTHONPATH': os.getcwd(),
+           'PYTHONPYCACHEPREFIX': os.path.join(cwd, 'pycache')}
+    # Bytecode is written to the private cache by the first run, the same
+    # as it would be for an installed package.
+    env.pop('PYTHONDONTWRITEBYTECODE', None)
+    best = float('inf')
+    subprocess.run(args, cwd=cwd, env=env, stdout=subprocess.DEVNULL)
+    for _ in range(RUNS):
+        start = time.perf_counter()
+        subprocess.run(args, cwd=cwd, env=env, check=True,
+                       stdout=subprocess.DEVNULL)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    with tempfile.TemporaryDirectory() as directory:
+        config_path = os.path.join(directory, 'myver.yml')
+        with open(config_path, 'w') as file:
+            file.write(CONFIG)
+
+        start = time.perf_counter()
+        for _ in range(RUNS):
+            with contextlib.redirect_stdout(io.StringIO()):
+                cli_entry(['--config', config_path, '-c'])
+        in_process = (time.perf_counter() - start) / RUNS
+
+        interpreter = best_wall_time([sys.executable, '-c', 'pass'], directory)
+        current = best_wall_time(
+            [sys.executable, '-m', 'myver', '-c'], directory)
+
+    process = current - interpreter
+    print(f'in process: {in_process * 1000:.2f}ms')
+    print(f'interpreter startup: {interpreter * 1000:.1f}ms')
+    print(f'myver -c: {current * 1000:.1f}ms, {process * 1000:.1f}ms over '
+          f'startup (target {TARGET * 1000:.0f}ms)')
+
+
+if __name__ == '__main__':
+    main()
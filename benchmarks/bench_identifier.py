@@ -0,0 +1,59 @@
+"""Benchmarks for identifier parts with very long strings Lists.
+
+Run with `python -m benchmarks.bench_identifier`.
+"""
+import timeit
+
+from myver.part import IdentifierPart
+
+SIZES = [10, 1_000, 10_000, 100_000]
+NUMBER = 10_000
+
+
+def bench_bump(size: int) -> float:
+    strings = [f'codename{i}' for i in range(size)]
+    part = IdentifierPart(key='codename', value=None, strings=strings)
+
+    def bump():
+        # Bump from the second last string so that the lookup is as far
+        # into the List as possible.
+        part.value = strings[-2]
+        part.next_value()
+
+    return timeit.timeit(bump, number=NUMBER)
+
+
+def bench_validate_start(size: int) -> float:
+    strings = [f'codename{i}' for i in range(size)]
+    part = IdentifierPart(key='codename', value=None, strings=strings)
+    return timeit.timeit(
+        lambda: part._validate_start(strings[-1]), number=NUMBER)
+
+
+def bench_index(size: int) -> float:
+    strings = [f'codename{i}' for i in range(size)]
+    part = IdentifierPart(key='codename', value=None, strings=strings)
+    return timeit.timeit(lambda: part.index(strings[-1]), number=NUMBER)
+
+
+def bench_construct(size: int) -> float:
+    strings = [f'codename{i}' for i in range(size)]
+    return timeit.timeit(
+        lambda: IdentifierPart(key='codename', value=None, strings=strings),
+        number=10)
+
+
+def main():
+    print(f'{"size":>8}  {"bump":>10}  {"validate":>10}  {"index":>10}  '
+          f'{"construct":>10}')
+    for size in SIZES:
+        per_op = 1_000_000 / NUMBER
+        print(f'{size:>8}  '
+              f'{bench_bump(size) * per_op:>8.3f}us  '
+              f'{bench_validate_start(size) * per_op:>8.3f}us  '
+              f'{bench_index(size) * per_op:>8.3f}us  '
+              f'{bench_construct(size) * 100_000:>8.3f}us')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,89 @@
+"""Memory benchmark for holding many versions in memory at once.
+
+Run with `python -m benchmarks.bench_memory`. Pass `--against <rev>` to
+also measure the part classes as they were at a git revision, e.g.
+`python -m benchmarks.bench_memory --against HEAD~1`.
+"""
+import argparse
+import subprocess
+import tracemalloc
+import types
+
+from myver import part as part_module
+from myver.snapshot import VersionSchema
+from myver.version import Version
+
+COUNT = 100_000
+
+
+def semver(module, index: int) -> Version:
+    return Version([
+        module.NumberPart(key='major', value=index % 7, requires='minor'),
+        module.NumberPart(key='minor', value=index % 13, prefix='.',
+                          requires='patch'),
+        module.NumberPart(key='patch', value=index, prefix='.'),
+        module.IdentifierPart(key='pre', value='beta', prefix='-',
+                              requires='prenum', strings=STRINGS),
+        module.NumberPart(key='prenum', value=1, prefix='.', start=1),
+        module.NumberPart(key='build', value=None, prefix='+',
+                          label='build', label_suffix='.', start=1),
+    ])
+
+
+STRINGS = ['alpha', 'beta', 'rc']
+
+
+def measure(module, count: int) -> int:
+    """Get the bytes allocated per version when holding `count` of them."""
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    versions = [semver(module, i) for i in range(count)]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    assert len(versions) == count
+    return (after - before) // count
+
+
+def measure_snapshots(count: int) -> int:
+    """Get the bytes allocated per snapshot when holding `count` of them."""
+    schema = VersionSchema(semver(part_module, 0).parts)
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    snapshots = [
+        schema.snapshot((i % 7, i % 13, i, 'beta', 1, None))
+        for i in range(count)
+    ]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    assert len(snapshots) == count
+    return (after - before) // count
+
+
+def module_at(rev: str) -> types.ModuleType:
+    """Load `myver/part.py` as it was at a git revision."""
+    source = subprocess.run(
+        ['git', 'show', f'{rev}:myver/part.py'],
+        check=True, capture_output=True, text=True).stdout
+    module = types.ModuleType(f'part_at_{rev}')
+    exec(compile(source, f'{rev}:myver/part.py', 'exec'), module.__dict__)
+    return module
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--against', type=str)
+    parser.add_argument('--count', type=int, default=COUNT)
+    args = parser.parse_args()
+
+    current = measure(part_module, args.count)
+    print(f'current: {current} bytes per version')
+    snapshots = measure_snapshots(args.count)
+    print(f'snapshots: {snapshots} bytes per version')
+    if args.against:
+        baseline = measure(module_at(args.against), args.count)
+        print(f'{args.against}: {baseline} bytes per version '
+              f'({current / baseline:.0%} of baseline)')
+
+
+if __name__ == '__main__':
+    main()
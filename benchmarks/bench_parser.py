@@ -0,0 +1,58 @@
+"""Benchmark for parsing version strings in bulk.
+
+Run with `python -m benchmarks.bench_parser`.
+"""
+import random
+import time
+
+from myver.parser import VersionParser
+from myver.part import NumberPart, IdentifierPart
+from myver.snapshot import VersionSnapshot
+from myver.version import Version
+
+COUNT = 200_000
+
+
+def semver() -> Version:
+    return Version([
+        NumberPart(key='major', value=0, requires='minor'),
+        NumberPart(key='minor', value=0, prefix='.', requires='patch'),
+        NumberPart(key='patch', value=0, prefix='.'),
+        IdentifierPart(key='pre', value=None, prefix='-', requires='prenum',
+                       strings=['alpha', 'beta', 'rc']),
+        NumberPart(key='prenum', value=None, prefix='.', start=1),
+        NumberPart(key='build', value=None, prefix='+', label='build',
+                   label_suffix='.', start=1),
+    ])
+
+
+def version_strings(count: int):
+    rng = random.Random(0)
+    snapshot = VersionSnapshot.from_version(semver())
+    keys = ['major', 'minor', 'patch', 'pre', 'prenum', 'build']
+    strings = []
+    for _ in range(count):
+        snapshot = snapshot.bump([rng.choice(keys)])
+        strings.append(str(snapshot))
+    return strings
+
+
+def main():
+    strings = version_strings(COUNT)
+
+    start = time.perf_counter()
+    parser = VersionParser.from_version(semver())
+    compiled = time.perf_counter() - start
+
+    start = time.perf_counter()
+    snapshots = parser.parse_many(strings)
+    parsed = time.perf_counter() - start
+    assert all(snapshots)
+
+    print(f'compile: {compiled * 1000:.3f}ms')
+    print(f'parse_many: {COUNT} strings in {parsed:.3f}s '
+          f'({COUNT / parsed:,.0f} strings/s)')
+
+
+if __name__ == '__main__':
+    main()
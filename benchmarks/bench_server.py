@@ -0,0 +1,81 @@
+"""Benchmark for the latency of requests to a myver server.
+
+Run with `python -m benchmarks.bench_server`.
+"""
+import os
+import tempfile
+import textwrap
+import threading
+import time
+
+from myver.client import Client
+from myver.server import VersionServer
+
+COUNT = 20_000
+
+CONFIG = textwrap.dedent("""\
+    parts:
+        major:
+            value: 3
+            requires: minor
+        minor:
+            value: 9
+            prefix: '.'
+            requires: patch
+        patch:
+            value: 2
+            prefix: '.'
+        pre:
+            value: alpha
+            prefix: '-'
+            requires: prenum
+            identifier:
+                strings: [ 'alpha', 'beta', 'rc' ]
+        prenum:
+            value: 1
+            prefix: '.'
+            number:
+                start: 1
+""")
+
+
+def measure(connection: Client, request) -> list:
+    timings = []
+    for _ in range(COUNT):
+        start = time.perf_counter()
+        request(connection)
+        timings.append(time.perf_counter() - start)
+    timings.sort()
+    return timings
+
+
+def main():
+    with tempfile.TemporaryDirectory() as directory:
+        config_path = os.path.join(directory, 'myver.yml')
+        with open(config_path, 'w') as file:
+            file.write(CONFIG)
+
+        server = VersionServer(f'{config_path}.sock', config_path)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        try:
+            with Client(server.server_address) as connection:
+                requests = {
+                    'current': lambda c: c.current(),
+                    'current major minor': lambda c: c.current(
+                        ['major', 'minor']),
+                    'parse': lambda c: c.parse('4.0.0-rc.2'),
+                }
+                for name, request in requests.items():
+                    timings = measure(connection, request)
+                    mean = sum(timings) / len(timings)
+                    p99 = timings[int(len(timings) * 0.99)]
+                    print(f'{name}: mean {mean * 1e6:.1f}us, '
+                          f'p99 {p99 * 1e6:.1f}us')
+        finally:
+            server.shutdown()
+            server.server_close()
+
+
+if __name__ == '__main__':
+    main()
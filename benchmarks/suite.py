@@ -0,0 +1,234 @@
+"""Benchmark suite for the core paths, with regression checks.
+
+Run with `python -m benchmarks.suite`. Pass `--save <path>` to store the
+results as a JSON baseline, and `--compare <path>` to compare against a
+baseline from an earlier run, which exits with an error if any benchmark
+is slower than the baseline by more than `--tolerance` (e.g. `0.25` for
+25%). Baselines are only comparable on the same machine.
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import timeit
+from typing import Callable, Dict, List
+
+from benchmarks.workloads import write_workload, render_start_version, \
+    write_extended_workload
+from myver.cache import CACHE_ENV
+from myver.check import check_files
+from myver.config import Config, load_version, load_read_only
+
+REPEAT = 5
+
+Case = Callable[[str], Callable[[], object]]
+CASES: Dict[str, Case] = {}
+
+
+def case(name: str):
+    """Register a benchmark. The function is given a temporary directory
+    to set up its workload in, and returns the function to time."""
+    def register(func: Case) -> Case:
+        CASES[name] = func
+        return func
+    return register
+
+
+@case('load_config')
+def load_config(directory: str):
+    path = write_workload(directory, files=1)
+    return lambda: Config(path)
+
+
+@case('load_config_many_parts')
+def load_config_many_parts(directory: str):
+    path = write_workload(directory, parts=200)
+    return lambda: Config(path)
+
+
+@case('load_config_large_identifier')
+def load_config_large_identifier(directory: str):
+    path = write_workload(directory, strings=10_000)
+    return lambda: Config(path)
+
+
+@case('load_version')
+def load_version_only(directory: str):
+    path = write_workload(directory, parts=50, files=1)
+    return lambda: load_version(path)
+
+
+@case('load_version_extends')
+def load_version_extends(directory: str):
+    # The resolved config is cached after the first load, which is what
+    # this times.
+    os.environ[CACHE_ENV] = os.path.join(directory, 'cache')
+    path = write_extended_workload(directory, parts=50, depth=10)
+    load_version(path)
+    return lambda: load_version(path)
+
+
+@case('version_bump')
+def version_bump(directory: str):
+    version = Config(write_workload(directory, parts=50)).version
+    return lambda: version.bump(['n10'])
+
+
+@case('version_bump_large_identifier')
+def version_bump_large_identifier(directory: str):
+    version = Config(write_workload(directory, strings=10_000)).version
+    last = version.part('pre').strings[-2]
+
+    def bump():
+        version.part('pre').value = last
+        version.bump(['pre'])
+    return bump
+
+
+@case('version_reset')
+def version_reset(directory: str):
+    version = Config(write_workload(directory, parts=50)).version
+    return lambda: version.reset(['n0'])
+
+
+@case('version_str')
+def version_str(directory: str):
+    version = Config(write_workload(directory, parts=50)).version
+    return lambda: str(version)
+
+
+@case('config_save')
+def config_save(directory: str):
+    config = Config(write_workload(directory, parts=50))
+    return config.save
+
+
+@case('config_save_state')
+def config_save_state(directory: str):
+    path = write_workload(directory, parts=50)
+    with open(path, 'a') as file:
+        file.write("state: 'state.db'\n")
+    config = Config(path)
+    return config.save
+
+
+def update_files(config: Config, parts: int, in_place: bool = False):
+    old = render_start_version(parts)
+    # The same length as the old version when patching in place.
+    new = old[:-1] + 'x' if in_place else f'{old}.next'
+
+    def update():
+        # Updates and then restores the files so every run does the same
+        # amount of work.
+        config.update_files(old, new, in_place)
+        config.update_files(new, old, in_place)
+    return update
+
+
+@case('update_files_many_files')
+def update_files_many_files(directory: str):
+    config = Config(write_workload(directory, files=200, file_lines=100))
+    return update_files(config, 6)
+
+
+@case('update_files_huge_file')
+def update_files_huge_file(directory: str):
+    config = Config(write_workload(directory, files=1, file_lines=200_000))
+    return update_files(config, 6)
+
+
+@case('update_files_huge_file_in_place')
+def update_files_huge_file_in_place(directory: str):
+    config = Config(write_workload(directory, files=1, file_lines=200_000))
+    return update_files(config, 6, in_place=True)
+
+
+@case('update_files_many_patterns')
+def update_files_many_patterns(directory: str):
+    config = Config(write_workload(
+        directory, files=20, file_lines=1_000, patterns=50))
+    return update_files(config, 6)
+
+
+@case('check_many_files')
+def check_many_files(directory: str):
+    config = load_read_only(write_workload(
+        directory, files=1_000, file_lines=100, patterns=5))
+    return lambda: check_files(config)
+
+
+def run(name: str) -> float:
+    """Get the best time in seconds of a single run of a benchmark."""
+    with tempfile.TemporaryDirectory() as directory:
+        timer = timeit.Timer(CASES[name](directory))
+        number, _ = timer.autorange()
+        return min(timer.repeat(repeat=REPEAT, number=number)) / number
+
+
+def regressions(results: Dict[str, float], baseline: Dict[str, float],
+                tolerance: float) -> List[str]:
+    """Get the benchmarks that are slower than their baseline by more
+    than the tolerance, benchmarks without a baseline are skipped."""
+    return [
+        name for name, seconds in results.items()
+        if name in baseline and seconds > baseline[name] * (1 + tolerance)
+    ]
+
+
+def environment() -> dict:
+    return {
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+        'machine': platform.machine(),
+        'system': platform.system(),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(prog='python -m benchmarks.suite')
+    parser.add_argument('--save', help='Write the results to a baseline')
+    parser.add_argument('--compare', help='Compare against a baseline')
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                        help='Allowed slow down before failing')
+    parser.add_argument('-k', '--filter', default='',
+                        help='Only run benchmarks with this in the name')
+    args = parser.parse_args()
+
+    baseline = {}
+    if args.compare:
+        with open(args.compare, 'r') as file:
+            stored = json.load(file)
+        baseline = stored['results']
+        if stored.get('environment') != environment():
+            print(f'Warning: the baseline is from a different environment, '
+                  f'{stored.get("environment")}')
+
+    results = {}
+    for name in CASES:
+        if args.filter in name:
+            results[name] = run(name)
+            print(f'{name:<32} {results[name] * 1e6:>12.1f}us', end='')
+            base = baseline.get(name)
+            if base is None:
+                print()
+            else:
+                print(f'  {results[name] / base:>6.2f}x baseline')
+
+    slower = regressions(results, baseline, args.tolerance)
+
+    if args.save:
+        with open(args.save, 'w') as file:
+            json.dump({'environment': environment(), 'results': results},
+                      file, indent=2)
+            file.write('\n')
+
+    if slower:
+        print(f'Slower than the baseline by more than '
+              f'{args.tolerance:.0%}: {", ".join(slower)}')
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,135 @@
+"""Synthetic workloads for the benchmark suite.
+
+Each generator writes a config, and any files that it updates, into a
+directory so that the benchmarks run against real files.
+"""
+import os
+from typing import List
+
+
+def parts_yaml(parts: int = 6, strings: int = 3) -> str:
+    """Get the `parts` section of a config.
+
+    The first parts are a chain of numbers that each require the next,
+    followed by an identifier and a number that it requires.
+
+    :param parts: The total number of parts, at least 3.
+    :param strings: The number of strings of the identifier part.
+    """
+    lines = ['parts:']
+    numbers = parts - 2
+    for index in range(numbers):
+        lines.append(f'    n{index}:')
+        lines.append(f'        value: {index % 10}')
+        if index:
+            lines.append("        prefix: '.'")
+        if index + 1 < numbers:
+            lines.append(f'        requires: n{index + 1}')
+    identifiers = ', '.join(f"'s{index}'" for index in range(strings))
+    lines.extend([
+        '    pre:',
+        '        value: s0',
+        "        prefix: '-'",
+        '        requires: prenum',
+        '        identifier:',
+        f'            strings: [ {identifiers} ]',
+        '    prenum:',
+        '        value: 1',
+        "        prefix: '.'",
+        '        number:',
+        '            start: 1',
+    ])
+    return '\n'.join(lines) + '\n'
+
+
+def files_yaml(paths: List[str], patterns: int = 1) -> str:
+    """Get the `files` section of a config.
+
+    :param paths: The path globs of the files.
+    :param patterns: The number of patterns for each path.
+    """
+    if not paths:
+        return 'files: []\n'
+    lines = ['files:']
+    for path in paths:
+        lines.append(f"    - path: '{path}'")
+        if patterns > 1:
+            lines.append('      patterns:')
+            for index in range(patterns):
+                lines.append(f"        - 'key{index} = {{{{ version }}}}'")
+    return '\n'.join(lines) + '\n'
+
+
+def write_workload(directory: str, parts: int = 6, strings: int = 3,
+                   files: int = 0, file_lines: int = 10,
+                   patterns: int = 1) -> str:
+    """Write a config and the files that it updates.
+
+    :param directory: The directory to write into.
+    :param parts: The number of parts, see `parts_yaml`.
+    :param strings: The number of identifier strings.
+    :param files: The number of files to update.
+    :param file_lines: The number of lines in each file, one in ten lines
+        has the version.
+    :param patterns: The number of patterns for the files.
+    :return: The path of the config.
+    """
+    version = render_start_version(parts)
+    os.makedirs(os.path.join(directory, 'files'), exist_ok=True)
+    for index in range(files):
+        with open(os.path.join(directory, 'files', f'f{index}.txt'),
+                  'w') as file:
+            file.write(file_text(version, file_lines, patterns))
+
+    config_path = os.path.join(directory, 'myver.yml')
+    paths = [os.path.join(directory, 'files', '*.txt')] if files else []
+    with open(config_path, 'w') as file:
+        file.write(files_yaml(paths, patterns))
+        file.write('\n')
+        file.write(parts_yaml(parts, strings))
+    return config_path
+
+
+def write_extended_workload(directory: str, parts: int = 6,
+                            depth: int = 5) -> str:
+    """Write a config that takes its parts from a chain of shared files.
+
+    The first shared file has the parts, and each of the others extends
+    the one before it.
+
+    :param directory: The directory to write into.
+    :param parts: The number of parts, see `parts_yaml`.
+    :param depth: The number of shared files.
+    :return: The path of the config.
+    """
+    os.makedirs(os.path.join(directory, 'shared'), exist_ok=True)
+    for index in range(depth):
+        with open(os.path.join(directory, 'shared', f's{index}.yml'),
+                  'w') as file:
+            if index:
+                file.write(f'extends: s{index - 1}.yml\n')
+            else:
+                file.write(parts_yaml(parts))
+
+    config_path = os.path.join(directory, 'myver.yml')
+    with open(config_path, 'w') as file:
+        file.write(f'extends: shared/s{depth - 1}.yml\n')
+        file.write(files_yaml([]))
+    return config_path
+
+
+def file_text(version: str, lines: int, patterns: int = 1) -> str:
+    """Get the text of a file where one in ten lines has the version."""
+    text = []
+    for index in range(lines):
+        if index % 10 == 0:
+            text.append(f'key{index // 10 % patterns} = {version}\n')
+        else:
+            text.append(f'filler line {index} without anything to change\n')
+    return ''.join(text)
+
+
+def render_start_version(parts: int) -> str:
+    """Get the version that `parts_yaml` starts at."""
+    numbers = '.'.join(str(index % 10) for index in range(parts - 2))
+    return f'{numbers}-s0.1'
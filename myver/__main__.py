@@ -1,8 +1,9 @@
 import logging
 import sys
+import time
 from logging import getLogger
 
-from myver.cli import cli_entry
+from myver import client, trace
 from myver.error import MyverError
 
 
@@ -13,7 +14,13 @@ def main():
     )
     log = getLogger(__name__)
     try:
-        cli_entry()
+        # A running server answers the common options without the cost of
+        # importing the rest of myver and loading the config.
+        if not client.run():
+            start = time.perf_counter_ns()
+            from myver.cli import cli_entry
+            trace.record('import', start, time.perf_counter_ns())
+            cli_entry()
     except KeyboardInterrupt:
         sys.exit(1)
     except MyverError as e:
@@ -0,0 +1,123 @@
+"""The library API of myver.
+
+These functions are the stable way to use myver from Python, such as
+from a build backend or a build script. Each config is loaded once and
+kept in a cache, which is safe to use from many threads. A cached config
+is reloaded whenever its file changes, so repeated calls in a long
+running process only cost a `stat` of the config file.
+"""
+import os
+import threading
+from typing import List, Dict, Union, Iterable
+
+from myver.service import VersionService
+from myver.snapshot import VersionSnapshot
+
+DEFAULT_CONFIG = 'myver.yml'
+
+_services: Dict[str, VersionService] = {}
+_lock = threading.Lock()
+
+
+def current(path: str = DEFAULT_CONFIG, keys: List[str] = None) -> str:
+    """Get the current version, or parts of it.
+
+    :param path: The path of the config file.
+    :param keys: The keys of the parts to get, see `Version.parse`.
+    :raise ConfigError: If the config is invalid.
+    :raise KeyError: If an invalid part key is provided.
+    :raise OSError: If the config file could not be read.
+    """
+    return service(path).current(keys)
+
+
+def version(path: str = DEFAULT_CONFIG) -> VersionSnapshot:
+    """Get the current version as an immutable snapshot.
+
+    :param path: The path of the config file.
+    :raise ConfigError: If the config is invalid.
+    :raise OSError: If the config file could not be read.
+    """
+    return service(path).snapshot
+
+
+def bump(path: str = DEFAULT_CONFIG, keys: List[str] = None) -> str:
+    """Bump the version, save it to the config and update the files.
+
+    :param path: The path of the config file.
+    :param keys: The bump args, see `Version.bump`.
+    :raise BumpError: When the bumping fails.
+    :raise ConfigError: If the config is invalid.
+    :raise KeyError: If an arg references an invalid part key.
+    :raise OSError: If the config file could not be read or written.
+    :return: The new version.
+    """
+    _, new = service(path).bump(keys or [])
+    return str(new)
+
+
+def reset(path: str = DEFAULT_CONFIG, keys: List[str] = None) -> str:
+    """Reset parts of the version, save it and update the files.
+
+    :param path: The path of the config file.
+    :param keys: The keys of the parts to reset.
+    :raise ConfigError: If the config is invalid.
+    :raise KeyError: If a key does not reference a valid part.
+    :raise OSError: If the config file could not be read or written.
+    :return: The new version.
+    """
+    _, new = service(path).reset(keys or [])
+    return str(new)
+
+
+def plan(path: str = DEFAULT_CONFIG,
+         steps: Iterable[Union[str, List[str]]] = ()) -> List[str]:
+    """Get the versions that a sequence of bumps would give.
+
+    Nothing is saved, the config and files are left as they are.
+
+    :param path: The path of the config file.
+    :param steps: The bump args of each step, a string is treated as a
+        single arg, e.g. `['minor', ['pre', 'prenum']]`.
+    :raise BumpError: When a bump fails.
+    :raise ConfigError: If the config is invalid.
+    :raise KeyError: If a step references an invalid part key.
+    :raise OSError: If the config file could not be read.
+    :return: The version after each step.
+    """
+    return [str(snapshot) for snapshot in version(path).plan(steps)]
+
+
+def check(path: str = DEFAULT_CONFIG) -> List[str]:
+    """Get the configured files that do not have the current version.
+
+    :param path: The path of the config file.
+    :raise ConfigError: If the config is invalid.
+    :raise OSError: If the config file could not be read.
+    """
+    return service(path).missing()
+
+
+def service(path: str = DEFAULT_CONFIG) -> VersionService:
+    """Get the cached service for a config, loading it on first use.
+
+    :param path: The path of the config file.
+    :raise ConfigError: If the config is invalid.
+    :raise OSError: If the config file could not be read.
+    """
+    key = os.path.abspath(path)
+    cached = _services.get(key)
+    if cached is not None:
+        return cached
+    with _lock:
+        cached = _services.get(key)
+        if cached is None:
+            cached = VersionService(key)
+            _services[key] = cached
+        return cached
+
+
+def clear_cache():
+    """Forget every loaded config."""
+    with _lock:
+        _services.clear()
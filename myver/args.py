@@ -0,0 +1,139 @@
+import argparse
+
+COMMANDS = ['check', 'export', 'serve', 'watch']
+# The bump arg that bumps the part worked out from the commit history.
+AUTO_BUMP = 'auto'
+# The same as `myver.trace.CAPTURES`, which is not imported so that the
+# args only need the standard library.
+CAPTURES = ['cprofile', 'tracemalloc']
+
+
+def parse_args(args=None) -> argparse.Namespace:
+    """Parse the command line args.
+
+    This is kept apart from `myver.cli` and only uses the standard
+    library, so that the args can be read without importing the rest of
+    myver (see `myver.client`).
+
+    :param args: The args to parse, defaults to `sys.argv`.
+    """
+    return build_parser().parse_args(args)
+
+
+def changed_args(args: argparse.Namespace) -> set:
+    """Get the names of the args that are not set to their default."""
+    parser = build_parser()
+    return {
+        name for name, value in vars(args).items()
+        if value != parser.get_default(name)
+    }
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog='myver',
+        add_help=False,
+    )
+    parser.register('action', 'extend', ExtendAction)
+    parser.add_argument(
+        'command',
+        nargs='?',
+        choices=COMMANDS,
+    )
+    parser.add_argument(
+        '-h', '--help',
+        action='store_true',
+    )
+    parser.add_argument(
+        '--batch',
+        nargs='?',
+        const='-',
+        type=str,
+    )
+    parser.add_argument(
+        '-b', '--bump',
+        action='extend',
+        nargs='+',
+        type=str,
+    )
+    parser.add_argument(
+        '--commit',
+        action='store_true',
+    )
+    parser.add_argument(
+        '--config',
+        default='myver.yml',
+        type=str,
+    )
+    parser.add_argument(
+        '-c', '--current',
+        action='extend',
+        nargs='*',
+        type=str,
+    )
+    parser.add_argument(
+        '--in-place',
+        action='store_true',
+    )
+    parser.add_argument(
+        '--latest-tag',
+        nargs='*',
+        type=str,
+    )
+    parser.add_argument(
+        '--poll',
+        type=float,
+    )
+    parser.add_argument(
+        '--profile',
+        nargs='?',
+        const='myver-trace.json',
+        type=str,
+    )
+    parser.add_argument(
+        '--profile-capture',
+        action='extend',
+        nargs='+',
+        choices=CAPTURES,
+    )
+    parser.add_argument(
+        '--socket',
+        type=str,
+    )
+    parser.add_argument(
+        '--workspace',
+        type=str,
+    )
+    parser.add_argument(
+        '--tag',
+        action='store_true',
+    )
+    parser.add_argument(
+        '--tag-prefix',
+        default='',
+        type=str,
+    )
+    parser.add_argument(
+        '-r', '--reset',
+        action='extend',
+        nargs='+',
+        type=str,
+    )
+
+    # Extra logging
+    parser.add_argument(
+        '-v', '--verbose',
+        action='store_true',
+    )
+    parser.add_argument(
+        '--debug',
+        action='store_true',
+    )
+    return parser
+
+
+class ExtendAction(argparse.Action):
+    def __call__(self, parser, namespace, values, option_string=None):
+        items = getattr(namespace, self.dest) or []
+        items.extend(values)
+        setattr(namespace, self.dest, items)
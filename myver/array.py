@@ -0,0 +1,317 @@
+from __future__ import annotations
+
+import functools
+from logging import getLogger
+from typing import List, Iterable, Optional, Union, Tuple
+
+from myver.part import IdentifierPart, string_tables
+from myver.snapshot import VersionSchema, VersionSnapshot, Value
+from myver.version import Version, split_bump_arg
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+log = getLogger(__name__)
+
+Other = Union['VersionArray', VersionSnapshot, Version, Tuple[int, ...]]
+
+
+class VersionArray:
+    """Many versions of the same configuration, stored as columns.
+
+    The versions are held in a 2-D integer array with a row for each
+    version and a column for each part. Each cell holds the sort value of
+    the part (see `Part.sort_value`), so an identifier is stored as its
+    index in `strings`, and a null value is stored as a sentinel which
+    is `-1` for number parts and `len(strings)` for identifier parts.
+    Since the rows are sort keys, comparisons, sorting and range filters
+    are vectorized, and bumps and resets follow the same rules as
+    `Part.bump` and `Part.reset`.
+
+    This requires numpy, which can be installed with
+    `pip install myver[numpy]`.
+
+    :param schema: The configuration of the parts.
+    :param data: The 2-D array of sort values.
+    """
+
+    __hash__ = None
+
+    def __init__(self, schema: VersionSchema, data):
+        if np is None:
+            raise ImportError(
+                'VersionArray requires numpy, install it with '
+                '`pip install myver[numpy]`')
+        data = np.asarray(data, dtype=np.int64)
+        if data.ndim != 2 or data.shape[1] != len(schema.parts):
+            raise ValueError(
+                f'Expected a 2-D array with {len(schema.parts)} columns for '
+                f'the version array, got shape {data.shape}')
+        self.schema: VersionSchema = schema
+        self.data = data
+        self._nulls = null_values(schema)
+
+    @classmethod
+    def from_snapshots(cls, snapshots: Iterable[VersionSnapshot],
+                       schema: VersionSchema = None) -> VersionArray:
+        """Build an array from snapshots that share a configuration.
+
+        :param snapshots: The snapshots to store.
+        :param schema: The schema of the snapshots, this must be given if
+            there are no snapshots.
+        :raise ValueError: If the snapshots have different part keys.
+        """
+        rows = []
+        for snapshot in snapshots:
+            if schema is None:
+                schema = snapshot.schema
+            elif snapshot.schema.keys != schema.keys:
+                raise ValueError(
+                    'All snapshots in a version array must have the same '
+                    'parts')
+            rows.append(snapshot.sort_key)
+        if schema is None:
+            raise ValueError(
+                'A schema is needed to build an empty version array')
+        data = np.array(rows, dtype=np.int64).reshape(-1, len(schema.parts))
+        return cls(schema, data)
+
+    @classmethod
+    def from_values(cls, schema: VersionSchema,
+                    values: Iterable[Iterable[Value]]) -> VersionArray:
+        """Build an array from rows of part values.
+
+        :param schema: The configuration of the parts.
+        :param values: The part values of each version.
+        :raise ValueError: If a value is invalid for its part.
+        """
+        rows = [schema.sort_key(tuple(row)) for row in values]
+        data = np.array(rows, dtype=np.int64).reshape(-1, len(schema.parts))
+        return cls(schema, data)
+
+    def values(self, row: int) -> tuple:
+        """Get the part values of a row."""
+        return tuple([
+            decode(part, code, null)
+            for part, code, null in zip(
+                self.schema.parts, self.data[row].tolist(), self._nulls)
+        ])
+
+    def snapshot(self, row: int) -> VersionSnapshot:
+        """Get a row as a snapshot."""
+        return VersionSnapshot(self.schema, self.values(row))
+
+    def snapshots(self) -> List[VersionSnapshot]:
+        """Get every row as a snapshot."""
+        return [self.snapshot(row) for row in range(len(self))]
+
+    def compare(self, other: Other):
+        """Compare each row against a version, or row by row.
+
+        :param other: A version, snapshot or sort key to compare every row
+            against, or an array of the same length to compare row by row.
+        :return: An integer array with -1 where the row is lower, 0 where
+            it is equal and 1 where it is higher.
+        """
+        keys = self._keys_of(other)
+        result = np.zeros(len(self), dtype=np.int8)
+        undecided = np.ones(len(self), dtype=bool)
+        for column in range(self.data.shape[1]):
+            left = self.data[:, column]
+            right = keys[..., column]
+            result[undecided & (left < right)] = -1
+            result[undecided & (left > right)] = 1
+            undecided &= left == right
+            if not undecided.any():
+                break
+        return result
+
+    def between(self, lower: Other = None, upper: Other = None,
+                include_lower: bool = True, include_upper: bool = False):
+        """Get a mask of the rows within a range.
+
+        :param lower: The lower bound, or None for no lower bound.
+        :param upper: The upper bound, or None for no upper bound.
+        :param include_lower: Whether rows equal to `lower` are included.
+        :param include_upper: Whether rows equal to `upper` are included.
+        """
+        mask = np.ones(len(self), dtype=bool)
+        if lower is not None:
+            mask &= (self >= lower) if include_lower else (self > lower)
+        if upper is not None:
+            mask &= (self <= upper) if include_upper else (self < upper)
+        return mask
+
+    def argsort(self):
+        """Get the row indexes that would sort the versions."""
+        columns = [self.data[:, column]
+                   for column in reversed(range(self.data.shape[1]))]
+        return np.lexsort(columns)
+
+    def sort(self) -> VersionArray:
+        """Get the versions in sorted order."""
+        return VersionArray(self.schema, self.data[self.argsort()])
+
+    def argmin(self) -> int:
+        """Get the row index of the lowest version."""
+        return self._extreme(np.min)
+
+    def argmax(self) -> int:
+        """Get the row index of the highest version."""
+        return self._extreme(np.max)
+
+    def min(self) -> VersionSnapshot:
+        """Get the lowest version."""
+        return self.snapshot(self.argmin())
+
+    def max(self) -> VersionSnapshot:
+        """Get the highest version."""
+        return self.snapshot(self.argmax())
+
+    def bump(self, args: List[str]) -> VersionArray:
+        """Bump every version, see `Version.bump`.
+
+        :param args: The List of part keys to bump. An arg may have a
+            key value pair with the syntax of `<key>=<value>`.
+        :raise BumpError: When the bumping fails.
+        :raise KeyError: If an arg references an invalid part key.
+        :return: A new array with the bumped versions.
+        """
+        data = self.data.copy()
+        for arg in args:
+            key, value_override = split_bump_arg(arg)
+            index = self.schema.index(key)
+            self._bump_column(data, index, value_override)
+            if index + 1 < data.shape[1]:
+                self._reset_columns(data, index + 1, args)
+        return VersionArray(self.schema, data)
+
+    def reset(self, keys: List[str]) -> VersionArray:
+        """Reset parts of every version, see `Version.reset`.
+
+        :param keys: The keys of the parts to reset.
+        :raise KeyError: If a key does not reference a valid part.
+        :return: A new array with the reset versions.
+        """
+        data = self.data.copy()
+        for key in keys:
+            self._reset_columns(data, self.schema.index(key))
+        return VersionArray(self.schema, data)
+
+    def _bump_column(self, data, index: int, value_override: str = None):
+        part = self.schema.parts[index]
+        column = data[:, index]
+        is_set = column != self._nulls[index]
+        start = part.sort_value(part.start)
+
+        if value_override is not None:
+            # Validates the override the same way that a part would.
+            column[:] = part.sort_value(part.successor(None, value_override))
+        elif isinstance(part, IdentifierPart):
+            successors = successor_codes(tuple(part.strings))
+            column[:] = np.where(is_set, successors[column], start)
+        else:
+            column[:] = np.where(is_set, column + 1, start)
+
+    def _reset_columns(self, data, index: int, bump_args: List[str] = None):
+        bump_args = bump_args or []
+        rows = len(data)
+        for i in range(index, data.shape[1]):
+            part = self.schema.parts[i]
+            null = self._nulls[i]
+            if part.key in bump_args:
+                data[:, i] = null
+            elif i == 0:
+                data[:, i] = part.sort_value(part.start)
+            else:
+                required = np.zeros(rows, dtype=bool)
+                for j in self.schema.required_by[i]:
+                    required |= data[:, j] != self._nulls[j]
+                data[:, i] = np.where(
+                    required, part.sort_value(part.start), null)
+            bump_args = []
+
+    def _extreme(self, reduce) -> int:
+        if len(self) == 0:
+            raise ValueError('Version array is empty')
+        candidates = np.arange(len(self))
+        for column in range(self.data.shape[1]):
+            values = self.data[candidates, column]
+            candidates = candidates[values == reduce(values)]
+            if len(candidates) == 1:
+                break
+        return int(candidates[0])
+
+    def _keys_of(self, other: Other):
+        if isinstance(other, VersionArray):
+            if len(other) != len(self):
+                raise ValueError(
+                    'Version arrays must have the same length to compare')
+            return other.data
+        elif isinstance(other, (VersionSnapshot, Version)):
+            return np.array(other.sort_key, dtype=np.int64)
+        elif isinstance(other, tuple):
+            return np.array(other, dtype=np.int64)
+        raise TypeError(
+            f'Cannot compare a version array with {type(other).__name__}')
+
+    def __len__(self):
+        return len(self.data)
+
+    def __getitem__(self, item) -> Union[VersionSnapshot, VersionArray]:
+        if isinstance(item, (int, np.integer)):
+            return self.snapshot(int(item))
+        return VersionArray(self.schema, self.data[item])
+
+    def __lt__(self, other: Other):
+        return self.compare(other) < 0
+
+    def __le__(self, other: Other):
+        return self.compare(other) <= 0
+
+    def __gt__(self, other: Other):
+        return self.compare(other) > 0
+
+    def __ge__(self, other: Other):
+        return self.compare(other) >= 0
+
+    def __eq__(self, other: Other):
+        return self.compare(other) == 0
+
+    def __ne__(self, other: Other):
+        return self.compare(other) != 0
+
+    def __repr__(self):
+        return f'VersionArray({len(self)} versions)'
+
+
+def null_values(schema: VersionSchema) -> List[int]:
+    """Get the sentinel that a null value is stored as for each part."""
+    return [part.sort_value(None) for part in schema.parts]
+
+
+@functools.lru_cache(maxsize=128)
+def successor_codes(strings: Tuple[str, ...]):
+    """Get the stored value of the successor of each identifier index.
+
+    The extra last entry maps the null sentinel to itself.
+    """
+    indexes, successors = string_tables(strings)
+    null = len(strings)
+    codes = [
+        null if successors[string] is None else indexes[successors[string]]
+        for string in strings
+    ]
+    codes.append(null)
+    return np.array(codes, dtype=np.int64)
+
+
+def decode(part, code: int, null: int) -> Optional[Value]:
+    """Get a part value from its stored sort value."""
+    if code == null:
+        return None
+    if isinstance(part, IdentifierPart):
+        return part.strings[code]
+    return code
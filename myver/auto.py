@@ -0,0 +1,157 @@
+import hashlib
+import json
+import os
+import re
+from logging import getLogger
+from typing import List, Dict, Optional, Iterable, Tuple
+
+from myver.cache import read_cache, write_cache
+from myver.config import Config
+from myver.error import ConfigError, MyverError
+from myver.git import git_dir, latest_tag, iter_commits, resolve_commits, \
+    is_ancestor, CACHE_DIR, CACHE_VERSION
+from myver.parser import VersionParser
+from myver.trace import span
+
+log = getLogger(__name__)
+
+AUTO_CACHE = 'auto.json'
+# The commit type of breaking changes, marked with a `!` after the type
+# or a `BREAKING CHANGE:` footer.
+BREAKING = 'breaking'
+
+HEADER = re.compile(r'([A-Za-z][\w-]*)(?:\([^)]*\))?(!)?:\s')
+BREAKING_FOOTER = re.compile(r'^BREAKING[ -]CHANGE:', re.MULTILINE)
+
+
+def commit_types(message: str) -> List[str]:
+    """Get the conventional commit types of a commit message.
+
+    :param message: The full commit message.
+    :return: The type in lower case, and `breaking` if it is a breaking
+        change, or an empty List if it is not a conventional commit.
+    """
+    match = HEADER.match(message)
+    if match is None:
+        return []
+    types = [match.group(1).lower()]
+    if match.group(2) or BREAKING_FOOTER.search(message):
+        types.append(BREAKING)
+    return types
+
+
+class AutoBump:
+    """Works out which part to bump from the commits since a version tag.
+
+    A commit is mapped to a part by the `auto` rules of the config, from
+    its conventional commit type. The part to bump is the most
+    significant part that any commit maps to, which is the one that
+    comes first in the version.
+
+    :param rules: The part key to bump for each commit type.
+    :param keys: The part keys in the order of the version.
+    """
+
+    def __init__(self, rules: Dict[str, str], keys: List[str]):
+        self.rules: Dict[str, str] = rules
+        self.order: Dict[str, int] = {key: index
+                                      for index, key in enumerate(keys)}
+        self.top: Optional[str] = min(
+            rules.values(), key=self.order.__getitem__, default=None)
+
+    def most_significant(self, *keys: Optional[str]) -> Optional[str]:
+        """Get the key that comes first in the version, ignoring None."""
+        return min((key for key in keys if key is not None),
+                   key=self.order.__getitem__, default=None)
+
+    def scan(self, commits: Iterable[Tuple[str, str]],
+             bump: Optional[str] = None) -> Tuple[Optional[str], int]:
+        """Find the part to bump from commits.
+
+        Reading stops as soon as a commit maps to the most significant
+        part of the rules, since no other commit could change the result.
+
+        :param commits: Pairs of the commit hash and its message.
+        :param bump: The part to bump from commits that were scanned
+            before.
+        :return: The key of the part to bump, or None if no commit maps
+            to a part, and the number of commits scanned.
+        """
+        scanned = 0
+        for _, message in commits:
+            scanned += 1
+            for commit_type in commit_types(message):
+                key = self.rules.get(commit_type)
+                bump = self.most_significant(bump, key)
+            if bump is not None and bump == self.top:
+                break
+        return bump, scanned
+
+
+def auto_bump(config: Config, tag_prefix: str = '', cwd: str = None) -> str:
+    """Get the key of the part to bump from the commits since the latest
+    version tag.
+
+    The commits are read as a stream from `git log`. The result and the
+    last commit it covers are kept as a checkpoint in the git directory,
+    so the next run only reads the commits made since then. The
+    checkpoint is only used while the latest tag and the rules are the
+    same, and the checkpoint commit is still in the history of HEAD.
+
+    :param config: The config with the `auto` rules.
+    :param tag_prefix: A prefix that version tags start with.
+    :param cwd: A directory within the repository.
+    :raise ConfigError: If the config has no `auto` rules.
+    :raise GitError: If the git commands fail.
+    :raise MyverError: If no commit since the tag maps to a part.
+    """
+    if not config.auto:
+        raise ConfigError('You must have `auto` configured to bump with '
+                          '`auto`')
+    auto = AutoBump(config.auto, [part.key for part in config.version.parts])
+
+    parser = VersionParser.from_version(config.version)
+    tag = latest_tag(parser, tag_prefix=tag_prefix, cwd=cwd)
+    tag_name = tag[0] if tag else None
+    commits = resolve_commits(['HEAD', tag_name] if tag_name else ['HEAD'],
+                              cwd)
+    head, base = commits[0], commits[1] if tag_name else None
+
+    cache_path = os.path.join(git_dir(cwd), CACHE_DIR, AUTO_CACHE)
+    key = [CACHE_VERSION, base, rules_hash(config.auto)]
+    cached = read_cache(cache_path)
+    bump = None
+    revisions = [head] + ([f'^{base}'] if base else [])
+    if cached is not None and cached.get('key') == key:
+        if cached['head'] == head:
+            log.debug(f'Using auto bump checkpoint from {cache_path}')
+            bump, revisions = cached['bump'], []
+        elif is_ancestor(cached['head'], head, cwd):
+            log.debug(f'Using auto bump checkpoint from {cache_path}')
+            bump = cached['bump']
+            revisions.append(f'^{cached["head"]}')
+
+    with span('auto bump') as auto_span:
+        scanned = 0
+        if revisions and bump != auto.top:
+            commits = iter_commits(revisions, cwd)
+            try:
+                bump, scanned = auto.scan(commits, bump)
+            finally:
+                # Stops git if the scan ended before reading every commit.
+                commits.close()
+        auto_span.count('commits', scanned)
+    log.info(f'Scanned {scanned} commits for the auto bump')
+
+    write_cache(cache_path, {'key': key, 'head': head, 'bump': bump})
+    if bump is None:
+        since = f'since tag {tag_name}' if tag_name else 'in the history'
+        raise MyverError(f'No commits {since} have a type in `auto`')
+    log.info(f'Bumping `{bump}` from the commit history')
+    return bump
+
+
+def rules_hash(rules: Dict[str, str]) -> str:
+    """Get a hash of the `auto` rules."""
+    layout = json.dumps(rules, sort_keys=True)
+    return hashlib.sha1(layout.encode()).hexdigest()
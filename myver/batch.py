@@ -0,0 +1,109 @@
+import json
+import os
+import sys
+from logging import getLogger
+from typing import Dict, Iterable, Iterator, TextIO
+
+from myver.error import MyverError
+from myver.service import VersionService, is_ok
+
+log = getLogger(__name__)
+
+STDIN = '-'
+
+
+class Batch:
+    """Runs many version requests in a single process.
+
+    Each request is a JSON object on its own line, see `VersionService`
+    for the requests. A request may have a `config` path to run against,
+    otherwise the default config is used. Each config is only loaded
+    once, and is reloaded if its file changes, so a release script can
+    run every operation it needs without starting a process for each.
+
+    :param config_path: The config to use for requests without a
+        `config` path.
+    """
+
+    def __init__(self, config_path: str):
+        self.config_path: str = config_path
+        self._services: Dict[str, VersionService] = {}
+        self.failures: int = 0
+
+    def run(self, lines: Iterable[str]) -> Iterator[dict]:
+        """Lazily run requests, yielding the response of each.
+
+        Blank lines are skipped. A request that fails does not stop the
+        batch, its response has `ok` set to false. A check that finds
+        files without the current version counts as failed too, see
+        `is_ok`.
+
+        :param lines: The JSON lines of the requests.
+        """
+        for line in lines:
+            if not line.strip():
+                continue
+            response = self.handle_line(line)
+            if not is_ok(response):
+                self.failures += 1
+            yield response
+
+    def handle_line(self, line: str) -> dict:
+        """Run a single request, errors are returned as a response."""
+        try:
+            request = json.loads(line)
+        except ValueError as e:
+            return {'ok': False, 'error': f'Invalid request, {e}'}
+        if not isinstance(request, dict):
+            return {'ok': False, 'error': 'Invalid request, not an object'}
+
+        try:
+            service = self._service(request.get('config', self.config_path))
+        except MyverError as e:
+            response = {'ok': False, 'error': e.message}
+        except OSError as e:
+            response = {'ok': False, 'error': f'{e.strerror} <{e.filename}>'}
+        else:
+            return service.handle(request)
+        if 'id' in request:
+            response['id'] = request['id']
+        return response
+
+    def _service(self, path: str) -> VersionService:
+        key = os.path.abspath(path)
+        service = self._services.get(key)
+        if service is None:
+            service = VersionService(path)
+            self._services[key] = service
+        return service
+
+
+def run_batch(source: str, config_path: str, output: TextIO = None):
+    """Run a batch of requests, writing a JSON line for each response.
+
+    :param source: The file with the requests, or `-` for stdin.
+    :param config_path: The config to use for requests without a
+        `config` path.
+    :param output: Where to write the responses, defaults to stdout.
+    :raise MyverError: If any request failed, after every request has
+        been run.
+    :raise OSError: If the requests file could not be read.
+    """
+    output = output or sys.stdout
+    batch = Batch(config_path)
+    if source == STDIN:
+        _write_responses(batch.run(sys.stdin), output)
+    else:
+        with open(source, 'r') as file:
+            _write_responses(batch.run(file), output)
+
+    if batch.failures:
+        raise MyverError(f'{batch.failures} batch requests failed')
+
+
+def _write_responses(responses: Iterable[dict], output: TextIO):
+    for response in responses:
+        output.write(json.dumps(response) + '\n')
+        # Flushed so that a script reading the output sees each response
+        # as soon as it is ready.
+        output.flush()
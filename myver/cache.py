@@ -0,0 +1,46 @@
+import json
+import os
+from logging import getLogger
+from typing import Optional
+
+log = getLogger(__name__)
+
+CACHE_ENV = 'MYVER_CACHE_DIR'
+
+
+def cache_dir() -> str:
+    """Get the directory of the caches that are not kept in a repository.
+
+    This is `$MYVER_CACHE_DIR` if it is set, otherwise `myver` in the
+    user's cache directory.
+    """
+    if os.environ.get(CACHE_ENV):
+        return os.environ[CACHE_ENV]
+    base = os.environ.get('XDG_CACHE_HOME') or os.path.expanduser('~/.cache')
+    return os.path.join(base, 'myver')
+
+
+def read_cache(path: str) -> Optional[dict]:
+    """Read a JSON cache file, or get None if it is missing or invalid."""
+    try:
+        with open(path, 'r') as file:
+            return json.load(file)
+    except (OSError, ValueError):
+        return None
+
+
+def write_cache(path: str, data: dict):
+    """Write a JSON cache file, failing to write is only logged."""
+    try:
+        text = json.dumps(data)
+    except (TypeError, ValueError) as e:
+        log.warning(f'Could not write cache <{path}>, {e}')
+        return
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temp_path = f'{path}.{os.getpid()}.tmp'
+        with open(temp_path, 'w') as file:
+            file.write(text)
+        os.replace(temp_path, path)
+    except OSError as e:
+        log.warning(f'Could not write cache <{path}>, {e.strerror}')
@@ -0,0 +1,244 @@
+import bisect
+import functools
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+from glob import glob
+from logging import getLogger
+from typing import List, Dict, NamedTuple, Optional, Tuple
+
+from myver.config import Config
+from myver.files import compiled_patterns, template, FileUpdater
+from myver.parser import VersionParser
+from myver.trace import span
+
+log = getLogger(__name__)
+
+DEFAULT_PATTERN = '{{ version }}'
+# Rendered into the patterns in place of the version, to find where the
+# version regex goes.
+VERSION_MARKER = '\0myver-version\0'
+NAMED_GROUP = re.compile(r'\(\?P<\w+>')
+# The number of files that a thread checks at a time.
+CHUNK_SIZE = 64
+
+
+class Occurrence(NamedTuple):
+    """A version found in a file by a pattern."""
+    line: int
+    version: str
+
+
+class FileCheck(NamedTuple):
+    """The result of checking a file for the current version.
+
+    :param path: The path of the file.
+    :param line: The first line that has the current version, or None if
+        the file does not have it.
+    :param stale: Where the patterns match another version, only looked
+        for when the file does not have the current version.
+    :param error: Why the file could not be checked, such as it could
+        not be read or a pattern is not a valid regex.
+    :param missing: Whether the path is a configured glob that matches
+        no files, such as a file that was deleted or renamed.
+    """
+    path: str
+    line: Optional[int]
+    stale: List[Occurrence]
+    error: Optional[str] = None
+    missing: bool = False
+
+    @property
+    def ok(self) -> bool:
+        return self.line is not None
+
+
+class Checker:
+    """Checks that files have the current version.
+
+    Each file is first checked for the version as plain text, which is
+    much faster than the patterns, and a file without it can't have a
+    match. Only files that pass are searched with the patterns, up to
+    the first match. Files without the version are searched again with
+    the patterns rendered for any valid version, to find the stale
+    versions they have instead.
+
+    :param version: The current version.
+    :param parser: The parser for the configured parts, used to find
+        stale versions.
+    """
+
+    def __init__(self, version: str, parser: VersionParser):
+        self.version: str = version
+        self.parser: VersionParser = parser
+
+    def check(self, path: str, patterns: List[str]) -> FileCheck:
+        """Check a file for the current version.
+
+        :param path: The path of the file.
+        :param patterns: The patterns of the file.
+        """
+        try:
+            with open(path, 'rb') as file:
+                raw = file.read()
+            data = raw.decode()
+        except OSError as e:
+            return FileCheck(path, None, [], f'could not be read, '
+                                             f'{e.strerror}')
+        except UnicodeDecodeError as e:
+            return FileCheck(path, None, [], f'could not be read, '
+                                             f'{e.reason}')
+
+        try:
+            if self.version in data:
+                for pattern in compiled_patterns(tuple(patterns),
+                                                 self.version):
+                    match = pattern.search(data)
+                    if match is not None:
+                        line = data.count('\n', 0, match.start()) + 1
+                        return FileCheck(path, line, [])
+            return FileCheck(path, None, self.stale(data, patterns))
+        except re.error as e:
+            return FileCheck(path, None, [], f'invalid pattern, {e}')
+
+    def check_chunk(self, files: List[Tuple[str, List[str]]]) \
+            -> List[FileCheck]:
+        """Check many files, see `check`."""
+        return [self.check(path, patterns) for path, patterns in files]
+
+    def stale(self, data: str, patterns: List[str]) -> List[Occurrence]:
+        """Find where the patterns match a version other than the current.
+
+        The default pattern is skipped, since it would match every string
+        in the file that looks like a version.
+        """
+        found = set()
+        line_index = LineIndex(data)
+        for pattern in stale_patterns(tuple(patterns), self.parser.regex):
+            for match in pattern.finditer(data):
+                version = match.group('myver_version')
+                if version and version != self.version \
+                        and self.parser.parse_values(version) is not None:
+                    found.add(Occurrence(line_index.line(match.start()),
+                                         version))
+        return sorted(found)
+
+
+def check_files(config: Config, workers: int = None) -> List[FileCheck]:
+    """Check every configured file for the current version.
+
+    The files are read and searched by a pool of threads, so that the
+    time spent waiting on the disk overlaps. Each thread is given the
+    files in chunks, since most files are checked in less time than it
+    takes to hand a single file to a thread.
+
+    :param config: The config with the files and the version.
+    :param workers: The number of threads, see `ThreadPoolExecutor`.
+    :return: The result for each file, ordered by path, along with a
+        missing result for each configured path that matches no files.
+    """
+    checker = Checker(str(config.version),
+                      VersionParser.from_version(config.version))
+    files, unmatched = file_patterns(config.files)
+    # Compiled up front, rather than by every thread at once. An invalid
+    # pattern is reported for each file that has it.
+    for patterns in {tuple(patterns) for patterns in files.values()}:
+        try:
+            compiled_patterns(patterns, checker.version)
+        except re.error:
+            pass
+    items = list(files.items())
+    with span('check files', files=len(files)), \
+            ThreadPoolExecutor(workers) as executor:
+        chunks = [items[index:index + CHUNK_SIZE]
+                  for index in range(0, len(items), CHUNK_SIZE)]
+        results = [result
+                   for chunk in executor.map(checker.check_chunk, chunks)
+                   for result in chunk]
+    log.info(f'Checked {len(results)} files')
+    results.extend(FileCheck(path, None, [], missing=True)
+                   for path in unmatched)
+    return sorted(results)
+
+
+def file_patterns(file_updaters: List[FileUpdater]) \
+        -> Tuple[Dict[str, List[str]], List[str]]:
+    """Expand the path globs, getting the patterns of each file.
+
+    A file that is matched by more than one glob has the patterns of
+    each of them.
+
+    :return: The patterns of each file, and the globs that match no
+        files.
+    """
+    patterns: Dict[str, List[str]] = {}
+    unmatched: List[str] = []
+    for file_updater in file_updaters:
+        with span('expand glob', glob=file_updater.path) as glob_span:
+            paths = [path for path in glob(file_updater.path)
+                     if os.path.isfile(path)]
+            glob_span.count('paths', len(paths))
+        if not paths:
+            unmatched.append(file_updater.path)
+        for path in paths:
+            patterns.setdefault(path, []).extend(file_updater.patterns)
+    return patterns, unmatched
+
+
+def format_check(result: FileCheck, version: str) -> List[str]:
+    """Get the lines that report a file without the current version."""
+    if result.missing:
+        return [f'{result.path}: no such file']
+    if result.error is not None:
+        return [f'{result.path}: {result.error}']
+    if result.stale:
+        return [f'{result.path}:{occurrence.line}: stale version '
+                f'{occurrence.version}, expected {version}'
+                for occurrence in result.stale]
+    return [f'{result.path}: missing version {version}']
+
+
+@functools.lru_cache(maxsize=256)
+def stale_patterns(patterns: Tuple[str, ...],
+                   version_regex: str) -> List[re.Pattern]:
+    """Get the regexes of patterns rendered to match any version.
+
+    The version is captured by the `myver_version` group. A pattern can
+    have the version more than once, so only its first version is
+    captured, and the groups of the version regex are not named.
+
+    :raise re.error: If a pattern is not a valid regex.
+    """
+    version = NAMED_GROUP.sub('(?:', version_regex)
+    regexes = []
+    for pattern in dict.fromkeys(patterns):
+        if pattern.strip() == DEFAULT_PATTERN:
+            continue
+        first, *rest = template(pattern).render(
+            version=VERSION_MARKER).split(VERSION_MARKER)
+        if not rest:
+            continue
+        regexes.append(re.compile(
+            f'{first}(?P<myver_version>{version}){rest[0]}'
+            + ''.join(f'(?:{version}){text}' for text in rest[1:])))
+    return regexes
+
+
+class LineIndex:
+    """Gets the line numbers of positions in text.
+
+    The positions of the line breaks are found once, so that getting the
+    lines of many matches does not count the line breaks of the text
+    again for each match.
+    """
+
+    def __init__(self, data: str):
+        self.data: str = data
+        self._breaks: Optional[List[int]] = None
+
+    def line(self, index: int) -> int:
+        """Get the line number, starting from 1, of a position."""
+        if self._breaks is None:
+            self._breaks = [match.start()
+                            for match in re.finditer('\n', self.data)]
+        return bisect.bisect_left(self._breaks, index) + 1
@@ -1,26 +1,64 @@
-import argparse
 import logging
+import os
 import textwrap
+import time
+from typing import List, NamedTuple, Optional
 
-from myver.config import Config
+from myver.args import parse_args, AUTO_BUMP
+from myver.client import socket_path
+from myver.config import Config, load_version, load_read_only
 from myver.error import MyverError
+from myver.version import Version
+from myver import trace
+
+# The modules behind the other commands are imported where they are
+# used, so that `--current` only pays for importing what it needs.
+
+
+class Update(NamedTuple):
+    """A change of version, and the files that were written for it."""
+    old: str
+    new: str
+    paths: List[str]
 
 
 def cli_entry(input_args=None):
     """Entry point for the command line utility."""
-    args = _parse_args(input_args)
+    start = time.perf_counter_ns()
+    args = parse_args(input_args)
+    trace.record('parse args', start, time.perf_counter_ns())
 
     if args.help:
         print(textwrap.dedent('''\
-        Usage: myver [OPTIONS]
+        Usage: myver [OPTIONS] [COMMAND]
+        
+        Commands:
+          check                    Check the files have the current version
+          export                   Write the state values to the config file
+          serve                    Serve version requests over a Unix socket
+          watch                    Report files that drift from the version
         
         Options:
           -h, --help               Show this help message and exit
+              --batch [file]       Run JSON lines requests from a file or stdin
           -b, --bump strings       Bump version parts
+              --commit             Commit the changed files after a bump
               --config string      Config file path
           -c, --current [strings]  Get the current version or version parts
+              --in-place           Only write the changed bytes of each file
+              --latest-tag [min [max]]
+                                   Get the git tag with the highest version,
+                                   optionally at or above min and below max
+              --poll seconds       Poll for changes when watching
+              --profile [file]     Write a trace of the run to a file
+              --profile-capture {cprofile,tracemalloc}
+                                   Also capture a profile or memory usage
+              --tag-prefix string  Prefix of version git tags (e.g. v)
           -r, --reset strings      Reset version parts
+              --tag                Commit and tag the new version
+              --socket string      Unix socket of the myver server
           -v, --verbose            Log more details
+              --workspace glob     Run on every config matching a glob
         ''').rstrip())
         return
 
@@ -29,12 +67,52 @@ def cli_entry(input_args=None):
     _handle_verbose(args)
     _handle_debug(args)
 
-    config = Config(args.config)
+    with trace.session(*trace.settings(args.profile, args.profile_capture)):
+        _run(args)
+
+
+def _run(args):
+    if args.command == 'serve':
+        from myver.server import serve
+        serve(args.config, socket_path(args))
+        return
+
+    if args.command == 'watch':
+        from myver.watch import watch
+        watch(args.config, args.poll)
+        return
+
+    if args.batch is not None:
+        from myver.batch import run_batch
+        run_batch(args.batch, args.config)
+        return
+
+    if args.workspace is not None:
+        if args.commit or args.tag or args.in_place:
+            raise MyverError('The --commit, --tag and --in-place options '
+                             'can not be used with --workspace')
+        from myver.workspace import run_workspace, requests_from_args
+        requests = requests_from_args(args) or [{'op': 'current'}]
+        run_workspace(args.workspace, requests)
+        return
+
+    with trace.span('load config'):
+        if args.bump or args.reset or args.command == 'export':
+            config = Config(args.config)
+        elif args.command == 'check':
+            config = load_read_only(args.config)
+        else:
+            # Commands that only read the version don't need the files, so
+            # only the parts are loaded.
+            config = Config(args.config, version=load_version(args.config))
 
     # Most things after here will need the config.
     _handle_current(args, config)
-    _handle_bump(args, config)
-    _handle_reset(args, config)
+    _handle_latest_tag(args, config)
+    updates = [_handle_bump(args, config), _handle_reset(args, config)]
+    _handle_export(args, config)
+    _handle_commit(args, config, [update for update in updates if update])
+    _handle_check(args, config)
 
 
 def _handle_verbose(args):
@@ -64,72 +142,108 @@ def _handle_current(args, config: Config):
                              f'invalid part key `{key_error.args[0]}`')
 
 
-def _handle_bump(args, config: Config):
-    _do_update(config.version.bump, args.bump, config)
+def _handle_latest_tag(args, config: Config):
+    if args.latest_tag is None:
+        return
 
+    if len(args.latest_tag) > 2:
+        raise MyverError('The --latest-tag option takes at most 2 versions, '
+                         'a min and a max')
 
-def _handle_reset(args, config: Config):
-    _do_update(config.version.reset, args.reset, config)
+    from myver.git import latest_tag
+    from myver.parser import VersionParser
 
+    parser = VersionParser.from_version(config.version)
+    bounds = [parser.parse(version) for version in args.latest_tag]
+    latest = latest_tag(parser, *bounds, tag_prefix=args.tag_prefix,
+                        cwd=os.path.dirname(os.path.abspath(config.path)))
+    if latest is None:
+        raise MyverError('No git tags found with a version in range')
+    print(latest[0])
 
-def _do_update(func, arg, config: Config):
-    if arg:
-        old_version_str = str(config.version)
-        func(arg)
-        new_version_str = str(config.version)
-        config.save()
-        config.update_files(old_version_str, new_version_str)
-        print(f'{old_version_str}  >>  {new_version_str}')
 
+def _handle_bump(args, config: Config) -> Optional[Update]:
+    bump_args = args.bump
+    # A part named `auto` is bumped as normal.
+    if bump_args and AUTO_BUMP in bump_args \
+            and not _has_part(config, AUTO_BUMP):
+        from myver.auto import auto_bump
+        key = auto_bump(config, args.tag_prefix,
+                        os.path.dirname(os.path.abspath(config.path)))
+        bump_args = [key if arg == AUTO_BUMP else arg for arg in bump_args]
+    return _do_update(Version.bump, bump_args, config, args.in_place)
 
-def _parse_args(args):
-    parser = argparse.ArgumentParser(
-        prog='myver',
-        add_help=False,
-    )
-    parser.register('action', 'extend', ExtendAction)
-    parser.add_argument(
-        '-h', '--help',
-        action='store_true',
-    )
-    parser.add_argument(
-        '-b', '--bump',
-        action='extend',
-        nargs='+',
-        type=str,
-    )
-    parser.add_argument(
-        '--config',
-        default='myver.yml',
-        type=str,
-    )
-    parser.add_argument(
-        '-c', '--current',
-        action='extend',
-        nargs='*',
-        type=str,
-    )
-    parser.add_argument(
-        '-r', '--reset',
-        action='extend',
-        nargs='+',
-        type=str,
-    )
-
-    # Extra logging
-    parser.add_argument(
-        '-v', '--verbose',
-        action='store_true',
-    )
-    parser.add_argument(
-        '--debug',
-        action='store_true',
-    )
-    return parser.parse_args(args)
-
-
-class ExtendAction(argparse.Action):
-    def __call__(self, parser, namespace, values, option_string=None):
-        items = getattr(namespace, self.dest) or []
-        items.extend(values)
-        setattr(namespace, self.dest, items)
+
+def _has_part(config: Config, key: str) -> bool:
+    try:
+        config.version.part(key)
+    except KeyError:
+        return False
+    return True
+
+
+def _handle_reset(args, config: Config) -> Optional[Update]:
+    return _do_update(Version.reset, args.reset, config, args.in_place)
+
+
+def _handle_commit(args, config: Config, updates: List[Update]):
+    if not (args.commit or args.tag):
+        return
+    if not updates:
+        raise MyverError('The --commit and --tag options need --bump or '
+                         '--reset')
+
+    from myver.git import commit_files, create_tag
+
+    old_version, new_version = updates[0].old, updates[-1].new
+    paths = list(dict.fromkeys(
+        path for update in updates for path in update.paths))
+    cwd = os.path.dirname(os.path.abspath(config.path))
+    commit = commit_files(
+        [os.path.abspath(path) for path in paths],
+        f'Bump version {old_version} to {new_version}', cwd)
+    if args.tag:
+        create_tag(f'{args.tag_prefix}{new_version}',
+                   f'Version {new_version}', commit, cwd)
+
+
+def _handle_export(args, config: Config):
+    if args.command != 'export':
+        return
+    config.export()
+    print(f'Exported {config.version} to {config.path}')
+
+
+def _handle_check(args, config: Config):
+    if args.command != 'check':
+        return
+
+    from myver.check import check_files, format_check
+
+    version = str(config.version)
+    results = check_files(config)
+    drifted = [result for result in results if not result.ok]
+    for result in drifted:
+        for line in format_check(result, version):
+            print(line)
+    if drifted:
+        raise MyverError(f'{len(drifted)} of {len(results)} files do not '
+                         f'have the current version {version}')
+
+
+def _do_update(func, arg, config: Config,
+               in_place: bool = False) -> Optional[Update]:
+    if arg:
+        # The files are updated under the lock too, so that concurrent
+        # bumps update them in the same order as the config.
+        with config.lock():
+            old_version_str = str(config.version)
+            with trace.span(func.__name__, args=arg):
+                func(config.version, arg)
+            new_version_str = str(config.version)
+            config.save()
+            paths = config.update_files(old_version_str, new_version_str,
+                                        in_place)
+        print(f'{old_version_str}  >>  {new_version_str}')
+        return Update(old_version_str, new_version_str, [config.path, *paths])
+    return None
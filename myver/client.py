@@ -0,0 +1,150 @@
+import json
+import os
+from logging import getLogger
+from typing import List, Optional
+
+from myver.args import parse_args, changed_args, AUTO_BUMP
+from myver.error import MyverError
+
+log = getLogger(__name__)
+
+SOCKET_ENV = 'MYVER_SOCKET'
+# The args that a server can answer, any other arg is run locally.
+SERVED_ARGS = {'config', 'socket', 'current', 'bump', 'reset'}
+
+
+class Client:
+    """A connection to a myver server, see `myver.server`.
+
+    This only uses the standard library so that it can be used without
+    loading the config or importing the rest of myver.
+
+    :param path: The path of the server's Unix socket.
+    :param timeout: Seconds to wait for the server to respond.
+    :raise OSError: If the server could not be connected to.
+    """
+
+    def __init__(self, path: str, timeout: float = None):
+        # Only imported once there is a server to connect to, since most
+        # runs of myver have none.
+        import socket
+
+        self.path: str = path
+        self._socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            self._socket.settimeout(timeout)
+            self._socket.connect(path)
+        except OSError:
+            self._socket.close()
+            raise
+        self._file = self._socket.makefile('rwb')
+
+    def request(self, op: str, **fields) -> dict:
+        """Send a request to the server and wait for its response.
+
+        :param op: The operation, one of `current`, `parse`, `bump` or
+            `reset`.
+        :param fields: The fields of the request, see `myver.server`.
+        :raise MyverError: If the server could not handle the request.
+        :return: The response of the server.
+        """
+        fields['op'] = op
+        self._file.write(json.dumps(fields).encode() + b'\n')
+        self._file.flush()
+        line = self._file.readline()
+        if not line:
+            raise MyverError(f'Myver server at {self.path} closed the '
+                             f'connection')
+        response = json.loads(line)
+        if not response['ok']:
+            raise MyverError(response['error'])
+        return response
+
+    def current(self, keys: List[str] = None) -> str:
+        """Get the current version, or parts of it, see `Version.parse`."""
+        return self.request('current', keys=keys or [])['version']
+
+    def parse(self, version: str) -> dict:
+        """Parse a version string into the value of each part."""
+        return self.request('parse', version=version)['values']
+
+    def bump(self, args: List[str]) -> dict:
+        """Bump the version, see `Version.bump`.
+
+        :return: The `old` and `new` version strings.
+        """
+        return self.request('bump', args=args)
+
+    def reset(self, keys: List[str]) -> dict:
+        """Reset parts of the version, see `Version.reset`.
+
+        :return: The `old` and `new` version strings.
+        """
+        return self.request('reset', keys=keys)
+
+    def close(self):
+        self._file.close()
+        self._socket.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def default_socket(config_path: str) -> str:
+    """Get the socket path that a server for a config listens on."""
+    return f'{config_path}.sock'
+
+
+def socket_path(args) -> str:
+    """Get the socket path to use for the parsed command line args."""
+    return (args.socket or os.environ.get(SOCKET_ENV)
+            or default_socket(args.config))
+
+
+def connect(path: str) -> Optional[Client]:
+    """Connect to a server, or get None if no server is running."""
+    if not os.path.exists(path):
+        return None
+    try:
+        return Client(path)
+    except OSError as e:
+        log.debug(f'Could not connect to myver server {path}, {e}')
+        return None
+
+
+def run(input_args: List[str] = None) -> bool:
+    """Run the command line args through a running server.
+
+    This answers `--current`, `--bump` and `--reset` without paying for
+    loading the config, printing the same output as `myver.cli`.
+
+    :param input_args: The command line args.
+    :raise MyverError: If the server could not handle a request.
+    :return: False if the args need to be run locally, either because no
+        server is running or because they use args a server can't answer.
+    """
+    args = parse_args(input_args)
+    if not changed_args(args) <= SERVED_ARGS:
+        return False
+    if args.bump and AUTO_BUMP in args.bump:
+        return False
+
+    client = connect(socket_path(args))
+    if client is None:
+        return False
+
+    with client:
+        if args.current is not None:
+            print(client.current(args.current))
+        if args.bump:
+            _print_update(client.bump(args.bump))
+        if args.reset:
+            _print_update(client.reset(args.reset))
+    return True
+
+
+def _print_update(response: dict):
+    print(f'{response["old"]}  >>  {response["new"]}')
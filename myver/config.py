@@ -1,24 +1,45 @@
+import hashlib
+import os
+from contextlib import contextmanager
 from logging import getLogger
-from typing import List, Dict
-
-import ruamel.yaml
+from typing import List, Dict, Optional, NamedTuple, Tuple
 
+from myver import simple_yaml
+from myver.cache import cache_dir, read_cache, write_cache
 from myver.error import ConfigError
-from myver.files import FileUpdater
+from myver.files import FileUpdater, update_files
+from myver.lock import lock_file
 from myver.part import Part, IdentifierPart, NumberPart
+from myver.trace import span
 from myver.version import Version
 
 log = getLogger(__name__)
 
+EXTENDS = 'extends'
+STATE = 'state'
+CONFIG_CACHE = 'configs'
+# Bumped whenever the layout of the config cache files changes.
+CONFIG_CACHE_VERSION = 1
+
 
 class Config:
     def __init__(self,
                  path: str = None,
                  files: List[FileUpdater] = None,
-                 version: Version = None):
+                 version: Version = None,
+                 auto: Dict[str, str] = None,
+                 includes: List[str] = None,
+                 state: str = None):
         self.path: str = path
         self.files: List[FileUpdater] = files
         self.version: Version = version
+        self.auto: Dict[str, str] = auto or {}
+        # The paths of the files that the config extends.
+        self.includes: List[str] = includes or []
+        # The path of the database that keeps the part values, if any.
+        self.state: Optional[str] = state
+        self._locked: bool = False
+        self._store = None
         if path and not (files or version):
             self.load()
 
@@ -28,16 +49,62 @@ class Config:
         :raise ConfigError: If the configuration file is invalid.
         """
         log.info(f'Loading config file {self.path}')
-        self._load_files()
-        self._load_version()
-
-    def _load_files(self):
-        config_dict = dict_from_yaml(self.path)
-        self.files = files_from_dict(config_dict)
-
-    def _load_version(self):
         config_dict = dict_from_yaml(self.path)
+        if isinstance(config_dict, dict) and EXTENDS in config_dict:
+            config_dict, self.includes = resolve_config(self.path)
+        with span('load files'):
+            self.files = files_from_dict(config_dict)
         self.version = version_from_dict(config_dict)
+        self.state = state_from_dict(config_dict, self.path)
+        if self.state is not None:
+            self.version = version_from_state(self.version, self.state)
+        self.auto = auto_from_dict(config_dict, self.version)
+
+    @contextmanager
+    def lock(self):
+        """Lock the config file while changing the version.
+
+        Under the lock the version is read from the file again. If it is
+        not the version that was loaded, another process has saved the
+        config since, and `version` is replaced by the version in the
+        file. So a change that is made and saved under the lock applies
+        to the latest values, as a compare and swap, and no process's
+        change is lost. Saving takes the same lock, see `lock_file`.
+
+        With a `state` database the lock is a transaction of the
+        database instead, which the values are read from and saved to
+        (see `StateStore.transaction`).
+
+        :raise LockError: If the lock could not be taken.
+        :raise ConfigError: If the config file is now invalid.
+        :raise OSError: If the file could not be read.
+        """
+        if self._locked:
+            yield
+            return
+        self._locked = True
+        try:
+            if self.state is None:
+                with lock_file(self.path):
+                    self._refresh(load_version(self.path))
+                    yield
+            else:
+                # Only imported with a state database, since most
+                # configs don't have one.
+                from myver.state import StateStore
+                with StateStore(self.state) as store, store.transaction():
+                    self._store = store
+                    self._refresh(with_values(self.version, store.values()))
+                    yield
+        finally:
+            self._locked = False
+            self._store = None
+
+    def _refresh(self, current: Version):
+        if current != self.version:
+            log.info(f'Config {self.path} was changed to {current} since '
+                     f'it was loaded as {self.version}')
+            self.version = current
 
     def save(self):
         """Syncs a version to a yaml file.
@@ -49,34 +116,98 @@ class Config:
         param. This also means that the yaml file must have existing
         configuration details for each part in the `version` param.
 
+        The files that the config extends are never written. When a
+        part that takes its value from one of them is changed, the new
+        value is added to the part in the config itself, overriding the
+        extended value.
+
+        The config file is locked while it is written, so that it is
+        never written by two processes at once, or read while it is half
+        written. Use `lock` to also apply the change to the latest values.
+
+        With a `state` database the values are saved to the database,
+        and the config file is not changed, see `export`.
+
         :raise FileNotFoundError: If the file does not exist.
         :raise OSError: For other errors when accessing the file.
         :raise ConfigError: When the yaml file does not have a 1:1 of
             keys for parts compared to the `version` param.
+        :raise LockError: If the file could not be locked.
+        """
+        if self.state is not None:
+            self._save_state()
+            return
+        log.info(f'Saving config file {self.path}')
+        self._write_values()
+
+    def export(self):
+        """Write the part values of the `state` database to the config
+        file.
+
+        The values in the config file are otherwise only the values that
+        the version starts from, before it is first saved to the
+        database. Writing them is the same as `save` without a database.
+
+        :raise ConfigError: If the config has no `state`, or as `save`.
+        :raise OSError: For errors when accessing the file.
+        :raise LockError: If the file could not be locked.
         """
+        if self.state is None:
+            raise ConfigError(f'You must have `{STATE}` configured to export '
+                              f'it')
+        log.info(f'Exporting state {self.state} to config file {self.path}')
+        self._write_values()
+
+    def _save_state(self):
+        """Save the part values to the `state` database."""
+        log.info(f'Saving version to state database {self.state}')
+        values = {part.key: part.value for part in self.version.parts}
+        if self._store is not None:
+            self._store.save(values)
+            return
+        from myver.state import StateStore
+        with StateStore(self.state) as store, store.transaction():
+            store.save(values)
+
+    def _write_values(self):
         try:
-            log.info(f'Saving config file {self.path}')
-            self._save_version_values()
+            with lock_file(self.path), span('save config'):
+                self._save_version_values()
         except KeyError as key_error:
             key = key_error.args[0]
             raise ConfigError(
                 f'You must have the required attribute `{key}` configured')
 
-    def update_files(self, old_version: str, new_version: str):
-        """Update any configured files with the version."""
-        for file_updater in self.files:
-            file_updater.update(old_version, new_version)
+    def update_files(self, old_version: str, new_version: str,
+                     in_place: bool = False) -> List[str]:
+        """Update any configured files with the version.
+
+        Every glob is expanded first, then each file is read and written
+        once with the patterns of every updater that matches it, even
+        when it is matched through different paths or links.
+
+        :param old_version: The version to change.
+        :param new_version: The version to change to.
+        :param in_place: Only write the changed bytes of each file when
+            the versions have the same length, see `patch_file`.
+        :return: The paths of the files that were written.
+        """
+        with span('update files', globs=len(self.files)):
+            return update_files(self.files, old_version, new_version,
+                                in_place)
 
     def _save_version_values(self):
         """Update config file part based on `version` object."""
+        config_dict = dict_from_yaml(self.path)
+        with open(self.path, 'r') as file:
+            lines = file.readlines()
+
         log.debug(f'Getting value update map for path {self.path}')
-        update_map = self._get_value_update_map()
+        update_map, overrides = self._get_value_update_map(config_dict,
+                                                           lines)
         log.debug(f'Update map for {self.path}:')
         log.debug(f'{update_map}')
 
-        with open(self.path, 'r') as file:
-            lines = file.readlines()
-
         with open(self.path, 'w') as file:
             for index, value in update_map.items():
                 indent_length = len(lines[index]) - len(lines[index].lstrip())
@@ -86,42 +217,59 @@ class Config:
                 log.debug(f'New:\n{updated}')
                 lines[index] = updated
 
+            if overrides:
+                log.debug(f'Overriding extended values {overrides}')
+                lines = add_part_values(lines, config_dict, overrides)
+
             log.debug(f'Writing changes')
             file.writelines(lines)
 
-    def _get_value_update_map(self) -> Dict[int, str]:
+    def _get_value_update_map(self, config_dict: Dict, lines: List[str]) \
+            -> Tuple[Dict[int, str], Dict[str, str]]:
         """Get an update map for version values in a config file.
 
+        :param config_dict: The data of the config file, without the
+            files it extends.
+        :param lines: The lines of the config file.
         :return: A dict with each key in the dict represents the index
             in the lines list to update (based on index counter starting
             at 0). The value of each entry in the dict represents a
-            part's value to be updated at the given line index.
+            part's value to be updated at the given line index. Then
+            the changed values of parts that take their value from an
+            extended file, by part key, which must be added to the
+            config file.
         """
-        config_dict = dict_from_yaml(self.path)
+        local_parts = config_dict.get('parts') or {}
+        inherited = None
         update_map = dict()
-
-        with open(self.path, 'r') as file:
-            lines = file.readlines()
-
-            for key in config_dict['parts'].keys():
-                log.debug(f'Getting value index for part <{key}>')
-                # We want to start at the part's key so that the next
-                # `value` node is guaranteed to be the part's `value` node.
-                from_index = config_dict['parts'][key].lc.line
-                # Note, it's an index (as related to list indexes) and not
-                # a line number.
-                line_index = find_value_node_index(lines, from_index)
-                part = self.version.part(key)
-
-                if part.value is None:
-                    update_map[line_index] = 'null'
-                else:
-                    update_map[line_index] = part.value
-
-                log.debug(f'Part <{key}> value index is <{line_index}> with '
-                          f'value <{update_map[line_index]}>')
-
-        return update_map
+        overrides = dict()
+
+        keys = [*local_parts.keys(),
+                *(part.key for part in self.version.parts)]
+        for key in dict.fromkeys(keys):
+            part = self.version.part(key)
+            value = 'null' if part.value is None else part.value
+            part_dict = local_parts.get(key)
+            if not isinstance(part_dict, dict) or 'value' not in part_dict:
+                if inherited is None:
+                    inherited = resolve_config(self.path).config_dict['parts']
+                if inherited[key].get('value') != part.value:
+                    overrides[key] = value
+                continue
+
+            log.debug(f'Getting value index for part <{key}>')
+            # We want to start at the part's key so that the next
+            # `value` node is guaranteed to be the part's `value` node.
+            from_index = part_dict.lc.line
+            # Note, it's an index (as related to list indexes) and not
+            # a line number.
+            line_index = find_value_node_index(lines, from_index)
+            update_map[line_index] = value
+
+            log.debug(f'Part <{key}> value index is <{line_index}> with '
+                      f'value <{update_map[line_index]}>')
+
+        return update_map, overrides
 
 
 def dict_from_yaml(path: str) -> Dict:
@@ -131,16 +279,330 @@ def dict_from_yaml(path: str) -> Dict:
     path can be overridden by using the `path` arg.
 
     :param path: The path to the myver config file.
+    :raise ConfigError: If the file is not valid yaml.
     :raise FileNotFoundError: If the file does not exist.
     :raise OSError: For other errors when accessing the file.
     """
+    with span('import yaml'):
+        # Imported here since it is slow to import, and reading the
+        # version does not need it for most configs (see `load_version`).
+        import ruamel.yaml
+        from ruamel.yaml.error import YAMLError
+
     log.debug(f'Getting dict from yaml {path}')
-    with open(path, 'r') as file:
+    with span('load yaml', path=path) as load_span, \
+            lock_file(path, shared=True), open(path, 'r') as file:
+        text = file.read()
+        load_span.count('bytes', len(text))
         yaml = ruamel.yaml.YAML()
-        config_dict = yaml.load(file)
+        try:
+            config_dict = yaml.load(text)
+        except YAMLError as e:
+            raise ConfigError(f'Config file {path} is not valid yaml, {e}')
     return config_dict
 
 
+def load_version(path: str) -> Version:
+    """Load only the version from a config file.
+
+    This is for commands that only read the version, such as
+    `--current`. The file is read up to the end of the `parts` section,
+    and only that section is parsed, since the line numbers that saving
+    needs are not kept. Most sections are within the subset of yaml that
+    `myver.simple_yaml` loads, which avoids importing a full yaml loader.
+    Otherwise the section is loaded with the safe loader, and if it
+    can't be loaded on its own (e.g. it uses an anchor from another
+    section), the whole file is loaded instead. Nothing else in the
+    config is loaded or checked, unless the config extends other files
+    (see `resolve_config`).
+
+    :param path: The path to the myver config file.
+    :raise ConfigError: If the `parts` configuration is invalid.
+    :raise FileNotFoundError: If the file does not exist.
+    :raise OSError: For other errors when accessing the file.
+    """
+    log.info(f'Loading version from config file {path}')
+    with span('load parts section', path=path) as load_span:
+        section = read_parts_section(path)
+        load_span.count('bytes', len(section))
+        config_dict = simple_yaml.load(section)
+        load_span.set(loader='simple')
+        if config_dict is None and section:
+            load_span.set(loader='safe')
+            config_dict = safe_dict_from_yaml(section)
+
+    if not isinstance(config_dict, dict) \
+            or not (config_dict.get('parts') or EXTENDS in config_dict):
+        config_dict = dict_from_yaml(path)
+    if isinstance(config_dict, dict) and EXTENDS in config_dict:
+        config_dict = resolve_config(path).config_dict
+    version = version_from_dict(config_dict)
+    state = state_from_dict(config_dict, path)
+    if state is not None:
+        version = version_from_state(version, state)
+    return version
+
+
+def load_read_only(path: str) -> Config:
+    """Load a config that will not be saved.
+
+    Saving needs the line numbers that the round trip loader keeps, which
+    makes it much slower. Commands that only read the config, such as
+    `check`, load it with `myver.simple_yaml` or the safe loader instead,
+    and only fall back to the round trip loader like `load_version` does.
+
+    :param path: The path to the myver config file.
+    :raise ConfigError: If the configuration is invalid.
+    :raise FileNotFoundError: If the file does not exist.
+    :raise OSError: For other errors when accessing the file.
+    """
+    log.info(f'Loading config file {path} as read only')
+    with span('load yaml', path=path) as load_span:
+        with lock_file(path, shared=True), open(path, 'r') as file:
+            text = file.read()
+        load_span.count('bytes', len(text))
+        config_dict = simple_yaml.load(text)
+        if config_dict is None:
+            config_dict = safe_dict_from_yaml(text)
+    if not isinstance(config_dict, dict):
+        config_dict = dict_from_yaml(path)
+    includes = []
+    if isinstance(config_dict, dict) and EXTENDS in config_dict:
+        config_dict, includes = resolve_config(path)
+    version = version_from_dict(config_dict)
+    state = state_from_dict(config_dict, path)
+    if state is not None:
+        version = version_from_state(version, state)
+    return Config(path, files_from_dict(config_dict), version,
+                  auto_from_dict(config_dict, version), includes, state)
+
+
+def safe_dict_from_yaml(text: str) -> Optional[Dict]:
+    """Load yaml with the safe loader, or get None if it is invalid."""
+    from ruamel.yaml import YAML
+    from ruamel.yaml.error import YAMLError
+
+    try:
+        return YAML(typ='safe').load(text)
+    except YAMLError as e:
+        log.debug(f'Could not load yaml with the safe loader, {e}')
+        return None
+
+
+def read_parts_section(path: str) -> str:
+    """Read the lines of the top level `parts` section of a config file.
+
+    The top level `extends` and `state` sections are kept as well, since
+    they change where the parts and their values come from. The lines of
+    any other section are skipped without being kept.
+
+    :param path: The path to the myver config file.
+    :return: The sections, or an empty string if there are none.
+    """
+    lines = []
+    keep = False
+    with lock_file(path, shared=True), open(path, 'r') as file:
+        for line in file:
+            if not (line[:1].isspace() or line.startswith(('#', '-'))):
+                keep = line.startswith(('parts:', f'{EXTENDS}:', f'{STATE}:'))
+            if keep:
+                lines.append(line)
+    return ''.join(lines)
+
+
+class ResolvedConfig(NamedTuple):
+    """A config merged with the files that it extends.
+
+    :param config_dict: The merged config data.
+    :param includes: The paths of the extended files.
+    """
+    config_dict: Dict
+    includes: List[str]
+
+
+def resolve_config(path: str) -> ResolvedConfig:
+    """Load a config merged with the files that it extends.
+
+    The `extends` attribute is a path, or a List of paths, relative to
+    the file that has it. Each extended file can extend others in turn.
+    They are merged in order, and the config itself is merged last, see
+    `merge_dicts`.
+
+    The merged config is cached in the user's cache directory (see
+    `myver.cache.cache_dir`) with a hash of each file it was merged
+    from. Later loads only read and hash the files, rather than parsing
+    each of them, until any of the files change.
+
+    :param path: The path to the myver config file.
+    :raise ConfigError: If a file is invalid, can't be read, or the
+        files extend each other in a cycle.
+    :raise FileNotFoundError: If the file does not exist.
+    :raise OSError: For other errors when accessing the file.
+    """
+    path = os.path.abspath(path)
+    cache_path = os.path.join(
+        cache_dir(), CONFIG_CACHE,
+        f'{hashlib.sha1(path.encode()).hexdigest()}.json')
+    with span('resolve config', path=path) as resolve_span:
+        cached = read_cache(cache_path)
+        if cached is not None and cached.get('key') == CONFIG_CACHE_VERSION \
+                and files_unchanged(cached['files']):
+            log.debug(f'Using resolved config from {cache_path}')
+            resolve_span.set(cached=True)
+            files = cached['files']
+            config_dict = cached['config']
+        else:
+            files = []
+            config_dict = _resolve_file(path, [], files)
+            write_cache(cache_path, {'key': CONFIG_CACHE_VERSION,
+                                     'files': files, 'config': config_dict})
+        resolve_span.count('files', len(files))
+    includes = list(dict.fromkeys(file_path for file_path, _ in files[1:]))
+    return ResolvedConfig(config_dict, includes)
+
+
+def _resolve_file(path: str, chain: List[str], files: List[List[str]]) \
+        -> Dict:
+    """Load a config file merged with the files that it extends.
+
+    :param path: The absolute path of the file.
+    :param chain: The files that extend this file, to find cycles.
+    :param files: Where to add the path and hash of each file read.
+    """
+    if path in chain:
+        cycle = ' > '.join(chain[chain.index(path):] + [path])
+        raise ConfigError(f'Config files extend each other in a cycle, '
+                          f'{cycle}')
+    with lock_file(path, shared=True), open(path, 'rb') as file:
+        data = file.read()
+    files.append([path, hashlib.sha1(data).hexdigest()])
+    config_dict = plain_dict_from_yaml(data.decode(), path)
+
+    extends = config_dict.pop(EXTENDS, None)
+    if extends is None:
+        return config_dict
+    if isinstance(extends, str):
+        extends = [extends]
+    if not isinstance(extends, list) \
+            or not all(isinstance(include, str) for include in extends):
+        raise ConfigError(f'The `{EXTENDS}` attribute in {path} must be a '
+                          f'path or a list of paths')
+
+    merged = {}
+    for include in extends:
+        include_path = os.path.normpath(os.path.join(
+            os.path.dirname(path), os.path.expanduser(include)))
+        try:
+            base = _resolve_file(include_path, chain + [path], files)
+        except OSError as e:
+            raise ConfigError(f'Config file {path} extends {include}, which '
+                              f'could not be read, {e.strerror}')
+        merged = merge_dicts(merged, base)
+    return merge_dicts(merged, config_dict)
+
+
+def plain_dict_from_yaml(text: str, path: str) -> Dict:
+    """Load config yaml without the line numbers that saving needs.
+
+    :param text: The yaml to load.
+    :param path: The path of the file, for errors.
+    :raise ConfigError: If the yaml is invalid or not a mapping.
+    """
+    config_dict = simple_yaml.load(text)
+    if config_dict is None:
+        config_dict = safe_dict_from_yaml(text)
+    if not isinstance(config_dict, dict):
+        raise ConfigError(f'Config file {path} is not a valid yaml mapping')
+    return config_dict
+
+
+def files_unchanged(files: List[List[str]]) -> bool:
+    """Check that files still have the hashes they were read with."""
+    for path, file_hash in files:
+        try:
+            with open(path, 'rb') as file:
+                if hashlib.sha1(file.read()).hexdigest() != file_hash:
+                    return False
+        except OSError:
+            return False
+    return True
+
+
+def merge_dicts(base: Dict, override: Dict) -> Dict:
+    """Merge config data, where the values of `override` take precedence.
+
+    Mappings are merged key by key, with the keys of `base` first in
+    their order, and then any new keys of `override`. So a config can
+    change some attributes of an extended part, and add parts after the
+    extended ones. Any other value, such as the List of `files`, is
+    replaced.
+
+    :param base: The data to merge into, which is not changed.
+    :param override: The data to merge.
+    :return: The merged data.
+    """
+    merged = dict(base)
+    for key, value in override.items():
+        if isinstance(value, dict) and isinstance(merged.get(key), dict):
+            merged[key] = merge_dicts(merged[key], value)
+        else:
+            merged[key] = value
+    return merged
+
+
+def add_part_values(lines: List[str], config_dict: Dict,
+                    values: Dict[str, str]) -> List[str]:
+    """Add `value` attributes to the parts of a config file.
+
+    This is how a part that takes its value from an extended file has
+    its value overridden by the config itself. The value is added to the
+    part in the `parts` section, and the part or the section is added
+    when the config does not have it.
+
+    :param lines: The lines of the config file.
+    :param config_dict: The data of the config file, without the files
+        it extends.
+    :param values: The values to add, by part key.
+    :return: The lines with the values added.
+    """
+    parts = config_dict.get('parts')
+    # Lines to add before a line index, for each index.
+    inserts: Dict[int, List[str]] = {}
+    if 'parts' in config_dict:
+        parts_index = config_dict.lc.key('parts')[0]
+    else:
+        if lines and not lines[-1].endswith('\n'):
+            lines[-1] += '\n'
+        lines.append('parts:\n')
+        parts_index = len(lines) - 1
+    if isinstance(parts, dict) and parts:
+        indent = parts.lc.key(next(iter(parts)))[1]
+    else:
+        indent = 2
+        lines[parts_index] = 'parts:\n'
+        parts = {}
+
+    for key, value in values.items():
+        part_dict = parts.get(key)
+        if isinstance(part_dict, dict) and part_dict:
+            inserts.setdefault(part_dict.lc.line, []).append(
+                f'{" " * part_dict.lc.col}value: {value}\n')
+            continue
+        if key in parts:
+            key_index, key_indent = parts.lc.key(key)
+            lines[key_index] = f'{" " * key_indent}{key}:\n'
+        else:
+            key_index, key_indent = parts_index, indent
+            inserts.setdefault(key_index + 1, []).append(
+                f'{" " * key_indent}{key}:\n')
+        inserts.setdefault(key_index + 1, []).append(
+            f'{" " * (key_indent + indent)}value: {value}\n')
+
+    for index in sorted(inserts, reverse=True):
+        lines[index:index] = inserts[index]
+    return lines
+
+
 def find_value_node_index(lines: List[str], from_index: int) -> int:
     """Find the line index for the `value` node.
 
@@ -161,10 +623,13 @@ def version_from_dict(config_dict: Dict) -> Version:
     :return: The version.
     """
     try:
-        parts: List[Part] = []
-        for part_key, part_dict in config_dict['parts'].items():
-            parts.append(part_from_dict(part_key, part_dict))
-        return Version(parts)
+        with span('load version') as load_span:
+            parts: List[Part] = []
+            for part_key, part_dict in config_dict['parts'].items():
+                parts.append(part_from_dict(part_key, part_dict))
+            load_span.count('parts', len(parts))
+            with span('validate version', parts=len(parts)):
+                return Version(parts)
     except KeyError as key_error:
         key = key_error.args[0]
         raise ConfigError(
@@ -235,3 +700,66 @@ def files_from_dict(config_dict: Dict) -> List[FileUpdater]:
         raise ConfigError(
             f'You must have the required attribute `{key}` configured in '
             f'`files`')
+
+
+def auto_from_dict(config_dict: Dict, version: Version) -> Dict[str, str]:
+    """Get the `auto` attribute from a config dict.
+
+    :param config_dict: The dict with raw config data.
+    :param version: The version that the rules bump.
+    :raise ConfigError: If the configuration dict is invalid.
+    :return: The part key to bump for each commit type, with the types
+        in lower case.
+    """
+    rules = config_dict.get('auto') or {}
+    if not isinstance(rules, dict):
+        raise ConfigError('The `auto` attribute must map commit types to '
+                          'part keys')
+    keys = {part.key for part in version.parts}
+    for commit_type, key in rules.items():
+        if key not in keys:
+            raise ConfigError(f'Commit type `{commit_type}` in `auto` must '
+                              f'be a part key, `{key}` is not a part')
+    return {str(commit_type).lower(): key
+            for commit_type, key in rules.items()}
+
+
+def state_from_dict(config_dict: Dict, path: str) -> Optional[str]:
+    """Get the `state` attribute from a config dict.
+
+    :param config_dict: The dict with raw config data.
+    :param path: The path of the config file, which the database path is
+        relative to.
+    :raise ConfigError: If the configuration dict is invalid.
+    :return: The path of the state database, or None if the values are
+        kept in the config file.
+    """
+    state = config_dict.get(STATE)
+    if state is None:
+        return None
+    if not isinstance(state, str):
+        raise ConfigError(f'The `{STATE}` attribute must be the path of a '
+                          f'database')
+    return os.path.join(os.path.dirname(os.path.abspath(path)),
+                        os.path.expanduser(state))
+
+
+def version_from_state(version: Version, state: str) -> Version:
+    """Get a version with the part values saved in a state database.
+
+    Parts without a saved value keep their value from the config.
+    """
+    # Only imported with a state database, since most configs don't have
+    # one.
+    from myver.state import read_state
+
+    return with_values(version, read_state(state))
+
+
+def with_values(version: Version, values: Dict) -> Version:
+    """Get a copy of a version with some of its part values replaced."""
+    parts = [part.copy() for part in version.parts]
+    for part in parts:
+        if part.key in values:
+            part.value = values[part.key]
+    return Version(parts)
@@ -0,0 +1,208 @@
+from __future__ import annotations
+
+import functools
+import operator
+from logging import getLogger
+from typing import List, Iterable, Iterator, Tuple, Union, Callable
+
+from myver.error import ParseError
+from myver.parser import VersionParser
+from myver.snapshot import VersionSnapshot
+from myver.version import Version
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+log = getLogger(__name__)
+
+WILDCARD = '*'
+
+# Longer operators first so that `>=` is never read as `>`.
+OPERATORS = {
+    '==': operator.eq,
+    '!=': operator.ne,
+    '>=': operator.ge,
+    '<=': operator.le,
+    '>': operator.gt,
+    '<': operator.lt,
+}
+
+
+class Clause:
+    """A single comparison within a constraint, such as `>=1.2.0`.
+
+    :param op: The comparison operator.
+    :param key: The sort key of the version to compare with.
+    :param wildcard: Whether the clause has a wildcard (e.g. `==1.4.*`),
+        in which case `key` only has the parts before the wildcard, and
+        only those parts are compared.
+    """
+
+    __slots__ = ('op', 'key', 'wildcard', '_compare')
+
+    def __init__(self, op: str, key: Tuple[int, ...], wildcard: bool = False):
+        self.op: str = op
+        self.key: Tuple[int, ...] = key
+        self.wildcard: bool = wildcard
+        self._compare: Callable[[tuple, tuple], bool] = OPERATORS[op]
+
+    def matches(self, key: Tuple[int, ...]) -> bool:
+        """Checks if a version's sort key satisfies this clause."""
+        if self.wildcard:
+            return self._compare(key[:len(self.key)], self.key)
+        return self._compare(key, self.key)
+
+    def mask(self, array):
+        """Get a mask of the versions in a `VersionArray` that satisfy
+        this clause."""
+        if self.wildcard:
+            length = len(self.key)
+            equal = np.all(
+                array.data[:, :length] == np.array(self.key), axis=1)
+            return equal if self.op == '==' else ~equal
+        return self._compare(array.compare(self.key), 0)
+
+
+class Constraint:
+    """A compiled version constraint expression.
+
+    An expression is a comma separated List of clauses that must all be
+    satisfied, such as `>=1.2.0,<2.0.0,!=1.4.*`. Each clause is an
+    operator (`==`, `!=`, `>=`, `<=`, `>` or `<`) followed by a version,
+    a version without an operator means `==`. The `==` and `!=`
+    operators also accept a wildcard at the end of the version, which
+    compares only the parts before the wildcard.
+
+    Versions are compared with their sort keys, so the order of
+    identifier strings in the config is respected. This also means that
+    `<2.0.0` includes pre-releases such as `2.0.0-alpha.1`, since they
+    sort before the release. The expression is
+    parsed once, after that checking a version is only a few tuple
+    comparisons.
+
+    :param expression: The constraint expression.
+    :param parser: The parser for the versions in the expression.
+    :raise ParseError: If the expression is invalid.
+    """
+
+    def __init__(self, expression: str, parser: VersionParser):
+        self.expression: str = expression
+        self.parser: VersionParser = parser
+        self.clauses: List[Clause] = [
+            self._compile_clause(clause) for clause in expression.split(',')
+        ]
+
+    def matches(self, version: Union[VersionSnapshot, Version]) -> bool:
+        """Checks if a version satisfies the constraint."""
+        key = version.sort_key
+        for clause in self.clauses:
+            if not clause.matches(key):
+                return False
+        return True
+
+    __call__ = matches
+
+    def filter(self, versions: Iterable[Union[VersionSnapshot, Version]]) \
+            -> Iterator[Union[VersionSnapshot, Version]]:
+        """Lazily get the versions that satisfy the constraint."""
+        clauses = self.clauses
+        for version in versions:
+            key = version.sort_key
+            if all(clause.matches(key) for clause in clauses):
+                yield version
+
+    def matches_strings(self, strings: Iterable[str]) -> List[bool]:
+        """Check many version strings against the constraint.
+
+        :param strings: The version strings, strings that are not valid
+            versions never satisfy the constraint.
+        :return: Whether each string satisfies the constraint.
+        """
+        parse_values = self.parser.parse_values
+        sort_key = self.parser.schema.sort_key
+        clauses = self.clauses
+        results = []
+        for string in strings:
+            values = parse_values(string)
+            if values is None:
+                results.append(False)
+                continue
+            key = sort_key(values)
+            results.append(all(clause.matches(key) for clause in clauses))
+        return results
+
+    def mask(self, array):
+        """Get a mask of the versions in a `VersionArray` that satisfy
+        the constraint.
+
+        :param array: The version array, it must have the same parts as
+            the parser of this constraint.
+        """
+        mask = np.ones(len(array), dtype=bool)
+        for clause in self.clauses:
+            mask &= clause.mask(array)
+        return mask
+
+    def _compile_clause(self, clause: str) -> Clause:
+        clause = clause.strip()
+        op = '=='
+        for candidate in OPERATORS:
+            if clause.startswith(candidate):
+                op = candidate
+                clause = clause[len(candidate):].strip()
+                break
+
+        if not clause:
+            raise ParseError(
+                f'Constraint `{self.expression}` has a clause without a '
+                f'version')
+
+        if clause.endswith(WILDCARD):
+            if op not in ('==', '!='):
+                raise ParseError(
+                    f'Constraint `{self.expression}` uses a wildcard with '
+                    f'`{op}`, wildcards can only be used with `==` or `!=`')
+            values = self._parse_wildcard(clause[:-len(WILDCARD)])
+            set_parts = [i for i, value in enumerate(values)
+                         if value is not None]
+            length = set_parts[-1] + 1 if set_parts else 0
+            key = self.parser.schema.sort_key(values)[:length]
+            return Clause(op, key, wildcard=True)
+
+        return Clause(op, self.parser.parse(clause).sort_key)
+
+    def _parse_wildcard(self, version: str) -> tuple:
+        """Parse the version before a wildcard, e.g. `1.4.` of `1.4.*`.
+
+        The version may end with the prefix of the part that the
+        wildcard stands for, which is removed before it is parsed.
+        """
+        candidates = [version] + [
+            version[:-len(part.prefix)]
+            for part in self.parser.schema.parts
+            if part.prefix and version.endswith(part.prefix)
+        ]
+        for candidate in candidates:
+            values = self.parser.parse_values(candidate, partial=True)
+            if values is not None:
+                return values
+        raise ParseError(
+            f'Constraint `{self.expression}` has an invalid wildcard version '
+            f'`{version}{WILDCARD}`')
+
+    def __repr__(self):
+        return f'Constraint({self.expression!r})'
+
+
+@functools.lru_cache(maxsize=256)
+def compile_constraint(expression: str, parser: VersionParser) -> Constraint:
+    """Get a compiled constraint, reusing it if it was compiled before.
+
+    :param expression: The constraint expression.
+    :param parser: The parser for the versions in the expression.
+    :raise ParseError: If the expression is invalid.
+    """
+    log.debug(f'Compiling constraint <{expression}>')
+    return Constraint(expression, parser)
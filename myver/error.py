@@ -11,3 +11,15 @@ class ConfigError(MyverError):
 
 class BumpError(MyverError):
     """Bumping a version or part failed."""
+
+
+class ParseError(MyverError):
+    """Parsing a version string failed."""
+
+
+class GitError(MyverError):
+    """Running a git command failed."""
+
+
+class LockError(MyverError):
+    """Locking a config file failed."""
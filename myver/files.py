@@ -1,13 +1,20 @@
+import functools
+import json
+import mmap
+import os
 import re
-from dataclasses import dataclass
 from glob import glob
 from logging import getLogger
-from typing import List
+from typing import List, Tuple, NamedTuple, Dict, Union, Optional
 
-from jinja2 import Template
+from myver.trace import span
 
 log = getLogger(__name__)
 
+# The (device, inode) of a file, which is the same for every link to it.
+FileId = Tuple[int, int]
+JOURNAL_SUFFIX = '.myver-journal'
+
 
 class FileUpdater:
     """Updates files with new versions.
@@ -22,58 +29,370 @@ class FileUpdater:
         self.path: str = path
         self.patterns: List[str] = patterns or ['{{ version }}']
 
-    def update(self, old_version: str, new_version: str):
+    def update(self, old_version: str, new_version: str) -> List[str]:
+        """Update the files matching the path glob.
+
+        :return: The paths of the files that were written.
+        """
         log.debug(f'Doing update for glob <{self.path}>')
-        for path in glob(self.path):
-            try:
-                log.info(f'Updating <{path}>')
-                with open(path, 'r') as file:
-                    data = file.read()
-                with open(path, 'w') as file:
-                    updated = self._update_data(data, old_version, new_version)
-                    file.write(updated)
-            except FileNotFoundError:
-                log.error(f'Path does not exist <{path}>')
-            except OSError as e:
-                log.error(f'Error {e.errno} updating <{path}>, {e.strerror}')
+        written = []
+        with span('expand glob', glob=self.path) as glob_span:
+            paths = glob(self.path)
+            glob_span.count('paths', len(paths))
+        for path in paths:
+            if update_file(path, self.patterns, old_version, new_version):
+                written.append(path)
+        return written
 
     def _update_data(self, data: str, old_version: str,
                      new_version: str) -> str:
-        rendered_patterns = self._rendered_patterns(old_version)
-        update_pairs: List[UpdatePair] = []
-        updated_data = data
+        return update_data(data, self.patterns, old_version, new_version)
+
+    def __eq__(self, other):
+        return (self.path == other.path) and (self.patterns == self.patterns)
+
+
+class FileTarget(NamedTuple):
+    """A file to update, with every path that leads to it.
+
+    :param paths: The paths of the file, which are links to the same file
+        when there is more than one.
+    :param patterns: The patterns of every updater that matched the file.
+    """
+    paths: List[str]
+    patterns: List[str]
 
-        for pattern in rendered_patterns:
-            log.debug(f'Searching for pattern <{pattern}>')
-            for match in re.findall(pattern, data):
-                original = match
-                updated = match.replace(old_version, new_version)
-                log.debug(f'Changing <{original}> to <{updated}>')
-                update_pairs.append(UpdatePair(original, updated))
 
-        for pair in update_pairs:
-            updated_data = updated_data.replace(pair.original, pair.updated)
+def group_targets(file_updaters: List[FileUpdater]) -> List[FileTarget]:
+    """Expand the globs of updaters, grouping the paths by file.
+
+    Paths are grouped by their (device, inode), so symbolic and hard
+    links to a file, and a file that more than one glob matches, are
+    updated once with the patterns of every updater that matched it.
+
+    :param file_updaters: The updaters to expand.
+    :return: The files in the order that their first path was matched.
+    """
+    targets: Dict[Union[FileId, str], FileTarget] = {}
+    for file_updater in file_updaters:
+        with span('expand glob', glob=file_updater.path) as glob_span:
+            paths = glob(file_updater.path)
+            glob_span.count('paths', len(paths))
+        for path in paths:
+            target = targets.setdefault(file_key(path), FileTarget([], []))
+            if path not in target.paths:
+                target.paths.append(path)
+            target.patterns.extend(file_updater.patterns)
+    return list(targets.values())
+
+
+def file_key(path: str) -> Union[FileId, str]:
+    """Get the id of the file at a path, or the path if it has no file."""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return path
+    return stat.st_dev, stat.st_ino
+
+
+def resolve_globs(file_updaters: List[FileUpdater],
+                  directory: str) -> List[FileUpdater]:
+    """Get the updaters with relative path globs joined to a directory.
+
+    :param file_updaters: The updaters, absolute globs are kept as is.
+    :param directory: The directory the relative globs are relative to,
+        usually the directory of the config.
+    """
+    return [FileUpdater(os.path.join(directory, file_updater.path),
+                        file_updater.patterns)
+            for file_updater in file_updaters]
+
+
+def update_files(file_updaters: List[FileUpdater], old_version: str,
+                 new_version: str, in_place: bool = False) -> List[str]:
+    """Update the files of many updaters, each file is only read and
+    written once.
+
+    An update of a file that was patched in place and interrupted is
+    finished before the file is updated again, see `patch_file`.
+
+    :param file_updaters: The updaters of the files.
+    :param old_version: The version to change.
+    :param new_version: The version to change to.
+    :param in_place: Patch the changed bytes of each file in place when
+        the versions have the same length, see `patch_file`.
+    :return: The paths of the files that were written, including every
+        link to them.
+    """
+    update = patch_file if in_place else update_file
+    written = []
+    for target in group_targets(file_updaters):
+        path = target.paths[0]
+        recover_journal(path)
+        if update(path, target.patterns, old_version, new_version):
+            written.extend(target.paths)
+    return written
+
+
+def patch_file(path: str, patterns: List[str], old_version: str,
+               new_version: str) -> bool:
+    """Update the version in a file by only writing the changed bytes.
+
+    When the versions have the same length, the matches are found in a
+    memory map of the file, and the new version is written over the old
+    one at each position. Nothing else in the file is read into memory
+    or written. When the lengths differ, the whole file is rewritten
+    with `update_file`. Errors are logged.
+
+    The patterns are matched as bytes, so classes such as `\\w` only
+    match ASCII characters. The positions are written to a journal
+    before the file is changed, and the journal is removed once every
+    position is written. If patching is interrupted, the next update of
+    the file finishes it, see `recover_journal`.
+
+    :return: Whether the file was written.
+    """
+    old, new = old_version.encode(), new_version.encode()
+    if len(old) != len(new):
+        return update_file(path, patterns, old_version, new_version)
+
+    try:
+        log.info(f'Patching <{path}>')
+        with span('patch file', path=path) as file_span, \
+                open(path, 'r+b') as file:
+            offsets = find_offsets(file.fileno(), patterns, old_version)
+            file_span.count('patches', len(offsets))
+            if not offsets:
+                return False
+            write_journal(path, old_version, new_version, offsets)
+            write_patches(file.fileno(), offsets, new)
+            os.fsync(file.fileno())
+            os.remove(journal_path(path))
+        return True
+    except FileNotFoundError:
+        log.error(f'Path does not exist <{path}>')
+    except OSError as e:
+        log.error(f'Error {e.errno} patching <{path}>, {e.strerror}')
+    return False
+
+
+def find_offsets(fd: int, patterns: List[str], old_version: str) \
+        -> List[int]:
+    """Get the byte positions of the old version to change in a file.
+
+    These are the same as the changes of `update_data`, every occurrence
+    of a match is changed, not only the match itself.
+
+    :param fd: The file descriptor of the file.
+    :param patterns: The patterns of the file.
+    :param old_version: The version to change.
+    """
+    if os.fstat(fd).st_size == 0:
+        return []
+    old = old_version.encode()
+    offsets = set()
+    patterns = tuple(dict.fromkeys(patterns))
+    with mmap.mmap(fd, 0, access=mmap.ACCESS_READ) as data:
+        for pattern in compiled_byte_patterns(patterns, old_version):
+            for text in dict.fromkeys(pattern.findall(data)):
+                if not text:
+                    continue
+                start = data.find(text)
+                while start != -1:
+                    index = text.find(old)
+                    while index != -1:
+                        offsets.add(start + index)
+                        index = text.find(old, index + len(old))
+                    start = data.find(text, start + len(text))
+    return sorted(offsets)
 
-        return updated_data
 
-    def _rendered_patterns(self, version: str) -> List[str]:
-        rendered_patterns = []
+def write_patches(fd: int, offsets: List[int], data: bytes):
+    """Write data at each of the sorted offsets of a file.
 
-        for pattern in self.patterns:
+    Patches that are closer together than a page are written with a
+    single write of the bytes between them. Those pages are written to
+    the disk either way, and this saves a system call for each patch in
+    files that have the version on many lines.
+    """
+    length = len(data)
+    index = 0
+    while index < len(offsets):
+        end = index + 1
+        while end < len(offsets) \
+                and offsets[end] - offsets[end - 1] < mmap.PAGESIZE:
+            end += 1
+        start = offsets[index]
+        if end - index == 1:
+            os.pwrite(fd, data, start)
+        else:
+            region = bytearray(os.pread(
+                fd, offsets[end - 1] + length - start, start))
+            for offset in offsets[index:end]:
+                region[offset - start:offset - start + length] = data
+            os.pwrite(fd, region, start)
+        index = end
+
+
+def journal_path(path: str) -> str:
+    """Get the path of the journal of a file.
+
+    The journal is a hidden file next to the file that links resolve
+    to, so that globs such as `*` don't match it.
+    """
+    directory, name = os.path.split(os.path.realpath(path))
+    return os.path.join(directory, f'.{name}{JOURNAL_SUFFIX}')
+
+
+def write_journal(path: str, old_version: str, new_version: str,
+                  offsets: List[int]):
+    """Write the journal of a patch, and flush it to the disk."""
+    journal = journal_path(path)
+    temp_path = f'{journal}.{os.getpid()}.tmp'
+    with open(temp_path, 'w') as file:
+        file.write(json.dumps({'old': old_version, 'new': new_version,
+                               'offsets': offsets}))
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(temp_path, journal)
+
+
+def read_journal(path: str) -> Optional[dict]:
+    try:
+        with open(journal_path(path), 'r') as file:
+            return json.load(file)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as e:
+        log.error(f'Could not read the journal of <{path}>, {e}')
+        return None
+
+
+def recover_journal(path: str) -> bool:
+    """Finish a patch of a file that was interrupted.
+
+    The patch is only finished if every position in the journal has
+    either the old or the new version, otherwise the file has changed
+    since and the journal is left for the user to look at.
+
+    :param path: The path of the file.
+    :return: Whether a patch was finished.
+    """
+    journal = read_journal(path)
+    if journal is None:
+        return False
+    old, new = journal['old'].encode(), journal['new'].encode()
+    try:
+        with open(path, 'r+b') as file:
+            fd = file.fileno()
+            for offset in journal['offsets']:
+                if os.pread(fd, len(old), offset) not in (old, new):
+                    log.error(f'Could not finish the interrupted update of '
+                              f'<{path}>, it has changed since. Check the '
+                              f'file and remove <{journal_path(path)}>')
+                    return False
+            write_patches(fd, journal['offsets'], new)
+            os.fsync(fd)
+        os.remove(journal_path(path))
+    except OSError as e:
+        log.error(f'Error {e.errno} recovering <{path}>, {e.strerror}')
+        return False
+    log.warning(f'Finished an interrupted update of <{path}> from '
+                f'{journal["old"]} to {journal["new"]}')
+    return True
+
+
+def update_file(path: str, patterns: List[str], old_version: str,
+                new_version: str) -> bool:
+    """Update the version in a file, errors are logged.
+
+    The file is written in place, so links to it stay linked.
+
+    :return: Whether the file was written.
+    """
+    try:
+        log.info(f'Updating <{path}>')
+        with span('update file', path=path) as file_span:
+            with open(path, 'r') as file:
+                data = file.read()
+            file_span.count('bytes', len(data))
+            with open(path, 'w') as file:
+                file.write(update_data(data, patterns, old_version,
+                                       new_version))
+        return True
+    except FileNotFoundError:
+        log.error(f'Path does not exist <{path}>')
+    except OSError as e:
+        log.error(f'Error {e.errno} updating <{path}>, {e.strerror}')
+    return False
+
+
+def update_data(data: str, patterns: List[str], old_version: str,
+                new_version: str) -> str:
+    """Change the old version to the new version where it matches any
+    of the patterns.
+
+    The matches of every pattern are found in the original data before
+    anything is replaced.
+    """
+    update_pairs: List[UpdatePair] = []
+    updated_data = data
+
+    patterns = tuple(dict.fromkeys(patterns))
+    for pattern in compiled_patterns(patterns, old_version):
+        log.debug(f'Searching for pattern <{pattern.pattern}>')
+        # Each distinct match only needs replacing once, since the replace
+        # changes every occurrence of it.
+        for match in dict.fromkeys(pattern.findall(data)):
+            original = match
+            updated = match.replace(old_version, new_version)
+            log.debug(f'Changing <{original}> to <{updated}>')
+            update_pairs.append(UpdatePair(original, updated))
+
+    for pair in dict.fromkeys(update_pairs):
+        updated_data = updated_data.replace(pair.original, pair.updated)
+
+    return updated_data
+
+
+@functools.lru_cache(maxsize=256)
+def compiled_patterns(patterns: Tuple[str, ...],
+                      version: str) -> List[re.Pattern]:
+    """Get the regexes of patterns rendered with a version.
+
+    Rendering and compiling is only done once for each set of patterns
+    and version, so running many updates or checks in one process (e.g.
+    with `--batch`) does not pay for it again.
+    """
+    compiled = []
+    regex_valid_version = re.escape(version)
+    with span('render patterns', patterns=len(patterns)):
+        for pattern in patterns:
             log.debug(f'Rendering pattern <{pattern}>')
-            template = Template(pattern)
-            regex_valid_version = f'{re.escape(version)}'
-            rendered = template.render(version=regex_valid_version)
+            rendered = template(pattern).render(version=regex_valid_version)
             log.debug(f'Rendered as <{rendered}>')
-            rendered_patterns.append(rendered)
+            compiled.append(re.compile(rendered))
+    return compiled
 
-        return rendered_patterns
 
-    def __eq__(self, other):
-        return (self.path == other.path) and (self.patterns == self.patterns)
+@functools.lru_cache(maxsize=256)
+def compiled_byte_patterns(patterns: Tuple[str, ...],
+                           version: str) -> List[re.Pattern]:
+    """Get the regexes of patterns rendered with a version, as bytes."""
+    return [re.compile(pattern.pattern.encode())
+            for pattern in compiled_patterns(patterns, version)]
+
+
+@functools.lru_cache(maxsize=256)
+def template(pattern: str):
+    """Get the compiled jinja template of a pattern."""
+    # Imported here since jinja is slow to import, and commands that never
+    # touch the files (e.g. `--current`) should not pay for it.
+    with span('import jinja'):
+        from jinja2 import Template
+    return Template(pattern)
 
 
-@dataclass
-class UpdatePair:
+class UpdatePair(NamedTuple):
     original: str
     updated: str
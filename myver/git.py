@@ -0,0 +1,346 @@
+import hashlib
+import json
+import os
+import subprocess
+from bisect import bisect_left
+from logging import getLogger
+from operator import itemgetter
+from typing import List, Optional, Tuple, Iterator
+
+from myver.cache import read_cache, write_cache
+from myver.error import GitError
+from myver.parser import VersionParser
+from myver.part import Part, IdentifierPart
+from myver.snapshot import VersionSnapshot
+from myver.trace import span
+
+log = getLogger(__name__)
+
+CACHE_DIR = 'myver'
+TAGS_CACHE = 'tags.json'
+# Bumped whenever the layout of the cache files changes.
+CACHE_VERSION = 1
+
+
+def run_git(args: List[str], cwd: str = None, input: str = None) -> str:
+    """Run a git command and get its output.
+
+    :param args: The args to pass to git.
+    :param cwd: The directory to run git in.
+    :param input: Text to write to the stdin of git.
+    :raise GitError: If git is not installed or the command fails.
+    """
+    log.debug(f'Running git {" ".join(args)}')
+    try:
+        process = subprocess.run(
+            ['git', *args], cwd=cwd, input=input, capture_output=True,
+            text=True)
+    except FileNotFoundError:
+        raise GitError('Git must be installed to use git features')
+    if process.returncode != 0:
+        raise GitError(
+            f'Command `git {" ".join(args)}` failed, '
+            f'{process.stderr.strip()}')
+    return process.stdout
+
+
+def git_dir(cwd: str = None) -> str:
+    """Get the path of the git directory that holds the refs.
+
+    :param cwd: A directory within the repository.
+    :raise GitError: If the directory is not in a git repository.
+    """
+    path = run_git(['rev-parse', '--git-common-dir'], cwd).strip()
+    return os.path.join(cwd or '.', path)
+
+
+def head_commit(cwd: str = None) -> Optional[str]:
+    """Get the commit that HEAD points to.
+
+    :param cwd: A directory within the repository.
+    :return: The commit hash, or None if there are no commits yet.
+    """
+    try:
+        return run_git(['rev-parse', '--verify', '-q', 'HEAD'], cwd).strip()
+    except GitError:
+        return None
+
+
+def commit_files(paths: List[str], message: str, cwd: str = None) -> str:
+    """Stage files and commit them onto HEAD.
+
+    This is built from plumbing commands so that only the given files
+    are looked at. `git add` and `git commit` refresh and check the whole
+    work tree, which is slow in huge repositories, while here the files
+    are staged with a single `git update-index`, and the commit is built
+    from the index with `write-tree` and `commit-tree`. As with `git
+    commit`, anything else that is already staged is committed too.
+    Hooks are not run.
+
+    :param paths: The paths of the files to commit, absolute or relative
+        to `cwd`.
+    :param message: The commit message.
+    :param cwd: A directory within the repository.
+    :raise GitError: If any of the git commands fail.
+    :return: The hash of the new commit.
+    """
+    with span('git commit', files=len(paths)):
+        run_git(['update-index', '--add', '-z', '--stdin'], cwd,
+                input=''.join(f'{path}\0' for path in paths))
+        tree = run_git(['write-tree'], cwd).strip()
+        parent = head_commit(cwd)
+        args = ['commit-tree', tree, '-m', message]
+        if parent:
+            args.extend(['-p', parent])
+        commit = run_git(args, cwd).strip()
+        # Passing the old value makes the update fail if HEAD moved since
+        # it was read, an empty value means it must not exist yet.
+        subject = message.splitlines()[0] if message else ''
+        run_git(['update-ref', '-m', f'commit: {subject}', 'HEAD', commit,
+                 parent or ''], cwd)
+    log.info(f'Committed {len(paths)} files as {commit}')
+    return commit
+
+
+def create_tag(name: str, message: str, commit: str = 'HEAD',
+               cwd: str = None):
+    """Create an annotated tag.
+
+    :param name: The name of the tag.
+    :param message: The message of the tag.
+    :param commit: The commit to tag.
+    :param cwd: A directory within the repository.
+    :raise GitError: If the tag already exists or could not be created.
+    """
+    with span('git tag'):
+        run_git(['tag', '-a', name, '-m', message, commit], cwd)
+    log.info(f'Tagged {commit} as {name}')
+
+
+def stream_git(args: List[str], cwd: str = None) -> Iterator[str]:
+    """Run a git command and stream the lines of its output.
+
+    The output is never held in memory as one string. If the caller
+    stops reading early, git is stopped rather than left to write the
+    rest of its output.
+
+    :param args: The args to pass to git.
+    :param cwd: The directory to run git in.
+    :raise GitError: If git is not installed or the command fails.
+    """
+    log.debug(f'Running git {" ".join(args)}')
+    try:
+        process = subprocess.Popen(
+            ['git', *args], cwd=cwd, text=True,
+            stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    except FileNotFoundError:
+        raise GitError('Git must be installed to use git features')
+
+    with process:
+        try:
+            for line in process.stdout:
+                yield line.rstrip('\n')
+        except GeneratorExit:
+            process.kill()
+            raise
+        stderr = process.stderr.read()
+
+    if process.returncode != 0:
+        raise GitError(
+            f'Command `git {" ".join(args)}` failed, {stderr.strip()}')
+
+
+def iter_tags(cwd: str = None) -> Iterator[str]:
+    """Stream the names of every tag in the repository.
+
+    The tags come from a single `git for-each-ref` call, and its output
+    is read as a stream so that repositories with a huge number of tags
+    are never held in memory as one string.
+
+    :param cwd: A directory within the repository.
+    :raise GitError: If the tags could not be listed.
+    """
+    yield from stream_git(
+        ['for-each-ref', '--format=%(refname:strip=2)', 'refs/tags'], cwd)
+
+
+def iter_commits(revisions: List[str], cwd: str = None) \
+        -> Iterator[Tuple[str, str]]:
+    """Stream the commits of a `git log`, newest first.
+
+    :param revisions: The revisions to pass to `git log`, e.g.
+        `['HEAD', '^v1.0.0']`.
+    :param cwd: A directory within the repository.
+    :raise GitError: If the commits could not be listed.
+    :return: Pairs of the commit hash and its full message.
+    """
+    # Each commit starts with a record separator, which can't be in the
+    # message, followed by the hash on its own line.
+    lines = stream_git(
+        ['log', '--format=%x1e%H%n%B', *revisions, '--'], cwd)
+    commit, message = None, []
+    for line in lines:
+        if line.startswith('\x1e'):
+            if commit is not None:
+                yield commit, '\n'.join(message).strip()
+            commit, message = line[1:], []
+        else:
+            message.append(line)
+    if commit is not None:
+        yield commit, '\n'.join(message).strip()
+
+
+def resolve_commits(revisions: List[str], cwd: str = None) -> List[str]:
+    """Get the commit hashes of revisions in a single git call.
+
+    :param revisions: The revisions, e.g. `['HEAD', 'v1.0.0']`.
+    :param cwd: A directory within the repository.
+    :raise GitError: If any revision is not a commit.
+    """
+    if not revisions:
+        return []
+    output = run_git(
+        ['rev-parse', *[f'{revision}^{{commit}}' for revision in revisions]],
+        cwd)
+    return output.split()
+
+
+def is_ancestor(commit: str, descendant: str, cwd: str = None) -> bool:
+    """Check if a commit is an ancestor of (or the same as) another."""
+    try:
+        run_git(['merge-base', '--is-ancestor', commit, descendant], cwd)
+    except GitError:
+        return False
+    return True
+
+
+def refs_state(path: str) -> List:
+    """Get a fingerprint of the tag refs in a git directory.
+
+    Creating, moving or deleting a tag either rewrites `packed-refs` or
+    changes the entries of a directory under `refs/tags`, so the stat
+    details of these are enough to know if the tags have changed.
+
+    :param path: The path of the git directory.
+    """
+    state = []
+    packed_refs = os.path.join(path, 'packed-refs')
+    if os.path.exists(packed_refs):
+        stat = os.stat(packed_refs)
+        state.append(['packed-refs', stat.st_mtime_ns, stat.st_size,
+                      stat.st_ino])
+
+    for directory, _, _ in os.walk(os.path.join(path, 'refs', 'tags')):
+        stat = os.stat(directory)
+        state.append([os.path.relpath(directory, path), stat.st_mtime_ns,
+                      stat.st_ino])
+    return state
+
+
+def version_tags(parser: VersionParser, tag_prefix: str = '',
+                 cwd: str = None) -> List[Tuple[str, VersionSnapshot]]:
+    """Get every tag in the repository that is a version.
+
+    :param parser: The parser for the configured parts.
+    :param tag_prefix: A prefix that version tags start with (e.g. `v`),
+        tags that do not start with it are skipped.
+    :param cwd: A directory within the repository.
+    :raise GitError: If the tags could not be listed.
+    :return: Pairs of the tag name and its parsed version, ordered from
+        the lowest version to the highest.
+    """
+    snapshot = parser.schema.snapshot
+    return [(tag, snapshot(values))
+            for tag, values, _ in sorted_version_tags(parser, tag_prefix, cwd)]
+
+
+def latest_tag(parser: VersionParser,
+               lower: VersionSnapshot = None,
+               upper: VersionSnapshot = None,
+               tag_prefix: str = '',
+               cwd: str = None) -> Optional[Tuple[str, VersionSnapshot]]:
+    """Get the tag with the highest version.
+
+    :param parser: The parser for the configured parts.
+    :param lower: Only consider versions at or above this version.
+    :param upper: Only consider versions below this version.
+    :param tag_prefix: A prefix that version tags start with.
+    :param cwd: A directory within the repository.
+    :raise GitError: If the tags could not be listed.
+    :return: The tag name and its version, or None if there are no
+        version tags within the range.
+    """
+    tags = sorted_version_tags(parser, tag_prefix, cwd)
+    keys = [list(key) for _, _, key in tags]
+    end = len(keys)
+    if upper is not None:
+        end = bisect_left(keys, list(upper.sort_key))
+    if end == 0:
+        return None
+
+    tag, values, key = tags[end - 1]
+    if lower is not None and keys[end - 1] < list(lower.sort_key):
+        return None
+    return tag, parser.schema.snapshot(values)
+
+
+def sorted_version_tags(parser: VersionParser, tag_prefix: str = '',
+                        cwd: str = None) -> List[Tuple[str, tuple, tuple]]:
+    """Get the tags that are versions, ordered by their version.
+
+    The result is cached in the git directory, keyed by the state of the
+    tag refs and the part layout. As long as no tags have changed, the
+    tags are read from the cache without running git again.
+
+    :return: The tag name, the part values and the sort key of each tag,
+        the values and keys may be Lists or tuples.
+    """
+    path = git_dir(cwd)
+    cache_path = os.path.join(path, CACHE_DIR, TAGS_CACHE)
+    key = [CACHE_VERSION, refs_state(path), layout_hash(parser), tag_prefix]
+
+    cached = read_cache(cache_path)
+    if cached is not None and cached.get('key') == key:
+        log.debug(f'Using cached tags from {cache_path}')
+        # Entries are left as the lists that JSON gives, lists compare
+        # the same way as the tuples they were written from.
+        return cached['tags']
+
+    tags = []
+    prefix_length = len(tag_prefix)
+    parse_values = parser.parse_values
+    sort_key = parser.schema.sort_key
+    for tag in iter_tags(cwd):
+        if not tag.startswith(tag_prefix):
+            continue
+        values = parse_values(tag[prefix_length:])
+        if values is not None:
+            tags.append((tag, values, sort_key(values)))
+    tags.sort(key=itemgetter(2))
+    log.info(f'Found {len(tags)} version tags')
+
+    write_cache(cache_path, {'key': key, 'tags': tags})
+    return tags
+
+
+def layout_hash(parser: VersionParser) -> str:
+    """Get a hash of the part layout that a parser was compiled from.
+
+    This covers everything that parsing and sorting a version depend on,
+    the regex alone does not, e.g. it does not keep the order of the
+    identifier strings.
+    """
+    layout = json.dumps([parser.regex,
+                         [part_layout(part) for part in parser.schema.parts]])
+    return hashlib.sha1(layout.encode()).hexdigest()
+
+
+def part_layout(part: Part) -> list:
+    """Get the configuration of a part that its values depend on."""
+    layout = [type(part).__name__, part.key, part.prefix, part.requires,
+              part.start]
+    if isinstance(part, IdentifierPart):
+        layout.append(list(part.strings))
+    else:
+        layout.extend([part.label, part.label_suffix, part.show_start])
+    return layout
@@ -0,0 +1,85 @@
+import os
+import random
+import threading
+import time
+from contextlib import contextmanager
+from logging import getLogger
+
+from myver.error import LockError
+from myver.trace import span
+
+try:
+    import fcntl
+except ImportError:
+    # Not available on Windows, where files are not locked.
+    fcntl = None
+
+log = getLogger(__name__)
+
+# How many times to try taking a lock, and the delays between tries,
+# which double from the first delay up to the max. This waits for about
+# ten seconds in total before failing.
+LOCK_ATTEMPTS = 100
+LOCK_DELAY = 0.001
+LOCK_MAX_DELAY = 0.1
+
+# The paths that each thread holds a lock on.
+_held = threading.local()
+
+
+@contextmanager
+def lock_file(path: str, shared: bool = False,
+              attempts: int = LOCK_ATTEMPTS):
+    """Hold an advisory lock on a file.
+
+    The lock is taken with `flock`, so it is only respected by other
+    processes that lock the file the same way. It is tried without
+    blocking, and while another process holds it, tried again after a
+    delay. The delays are jittered, so that processes waiting on the
+    same lock don't all try again at once. The tries are bounded, so
+    that a process that hangs while holding the lock makes the others
+    fail rather than wait forever.
+
+    A file that the thread holds a lock on already is not locked again,
+    so a config can be read while it is locked for a change.
+
+    :param path: The path of the file to lock.
+    :param shared: Take a shared lock for reading, rather than an
+        exclusive lock for writing.
+    :param attempts: How many times to try taking the lock.
+    :raise LockError: If the lock could not be taken.
+    :raise OSError: If the file could not be opened.
+    """
+    key = os.path.abspath(path)
+    if not hasattr(_held, 'paths'):
+        _held.paths = set()
+    if fcntl is None or key in _held.paths:
+        yield
+        return
+
+    operation = (fcntl.LOCK_SH if shared else fcntl.LOCK_EX) | fcntl.LOCK_NB
+    fd = os.open(path, os.O_RDONLY | os.O_CLOEXEC)
+    try:
+        with span('lock file', path=path) as lock_span:
+            delay = LOCK_DELAY
+            for attempt in range(1, attempts + 1):
+                try:
+                    fcntl.flock(fd, operation)
+                    break
+                except BlockingIOError:
+                    if attempt == attempts:
+                        raise LockError(f'Could not lock {path}, another '
+                                        f'process is holding the lock')
+                    time.sleep(delay * random.uniform(0.5, 1.5))
+                    delay = min(delay * 2, LOCK_MAX_DELAY)
+            lock_span.count('attempts', attempt)
+        if attempt > 1:
+            log.debug(f'Locked {path} after {attempt} attempts')
+        _held.paths.add(key)
+        try:
+            yield
+        finally:
+            _held.paths.discard(key)
+    finally:
+        # Closing the file releases the lock.
+        os.close(fd)
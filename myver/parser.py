@@ -0,0 +1,156 @@
+from __future__ import annotations
+
+import re
+from logging import getLogger
+from typing import List, Optional, Tuple, Iterable
+
+from myver.error import ParseError
+from myver.part import Part, IdentifierPart, NumberPart
+from myver.snapshot import VersionSchema, VersionSnapshot, Value
+from myver.version import Version
+
+log = getLogger(__name__)
+
+NUMBER_REGEX = '0|[1-9][0-9]*'
+
+
+class VersionParser:
+    """Parses version strings back into part values.
+
+    The parser is compiled once from the configuration of the parts into
+    a single regex, each part is an optional group made of its prefix,
+    then either its identifier strings or its label and number. Only
+    strings that the version could render are accepted, so for any
+    string that is parsed `str(parser.parse(string)) == string`.
+
+    :param schema: The configuration of the parts to parse.
+    """
+
+    def __init__(self, schema: VersionSchema):
+        self.schema: VersionSchema = schema
+        self.regex: str = ''.join(
+            part_regex(part, index) for index, part in enumerate(schema.parts))
+        log.debug(f'Compiled version regex <{self.regex}>')
+        self.pattern: re.Pattern = re.compile(self.regex)
+        # For each part, whether it is a number part, its start value, and
+        # whether the start value is hidden when the part is rendered.
+        self._numbers: List[Tuple[bool, Value, bool]] = [
+            (isinstance(part, NumberPart), part.start,
+             isinstance(part, NumberPart) and not part.show_start)
+            for part in schema.parts
+        ]
+        # Pairs of part indexes where the first part requires the second.
+        self._requires: List[Tuple[int, int]] = [
+            (index, schema.index(part.requires))
+            for index, part in enumerate(schema.parts)
+            if part.requires
+        ]
+
+    @classmethod
+    def from_version(cls, version: Version) -> VersionParser:
+        """Compile a parser for the configuration of a version."""
+        return cls(VersionSchema(version.parts))
+
+    def parse(self, string: str) -> VersionSnapshot:
+        """Parse a version string.
+
+        :param string: The version string.
+        :raise ParseError: If the string is not a valid version.
+        """
+        values = self.parse_values(string)
+        if values is None:
+            raise ParseError(
+                f'`{string}` is not a valid version for the configured parts')
+        return VersionSnapshot(self.schema, values)
+
+    def match(self, string: str) -> Optional[VersionSnapshot]:
+        """Parse a version string, or get None if it is not valid."""
+        values = self.parse_values(string)
+        if values is None:
+            return None
+        return VersionSnapshot(self.schema, values)
+
+    def parse_values(self, string: str,
+                     partial: bool = False) -> Optional[Tuple[Value, ...]]:
+        """Parse a version string into its part values.
+
+        :param string: The version string.
+        :param partial: Allow a version that is cut short, i.e. required
+            parts may be missing (e.g. `1.4` for semver).
+        :return: The value of each part in the order of the parts, or
+            None if the string is not a valid version.
+        """
+        match = self.pattern.fullmatch(string)
+        if match is None:
+            return None
+        groups = match.groups()
+        values = []
+        append = values.append
+        for index, (is_number, start, hide_start) in enumerate(self._numbers):
+            value = groups[2 * index + 1]
+            if is_number:
+                if value is not None:
+                    value = int(value)
+                    if hide_start and value == start:
+                        # The part would never be rendered like this.
+                        return None
+                elif groups[2 * index] is not None:
+                    value = start
+            append(value)
+
+        values = tuple(values)
+        if not partial and not self._valid(values):
+            return None
+        return values
+
+    def parse_many(self, strings: Iterable[str]) \
+            -> List[Optional[VersionSnapshot]]:
+        """Parse many version strings at once.
+
+        :param strings: The version strings.
+        :return: A snapshot for each string, or None where a string is
+            not a valid version.
+        """
+        schema = self.schema
+        parse_values = self.parse_values
+        snapshots = []
+        append = snapshots.append
+        for string in strings:
+            values = parse_values(string)
+            append(None if values is None else VersionSnapshot(schema, values))
+        return snapshots
+
+    def _valid(self, values: Tuple[Value, ...]) -> bool:
+        """Checks that the parsed values follow the `requires` rules."""
+        if values and values[0] is None:
+            return False
+        for index, required in self._requires:
+            if values[index] is not None and values[required] is None:
+                return False
+        return True
+
+
+def part_regex(part: Part, index: int) -> str:
+    """Get the regex for a part.
+
+    Each part has 2 groups. The first group matches the whole part, and
+    the second group matches the value of the part.
+
+    :param part: The part to get the regex for.
+    :param index: The position of the part, used to name the groups.
+    """
+    prefix = re.escape(part.prefix)
+    if isinstance(part, IdentifierPart):
+        # Longest strings first so that a string is never cut short by
+        # another string that it starts with.
+        strings = sorted(dict.fromkeys(part.strings), key=len, reverse=True)
+        value = '|'.join(re.escape(string) for string in strings)
+        return f'(?P<p{index}>{prefix}(?P<v{index}>{value}))?'
+
+    part: NumberPart
+    label = re.escape(part.label)
+    suffix = re.escape(part.label_suffix)
+    number = f'(?P<v{index}>{NUMBER_REGEX})'
+    if part.show_start:
+        return f'(?P<p{index}>{prefix}{label}{suffix}{number})?'
+    return f'(?P<p{index}>{prefix}{label}(?:{suffix}{number})?)?'
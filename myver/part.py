@@ -1,8 +1,10 @@
 from __future__ import annotations
 
 import abc
+import copy
+import functools
 from logging import getLogger
-from typing import Optional, Union, List
+from typing import Optional, Union, List, Dict, Tuple
 
 from myver.error import ConfigError, BumpError
 
@@ -19,6 +21,10 @@ class Part(abc.ABC):
         that the required part will need to be set if this part is set.
     """
 
+    # Parts are held in bulk when many versions are loaded at once, so
+    # they use slots instead of a per-instance `__dict__`.
+    __slots__ = ('prefix', 'key', 'value', 'requires', '_child', '_parent')
+
     def __init__(self,
                  key: str,
                  value: Optional[Union[str, int]],
@@ -35,12 +41,23 @@ class Part(abc.ABC):
         self.child = child
         self.parent = parent
 
-    @abc.abstractmethod
     def next_value(self, value_override: str = None):
         """Set current value to the next part value.
 
         :param value_override: Manual override for the bumped value.
         """
+        self.value = self.successor(self.value, value_override)
+
+    @abc.abstractmethod
+    def successor(self,
+                  value: Optional[Union[str, int]],
+                  value_override: str = None) -> Optional[Union[str, int]]:
+        """Get the value that comes after `value`, without changing the part.
+
+        :param value: The value to get the successor of.
+        :param value_override: Manual override for the bumped value.
+        :raise BumpError: If the value override is invalid.
+        """
 
     @property
     @abc.abstractmethod
@@ -72,6 +89,17 @@ class Part(abc.ABC):
         if self._parent and not self._parent.child:
             self._parent.child = self
 
+    def copy(self) -> Part:
+        """Get a copy of this part without its parent or child.
+
+        The copy has its own value, while the configuration of the part
+        (e.g. the identifier strings) is shared with this part.
+        """
+        clone = copy.copy(self)
+        clone._child = None
+        clone._parent = None
+        return clone
+
     def is_set(self) -> bool:
         """Checks if the part's value is not None."""
         return self.value is not None
@@ -138,8 +166,20 @@ class Part(abc.ABC):
         log.debug(f'Part <{key}> is not required')
         return False
 
+    def render(self, value: Union[str, int]) -> str:
+        """Get the string form of a (non-null) value of this part."""
+        return f'{self.prefix}{value}'
+
+    @abc.abstractmethod
+    def sort_value(self, value: Optional[Union[str, int]]) -> int:
+        """Get an integer that orders the values of this part.
+
+        :param value: The value to get the sort value of, can be None.
+        :raise ValueError: If the value is not valid for this part.
+        """
+
     def __str__(self):
-        return f'{self.prefix}{self.value}'
+        return self.render(self.value)
 
     def __eq__(self, other: Part) -> bool:
         return (self.key == other.key) and (self.value == other.value)
@@ -156,6 +196,8 @@ class IdentifierPart(Part):
         `self.strings` List.
     """
 
+    __slots__ = ('_strings', '_indexes', '_successors', '_start')
+
     def __init__(self,
                  key: str,
                  value: Optional[str],
@@ -167,6 +209,8 @@ class IdentifierPart(Part):
                  start: str = None):
         super().__init__(key, value, requires, prefix, child, parent)
         self._strings: List[str] = strings
+        self._indexes: Dict[str, int] = {}
+        self._successors: Dict[str, Optional[str]] = {}
         self._start: Optional[str] = start
         self.strings = strings
         self.start = start
@@ -179,6 +223,7 @@ class IdentifierPart(Part):
     def strings(self, new_strings: List[str]):
         self._validate_strings(new_strings)
         self._strings: List[str] = new_strings
+        self._index_strings()
 
     @property
     def start(self) -> str:
@@ -189,27 +234,61 @@ class IdentifierPart(Part):
         self._validate_start(new_start)
         self._start = new_start
 
-    def next_value(self, value_override: str = None):
+    def index(self, value: str) -> int:
+        """Get the position of an identifier string in `self.strings`.
+
+        :param value: The identifier string.
+        :raise ValueError: If the value is not in `self.strings`.
+        """
+        try:
+            return self._indexes[value]
+        except KeyError:
+            raise ValueError(
+                f'`{value}` is not in the strings List of part `{self.key}`')
+
+    def sort_value(self, value: Optional[str]) -> int:
+        """Identifiers order by their position in `self.strings`.
+
+        A null identifier sorts after every string, since it usually
+        marks a release, and a pre-release (e.g. `alpha`) must sort
+        before the release.
+        """
+        if value is None:
+            return len(self._strings)
+        return self.index(value)
+
+    def successor(self,
+                  value: Optional[str],
+                  value_override: str = None) -> Optional[str]:
         if value_override is not None:
-            if value_override not in self.strings:
+            if value_override not in self._indexes:
                 raise BumpError(
                     f'Cannot set value override `{value_override}`, it must '
                     f'be in the strings List of part `{self.key}`')
             else:
-                self.value = value_override
-        elif self.is_set():
-            current_index = self.strings.index(self.value)
-            next_index = current_index + 1
-
-            if next_index < len(self.strings):
-                self.value = self.strings[next_index]
-            else:
-                self.value = None
+                return value_override
+        elif value is not None:
+            try:
+                return self._successors[value]
+            except KeyError:
+                raise ValueError(
+                    f'`{value}` is not in the strings List of part '
+                    f'`{self.key}`')
         else:
-            self.value = self.start
+            return self.start
+
+    def _index_strings(self):
+        """Precompute the lookup tables for `self.strings`.
+
+        The index map and successor table make bumping, validation and
+        ordering of identifier values constant time, regardless of how
+        long the strings List is. Parts configured with the same strings
+        share the same tables.
+        """
+        self._indexes, self._successors = string_tables(tuple(self._strings))
 
     def _validate_start(self, start: Optional[str]):
-        if start is not None and start not in self.strings:
+        if start is not None and start not in self._indexes:
             raise ConfigError(
                 f'Part `{self.key}` has an `identifier.start` value that is '
                 f'not in the `identifier.strings` List')
@@ -221,6 +300,30 @@ class IdentifierPart(Part):
                 f'List, the List must have at least one string')
 
 
+@functools.lru_cache(maxsize=128)
+def string_tables(strings: Tuple[str, ...]) \
+        -> Tuple[Dict[str, int], Dict[str, Optional[str]]]:
+    """Build the index map and successor table for identifier strings.
+
+    Duplicate strings keep the position of their first occurrence, the
+    same as `List.index` would.
+
+    :param strings: The identifier strings in their chronological order.
+    :return: A map of each string to its index, and a map of each string
+        to the string after it (or None for the last string).
+    """
+    indexes: Dict[str, int] = {}
+    for index, string in enumerate(strings):
+        indexes.setdefault(string, index)
+
+    last_index = len(strings) - 1
+    successors = {
+        string: strings[index + 1] if index < last_index else None
+        for string, index in indexes.items()
+    }
+    return indexes, successors
+
+
 class NumberPart(Part):
     """A number part.
 
@@ -233,6 +336,8 @@ class NumberPart(Part):
         the next value (after a bump) will be shown.
     """
 
+    __slots__ = ('label', 'label_suffix', 'show_start', '_start')
+
     def __init__(self,
                  key: str,
                  value: Optional[int],
@@ -263,7 +368,9 @@ class NumberPart(Part):
         self._validate_start(new_start)
         self._start = new_start
 
-    def next_value(self, value_override: str = None):
+    def successor(self,
+                  value: Optional[int],
+                  value_override: str = None) -> int:
         if value_override is not None:
             try:
                 int(value_override)
@@ -276,11 +383,11 @@ class NumberPart(Part):
                 raise BumpError(
                     f'Cannot set value override to a negative number '
                     f'`{value_override}` for part `{self.key}`')
-            self.value = int(value_override)
-        elif self.is_set():
-            self.value = self.value + 1
+            return int(value_override)
+        elif value is not None:
+            return value + 1
         else:
-            self.value = self.start
+            return self.start
 
     def _validate_start(self, start: Optional[int]):
         if start is not None:
@@ -296,7 +403,17 @@ class NumberPart(Part):
                 f'Part `{self.key}` has an negative value for its '
                 f'`number.start` attribute, it must be positive')
 
-    def __str__(self):
-        if self.value == self.start and not self.show_start:
+    def sort_value(self, value: Optional[int]) -> int:
+        """Numbers order by their value, a null number sorts first.
+
+        A null number sorts before any number, so that the added part in
+        a version like `1.0.0+build.1` sorts after `1.0.0`.
+        """
+        if value is None:
+            return -1
+        return value
+
+    def render(self, value: int) -> str:
+        if value == self.start and not self.show_start:
             return f'{self.prefix}{self.label}'
-        return f'{self.prefix}{self.label}{self.label_suffix}{self.value}'
+        return f'{self.prefix}{self.label}{self.label_suffix}{value}'
@@ -0,0 +1,93 @@
+import json
+import os
+import signal
+import socket
+import socketserver
+import sys
+from logging import getLogger
+
+from myver.error import MyverError
+from myver.service import VersionService
+
+log = getLogger(__name__)
+
+
+class VersionServer(socketserver.ThreadingMixIn,
+                    socketserver.UnixStreamServer):
+    """Serves version requests for a config over a Unix socket.
+
+    Each request is a JSON object on a single line, and each response is
+    a JSON object on a single line, see `VersionService` for the
+    requests. Many requests can be sent over one connection, and each
+    connection is handled in its own thread.
+
+    :param socket_path: The path to create the socket at.
+    :param config_path: The path of the config file.
+    :raise MyverError: If a server is already listening on the socket.
+    :raise ConfigError: If the config is invalid.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, socket_path: str, config_path: str):
+        self.service: VersionService = VersionService(config_path)
+        remove_stale_socket(socket_path)
+        super().__init__(socket_path, RequestHandler)
+
+    def handle_request_line(self, line: bytes) -> dict:
+        """Handle a single request, errors are returned as a response."""
+        try:
+            request = json.loads(line)
+        except ValueError as e:
+            return {'ok': False, 'error': f'Invalid request, {e}'}
+        if not isinstance(request, dict):
+            return {'ok': False, 'error': 'Invalid request, not an object'}
+        return self.service.handle(request)
+
+    def server_close(self):
+        super().server_close()
+        try:
+            os.unlink(self.server_address)
+        except OSError:
+            pass
+
+
+class RequestHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        for line in self.rfile:
+            response = self.server.handle_request_line(line)
+            self.wfile.write(json.dumps(response).encode() + b'\n')
+            self.wfile.flush()
+
+
+def serve(config_path: str, socket_path: str):
+    """Serve version requests until the process is interrupted.
+
+    :param config_path: The path of the config file.
+    :param socket_path: The path to create the socket at.
+    :raise MyverError: If a server is already listening on the socket.
+    :raise ConfigError: If the config is invalid.
+    """
+    # Exits through the `with` block on a terminate signal, so that the
+    # socket is removed.
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+    with VersionServer(socket_path, config_path) as server:
+        log.info(f'Serving {config_path} on {socket_path}')
+        server.serve_forever()
+
+
+def remove_stale_socket(path: str):
+    """Remove a socket left behind by a server that is no longer running.
+
+    :raise MyverError: If a server is still listening on the socket.
+    """
+    if not os.path.exists(path):
+        return
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        try:
+            sock.connect(path)
+        except OSError:
+            log.debug(f'Removing stale socket {path}')
+            os.unlink(path)
+            return
+    raise MyverError(f'A myver server is already running on {path}')
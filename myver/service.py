@@ -0,0 +1,263 @@
+import os
+import threading
+from logging import getLogger
+from typing import Dict, Tuple, Callable, List, Optional
+
+from myver.check import FileCheck, check_files, format_check
+from myver.config import Config
+from myver.error import MyverError
+from myver.files import resolve_globs
+from myver.parser import VersionParser
+from myver.snapshot import VersionSchema, VersionSnapshot
+
+log = getLogger(__name__)
+
+
+class State:
+    """What a service knows about its config at one point in time.
+
+    A state is never changed once it is made, a new state replaces it
+    whenever the config is reloaded or the version is changed, so
+    requests that only read can use it without taking any lock.
+
+    :param config: The loaded config.
+    :param stat: The stat details of the config file, the files it
+        extends and its state database, when they were read.
+    """
+
+    __slots__ = ('config', 'stat', 'snapshot', 'parser')
+
+    def __init__(self, config: Config, stat: Tuple[int, ...]):
+        self.config: Config = config
+        self.stat: Tuple[int, ...] = stat
+        schema = VersionSchema(config.version.parts)
+        self.snapshot: VersionSnapshot = VersionSnapshot.from_version(
+            config.version, schema)
+        self.parser: VersionParser = VersionParser(schema)
+
+
+class VersionService:
+    """Runs version requests against a config that is kept loaded.
+
+    The config is loaded once, and reloaded when the stat details of the
+    config file, a file it extends, or its state database change, which
+    is checked on every request. Relative `files` globs are relative to
+    the directory of the config, wherever the service is run from. A
+    request is a dict with an `op` of:
+
+    - `current`, with the `keys` of the parts to get (see
+      `Version.parse`), responds with the `version`.
+    - `parse`, with a `version` string, responds with the `values` of
+      each part.
+    - `bump`, with the bump `args` (see `Version.bump`), responds with
+      the `old` and `new` version.
+    - `reset`, with the `keys` of the parts to reset, responds with the
+      `old` and `new` version.
+    - `check`, responds with the `version`, the paths of the configured
+      files that are `missing` it, and the `report` lines that
+      `myver check` prints for them (see `myver.check.check_files`).
+
+    In every response `ok` is false and `error` has the reason if the
+    request failed. An `id` in the request is given back in the
+    response. Requests that change the version are run one at a time,
+    while requests that only read can be run concurrently.
+
+    :param config_path: The path of the config file.
+    :raise ConfigError: If the config is invalid.
+    :raise OSError: If the config file could not be read.
+    """
+
+    def __init__(self, config_path: str):
+        self.config_path: str = config_path
+        self._lock = threading.Lock()
+        self._state: State = self._load()
+        self._ops: Dict[str, Callable[[dict], dict]] = {
+            'current': self._current,
+            'parse': self._parse,
+            'bump': self._bump,
+            'reset': self._reset,
+            'check': self._check,
+        }
+
+    def handle(self, request: dict) -> dict:
+        """Run a request, errors are returned as a response."""
+        try:
+            op = self._ops.get(request.get('op'))
+            if op is None:
+                raise MyverError(f'Unknown op `{request.get("op")}`')
+            response = op(request)
+            response['ok'] = True
+        except MyverError as e:
+            response = {'ok': False, 'error': e.message}
+        except KeyError as key_error:
+            response = {'ok': False,
+                        'error': f'Invalid part key `{key_error.args[0]}`'}
+        except OSError as e:
+            response = {'ok': False, 'error': f'{e.strerror} <{e.filename}>'}
+        except (ValueError, TypeError, AttributeError) as e:
+            response = {'ok': False, 'error': f'Invalid request, {e}'}
+        if 'id' in request:
+            response['id'] = request['id']
+        return response
+
+    @property
+    def snapshot(self) -> VersionSnapshot:
+        """The current version, the config is reloaded if it changed."""
+        return self._fresh_state().snapshot
+
+    def current(self, keys: List[str] = None) -> str:
+        """Get the current version, or parts of it, see `Version.parse`.
+
+        :raise KeyError: If an invalid part key is provided.
+        """
+        snapshot = self.snapshot
+        return snapshot.parse(keys) if keys else str(snapshot)
+
+    def parse(self, version: str) -> VersionSnapshot:
+        """Parse a version string with the configured parts.
+
+        :raise ParseError: If the string is not a valid version.
+        """
+        return self._fresh_state().parser.parse(version)
+
+    def check(self) -> List[FileCheck]:
+        """Check every configured file for the current version.
+
+        :return: The files that do not have it, see `check_files`.
+        """
+        return drifted_files(self._fresh_state())
+
+    def missing(self) -> List[str]:
+        """Get the configured files that do not have the current version."""
+        return [result.path for result in self.check()]
+
+    def bump(self, args: List[str]) \
+            -> Tuple[VersionSnapshot, VersionSnapshot]:
+        """Bump the version, then save the config and update the files.
+
+        :param args: The bump args, see `Version.bump`.
+        :raise BumpError: When the bumping fails.
+        :raise KeyError: If an arg references an invalid part key.
+        :return: The old and new version.
+        """
+        return self._update(lambda snapshot: snapshot.bump(args))
+
+    def reset(self, keys: List[str]) \
+            -> Tuple[VersionSnapshot, VersionSnapshot]:
+        """Reset parts, then save the config and update the files.
+
+        :param keys: The keys of the parts to reset.
+        :raise KeyError: If a key does not reference a valid part.
+        :return: The old and new version.
+        """
+        return self._update(lambda snapshot: snapshot.reset(keys))
+
+    def _current(self, request: dict) -> dict:
+        return {'version': self.current(request.get('keys'))}
+
+    def _parse(self, request: dict) -> dict:
+        snapshot = self.parse(request['version'])
+        return {'values': dict(zip(snapshot.schema.keys, snapshot.values))}
+
+    def _check(self, request: dict) -> dict:
+        state = self._fresh_state()
+        version = str(state.snapshot)
+        drifted = drifted_files(state)
+        return {'version': version,
+                'missing': [result.path for result in drifted],
+                'report': [line for result in drifted
+                           for line in format_check(result, version)]}
+
+    def _bump(self, request: dict) -> dict:
+        old, new = self.bump(request['args'])
+        return {'old': str(old), 'new': str(new)}
+
+    def _reset(self, request: dict) -> dict:
+        old, new = self.reset(request['keys'])
+        return {'old': str(old), 'new': str(new)}
+
+    def _update(self, func: Callable[[VersionSnapshot], VersionSnapshot]) \
+            -> Tuple[VersionSnapshot, VersionSnapshot]:
+        with self._lock:
+            state = self._fresh_state(locked=True)
+            config = state.config
+            # The config is locked against other processes too, which
+            # may have changed the version since the stat was checked.
+            with config.lock():
+                old = state.snapshot
+                if config.version != old.to_version():
+                    old = VersionSnapshot.from_version(
+                        config.version, old.schema)
+                # The new version is worked out before anything is
+                # changed, so a failed bump leaves the config as it was.
+                new = func(old)
+                config.version = new.to_version()
+                config.save()
+                config.update_files(str(old), str(new))
+            self._state = State(config, self._stat(config))
+        return old, new
+
+    def _fresh_state(self, locked: bool = False) -> State:
+        """Get the state, reloading the config first if it has changed."""
+        state = self._state
+        if self._stat(state.config) == state.stat:
+            return state
+        if locked:
+            self._state = self._load()
+            return self._state
+        with self._lock:
+            return self._fresh_state(locked=True)
+
+    def _load(self) -> State:
+        stat = config_stat(self.config_path)
+        log.info(f'Loading config {self.config_path}')
+        config = Config(self.config_path)
+        config.files = resolve_globs(
+            config.files, os.path.dirname(os.path.abspath(self.config_path)))
+        # The files it extends and its database are only known once it
+        # is loaded.
+        return State(config, stat + config_stat(*config.includes)
+                     + state_stat(config.state))
+
+    def _stat(self, config: Config) -> Tuple[int, ...]:
+        return (config_stat(self.config_path, *config.includes)
+                + state_stat(config.state))
+
+
+def is_ok(response: dict) -> bool:
+    """Checks if a response succeeded, a check with missing files fails."""
+    return response['ok'] and not response.get('missing')
+
+
+def drifted_files(state: State) -> List[FileCheck]:
+    """Get the configured files without the version of a state."""
+    return [result for result in check_files(state.config)
+            if not result.ok]
+
+
+def config_stat(*paths: str) -> Tuple[int, ...]:
+    """Get the stat details that change when config files are written."""
+    details = ()
+    for path in paths:
+        stat = os.stat(path)
+        details += (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+    return details
+
+
+def state_stat(path: Optional[str]) -> Tuple[int, ...]:
+    """Get the stat details that change when a state database is written.
+
+    Each transaction is written to the `-wal` file of the database, which
+    does not exist until the first write.
+    """
+    if path is None:
+        return ()
+    details = ()
+    for file_path in [path, f'{path}-wal']:
+        try:
+            stat = os.stat(file_path)
+        except FileNotFoundError:
+            details += (0, 0, 0)
+            continue
+        details += (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+    return details
@@ -0,0 +1,190 @@
+import re
+from logging import getLogger
+from typing import Optional, Dict, List, Tuple, Any
+
+log = getLogger(__name__)
+
+LINE_REGEX = re.compile(r'( *)([A-Za-z0-9_.-]+):(?:[ \t]+(.*))?')
+INT_REGEX = re.compile(r'[-+]?(?:0|[1-9][0-9]*)')
+PLAIN_REGEX = re.compile(r'[A-Za-z_][A-Za-z0-9_.+-]*')
+NULLS = {'', '~', 'null', 'Null', 'NULL'}
+BOOLS = {
+    'true': True, 'True': True, 'TRUE': True,
+    'false': False, 'False': False, 'FALSE': False,
+}
+
+
+class Unsupported(Exception):
+    """The yaml uses syntax that is not in the simple subset."""
+
+
+def load(text: str) -> Optional[Dict[str, Any]]:
+    """Load yaml that only uses a simple subset of the syntax.
+
+    This is much faster to import and run than a full yaml loader, and
+    is enough for most configs (see `myver.config.load_version`). The
+    subset is nested block mappings with plain string keys, where the values
+    are null, booleans, decimal integers, quoted strings, plain strings
+    that can't be mistaken for another type, and flow sequences of
+    these. Comments and blank lines are allowed.
+
+    :param text: The yaml to load.
+    :return: The loaded mapping, the same as a yaml 1.2 safe loader would
+        give, or None if the yaml is not within the subset.
+    """
+    try:
+        return _load(text)
+    except Unsupported as e:
+        log.debug(f'Yaml is not in the simple subset, {e}')
+        return None
+
+
+def _load(text: str) -> Dict[str, Any]:
+    root = {}
+    # The indent of the keys in each open mapping, and the mapping.
+    stack: List[Tuple[int, dict]] = [(0, root)]
+    # Mappings for keys without a value, these are null if nothing is
+    # nested under them.
+    empties: List[Tuple[dict, str]] = []
+    opened: Optional[Tuple[int, dict]] = None
+
+    for line in text.splitlines():
+        content = strip_comment(line)
+        if not content.strip():
+            continue
+        match = LINE_REGEX.fullmatch(content.rstrip())
+        if match is None:
+            raise Unsupported(f'unsupported line `{line}`')
+        indent = len(match.group(1))
+        key = parse_key(match.group(2))
+        value = match.group(3) or ''
+
+        mapping = enter_mapping(stack, opened, indent, line)
+        opened = None
+        if key in mapping:
+            raise Unsupported(f'duplicate key `{key}`')
+        if value:
+            mapping[key] = parse_value(value)
+        else:
+            mapping[key] = {}
+            empties.append((mapping, key))
+            opened = (indent, mapping[key])
+
+    for mapping, key in empties:
+        if not mapping[key]:
+            mapping[key] = None
+    return root
+
+
+def enter_mapping(stack: List[Tuple[int, dict]],
+                  opened: Optional[Tuple[int, dict]],
+                  indent: int, line: str) -> dict:
+    """Find the mapping that a line at an indent belongs to.
+
+    :param stack: The indent and mapping of each open mapping, this is
+        updated for the line.
+    :param opened: The indent and mapping of the key on the previous
+        line if it had no value, lines nested under it open the mapping.
+    :param indent: The indent of the line.
+    :param line: The line, for the error message.
+    :raise Unsupported: If the indent does not match an open mapping.
+    """
+    if opened is not None:
+        key_indent, mapping = opened
+        if indent > key_indent:
+            stack.append((indent, mapping))
+    while indent < stack[-1][0]:
+        stack.pop()
+    if indent != stack[-1][0]:
+        raise Unsupported(f'unexpected indent on line `{line}`')
+    return stack[-1][1]
+
+
+def parse_key(key: str) -> str:
+    """Check that a key is loaded as a string.
+
+    Keys like `1`, `true` or `null` are not strings in yaml 1.2.
+
+    :raise Unsupported: If the key is not a plain string.
+    """
+    if key in NULLS or key in BOOLS or not PLAIN_REGEX.fullmatch(key):
+        raise Unsupported(f'unsupported key `{key}`')
+    return key
+
+
+def parse_value(value: str) -> Any:
+    """Parse a scalar or flow sequence value.
+
+    :raise Unsupported: If the value is not in the simple subset.
+    """
+    if value.startswith('['):
+        if not value.endswith(']'):
+            raise Unsupported(f'unsupported sequence `{value}`')
+        items = value[1:-1].strip()
+        if not items:
+            return []
+        items = [item.strip() for item in split_items(items)]
+        if not all(items):
+            raise Unsupported(f'unsupported sequence `{value}`')
+        return [parse_scalar(item) for item in items]
+    return parse_scalar(value)
+
+
+def parse_scalar(value: str) -> Any:
+    """Parse a scalar value.
+
+    :raise Unsupported: If the value is not in the simple subset.
+    """
+    if value in NULLS:
+        return None
+    if value in BOOLS:
+        return BOOLS[value]
+    if INT_REGEX.fullmatch(value):
+        return int(value)
+    if len(value) >= 2 and value[0] == value[-1] == "'":
+        inner = value[1:-1]
+        if "'" in inner.replace("''", ''):
+            raise Unsupported(f'unsupported string `{value}`')
+        return inner.replace("''", "'")
+    if len(value) >= 2 and value[0] == value[-1] == '"':
+        inner = value[1:-1]
+        if '"' in inner or '\\' in inner:
+            raise Unsupported(f'unsupported string `{value}`')
+        return inner
+    if PLAIN_REGEX.fullmatch(value):
+        return value
+    raise Unsupported(f'unsupported value `{value}`')
+
+
+def split_items(items: str) -> List[str]:
+    """Split the items of a flow sequence on the commas between them."""
+    parts = []
+    start = 0
+    quote = None
+    for index, char in enumerate(items):
+        if quote:
+            if char == quote:
+                quote = None
+        elif char in '\'"':
+            quote = char
+        elif char == ',':
+            parts.append(items[start:index])
+            start = index + 1
+        elif char in '[]{}':
+            raise Unsupported(f'unsupported nested collection `{items}`')
+    parts.append(items[start:])
+    return parts
+
+
+def strip_comment(line: str) -> str:
+    """Remove a comment from a line, ignoring `#` within quotes."""
+    quote = None
+    for index, char in enumerate(line):
+        if quote:
+            if char == quote:
+                quote = None
+        elif char in '\'"':
+            quote = char
+        elif char == '#' and (index == 0 or line[index - 1] in ' \t'):
+            return line[:index]
+    return line
@@ -0,0 +1,302 @@
+from __future__ import annotations
+
+from logging import getLogger
+from typing import (
+    List, Optional, Union, Tuple, Sequence, Dict, Iterable, Iterator,
+)
+
+from myver.part import Part
+from myver.version import (
+    Version, split_bump_arg, validate_keys, validate_requires,
+)
+
+log = getLogger(__name__)
+
+Value = Optional[Union[str, int]]
+
+
+class VersionSchema:
+    """The configuration of the parts in a version, without any values.
+
+    A schema is shared by every snapshot of a version, so that each
+    snapshot only needs to hold its own tuple of values. The parts in the
+    schema are private copies that are never changed, which makes the
+    schema safe to share between threads.
+
+    :param parts: The parts to take the configuration from, their values
+        and relationships are ignored.
+    :raise ConfigError: If the parts are not a valid version.
+    """
+
+    __slots__ = ('parts', 'keys', '_indexes', 'required_by')
+
+    def __init__(self, parts: Sequence[Part]):
+        validate_keys(list(parts))
+        validate_requires(list(parts))
+        self.parts: Tuple[Part, ...] = tuple(part.copy() for part in parts)
+        for part in self.parts:
+            part.value = None
+        self.keys: Tuple[str, ...] = tuple(part.key for part in self.parts)
+        self._indexes: Dict[str, int] = {
+            key: index for index, key in enumerate(self.keys)
+        }
+        # For each part, the indexes of the parts before it that require
+        # it, used to check if a part is required without walking parents.
+        self.required_by: Tuple[Tuple[int, ...], ...] = tuple(
+            tuple(j for j in range(index) if self.parts[j].requires == key)
+            for index, key in enumerate(self.keys)
+        )
+
+    def index(self, key: str) -> int:
+        """Gets the position of a part based on its key.
+
+        :param key: The key of the part.
+        :raise KeyError: If no part has the key provided.
+        """
+        return self._indexes[key]
+
+    def snapshot(self, values: Iterable[Value]) -> VersionSnapshot:
+        """Create a snapshot of this schema with the given part values.
+
+        :param values: The value of each part, in the order of the parts.
+        """
+        return VersionSnapshot(self, tuple(values))
+
+    def bump(self, values: List[Value], index: int, bump_args: List[str],
+             value_override: str = None):
+        """Bump a part's value within a List of values.
+
+        This follows the same rules as `Part.bump`.
+
+        :param values: The values to change in place.
+        :param index: The index of the part to bump.
+        :param bump_args: The bump arguments.
+        :param value_override: Manual override for the bumped value.
+        """
+        part = self.parts[index]
+        log.info(f'Bumping <{part.key}>')
+        values[index] = part.successor(values[index], value_override)
+        if index + 1 < len(values):
+            self.reset(values, index + 1, bump_args)
+
+    def reset(self, values: List[Value], index: int,
+              bump_args: List[str] = None):
+        """Reset a part and its descendants within a List of values.
+
+        This follows the same rules as `Part.reset`, the bump args are
+        only taken into account for the part at `index`.
+
+        :param values: The values to change in place.
+        :param index: The index of the first part to reset.
+        :param bump_args: The keys that are being bumped.
+        """
+        bump_args = bump_args or []
+        for i in range(index, len(values)):
+            part = self.parts[i]
+            log.info(f'Resetting <{part.key}>')
+            if self.is_required(values, i) and part.key not in bump_args:
+                values[i] = part.start
+            else:
+                values[i] = None
+            bump_args = []
+
+    def is_required(self, values: Sequence[Value], index: int) -> bool:
+        """Checks if a part is required by any set part before it.
+
+        The first part is always required since it is the head of the
+        version.
+        """
+        if index == 0:
+            return True
+        for j in self.required_by[index]:
+            if values[j] is not None:
+                return True
+        return False
+
+    def sort_key(self, values: Sequence[Value]) -> Tuple[int, ...]:
+        """Get the key that orders the given part values.
+
+        :raise ValueError: If a value is invalid for its part.
+        """
+        return tuple([
+            part.sort_value(value)
+            for part, value in zip(self.parts, values)
+        ])
+
+    def render(self, values: Sequence[Value]) -> str:
+        """Get the version string for the given part values."""
+        return ''.join([
+            part.render(value)
+            for part, value in zip(self.parts, values)
+            if value is not None
+        ])
+
+
+class VersionSnapshot:
+    """An immutable version.
+
+    Unlike `Version`, bumping or resetting a snapshot does not change it,
+    instead a new snapshot is returned. Snapshots share their schema, so
+    only the tuple of values is copied when a new snapshot is made. This
+    makes snapshots cheap to keep around, and safe to share between
+    threads.
+
+    :param schema: The configuration of the parts.
+    :param values: The value of each part, in the order of the parts.
+    """
+
+    __slots__ = ('schema', 'values', '_str', '_sort_key')
+
+    def __init__(self, schema: VersionSchema, values: Tuple[Value, ...]):
+        if len(values) != len(schema.parts):
+            raise ValueError(
+                f'Expected {len(schema.parts)} values for the snapshot, got '
+                f'{len(values)}')
+        object.__setattr__(self, 'schema', schema)
+        object.__setattr__(self, 'values', values)
+        object.__setattr__(self, '_str', None)
+        object.__setattr__(self, '_sort_key', None)
+
+    @classmethod
+    def from_version(cls, version: Version,
+                     schema: VersionSchema = None) -> VersionSnapshot:
+        """Take a snapshot of the current values of a version.
+
+        :param version: The version to take a snapshot of.
+        :param schema: The schema to use, pass this in when taking many
+            snapshots of versions with the same configuration so that
+            the schema is shared.
+        """
+        schema = schema or VersionSchema(version.parts)
+        return cls(schema, tuple(part.value for part in version.parts))
+
+    def to_version(self) -> Version:
+        """Get a mutable `Version` with the values of this snapshot."""
+        parts = []
+        for part, value in zip(self.schema.parts, self.values):
+            part = part.copy()
+            part.value = value
+            parts.append(part)
+        return Version(parts)
+
+    @property
+    def sort_key(self) -> Tuple[int, ...]:
+        """Get the key that orders snapshots of the same configuration.
+
+        The key is a tuple of integers, so comparing keys is done at C
+        speed. It is worked out once and then cached. For large
+        collections, `sorted(snapshots, key=attrgetter('sort_key'))` is
+        faster than relying on the comparison operators.
+
+        :raise ValueError: If a part has an invalid value.
+        """
+        if self._sort_key is None:
+            object.__setattr__(
+                self, '_sort_key', self.schema.sort_key(self.values))
+        return self._sort_key
+
+    def value(self, key: str) -> Value:
+        """Gets the value of a part based on its key.
+
+        :param key: The key of the part.
+        :raise KeyError: If no part has the key provided.
+        """
+        return self.values[self.schema.index(key)]
+
+    def bump(self, args: List[str]) -> VersionSnapshot:
+        """Get the snapshot that bumping this snapshot would give.
+
+        :param args: The List of part keys to bump. An arg may have a
+            key value pair with the syntax of `<key>=<value>`.
+        :raise BumpError: When the bumping fails.
+        :raise KeyError: If an arg references an invalid part key.
+        """
+        values = list(self.values)
+        for arg in args:
+            key, value_override = split_bump_arg(arg)
+            self.schema.bump(
+                values, self.schema.index(key), args, value_override)
+        return VersionSnapshot(self.schema, tuple(values))
+
+    def reset(self, keys: List[str]) -> VersionSnapshot:
+        """Get the snapshot that resetting parts would give.
+
+        :param keys: The keys of the parts to reset.
+        :raise KeyError: If a key does not reference a valid part.
+        """
+        values = list(self.values)
+        for key in keys:
+            self.schema.reset(values, self.schema.index(key))
+        return VersionSnapshot(self.schema, tuple(values))
+
+    def plan(self, steps: Iterable[Union[str, List[str]]]) \
+            -> Iterator[VersionSnapshot]:
+        """Lazily get the snapshots that a sequence of bumps would give.
+
+        :param steps: The bump args for each step, in the same form as
+            the args of `bump`. A string is treated as a single arg.
+        :raise BumpError: When a bump fails.
+        :raise KeyError: If a step references an invalid part key.
+        """
+        snapshot = self
+        for step in steps:
+            if isinstance(step, str):
+                step = [step]
+            snapshot = snapshot.bump(step)
+            yield snapshot
+
+    def parse(self, keys: List[str]) -> str:
+        """Parses specific parts in the version, see `Version.parse`.
+
+        :param keys: The keys of the parts to parse.
+        :raise KeyError: If an invalid part key is provided.
+        """
+        end_index = -1
+        for key in keys:
+            index = self.schema.index(key)
+            if self.values[index] is not None:
+                end_index = index
+
+        if end_index < 0:
+            return str(self)
+        return self.schema.render(self.values[:end_index + 1])
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f'{type(self).__name__} is immutable')
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, VersionSnapshot):
+            return NotImplemented
+        return (self.values == other.values
+                and self.schema.keys == other.schema.keys)
+
+    def __hash__(self) -> int:
+        return hash((self.schema.keys, self.values))
+
+    def __lt__(self, other: VersionSnapshot) -> bool:
+        if not isinstance(other, VersionSnapshot):
+            return NotImplemented
+        return self.sort_key < other.sort_key
+
+    def __le__(self, other: VersionSnapshot) -> bool:
+        if not isinstance(other, VersionSnapshot):
+            return NotImplemented
+        return self.sort_key <= other.sort_key
+
+    def __gt__(self, other: VersionSnapshot) -> bool:
+        if not isinstance(other, VersionSnapshot):
+            return NotImplemented
+        return self.sort_key > other.sort_key
+
+    def __ge__(self, other: VersionSnapshot) -> bool:
+        if not isinstance(other, VersionSnapshot):
+            return NotImplemented
+        return self.sort_key >= other.sort_key
+
+    def __str__(self):
+        if self._str is None:
+            object.__setattr__(self, '_str', self.schema.render(self.values))
+        return self._str
+
+    def __repr__(self):
+        return f'VersionSnapshot({str(self)!r})'
@@ -0,0 +1,114 @@
+import os
+import sqlite3
+from contextlib import contextmanager
+from logging import getLogger
+from typing import Dict
+
+from myver.error import ConfigError, LockError
+from myver.snapshot import Value
+from myver.trace import span
+
+log = getLogger(__name__)
+
+# Seconds to wait for another process to finish writing, the same as
+# waiting for a config file lock (see `myver.lock`).
+BUSY_TIMEOUT = 10.0
+
+
+class StateStore:
+    """Part values kept in a SQLite database.
+
+    The database is in WAL mode, so reading the values never waits for
+    a process that is changing them, and each change of version is one
+    transaction. The configuration of the parts stays in the config
+    file, only the values are kept here.
+
+    :param path: The path of the database, which is created if it does
+        not exist.
+    :param timeout: Seconds to wait for another process to finish
+        writing.
+    :raise ConfigError: If the database could not be opened.
+    """
+
+    def __init__(self, path: str, timeout: float = BUSY_TIMEOUT):
+        self.path: str = path
+        try:
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            # Transactions are begun explicitly, see `transaction`.
+            self._connection = sqlite3.connect(
+                path, timeout=timeout, isolation_level=None)
+        except (OSError, sqlite3.Error) as e:
+            raise ConfigError(f'Could not open state database {path}, {e}')
+        try:
+            self._connection.execute('PRAGMA journal_mode=WAL')
+            self._connection.execute(
+                'CREATE TABLE IF NOT EXISTS parts (key TEXT PRIMARY KEY, '
+                'value)')
+        except sqlite3.Error as e:
+            self._connection.close()
+            raise ConfigError(f'Could not open state database {path}, {e}')
+
+    def values(self) -> Dict[str, Value]:
+        """Get the value of each part that has one saved."""
+        with span('read state', path=self.path):
+            return dict(self._connection.execute(
+                'SELECT key, value FROM parts'))
+
+    def save(self, values: Dict[str, Value]):
+        """Save the value of each part, in the current transaction if
+        there is one."""
+        with span('save state', path=self.path):
+            self._connection.executemany(
+                'INSERT OR REPLACE INTO parts (key, value) VALUES (?, ?)',
+                values.items())
+
+    @contextmanager
+    def transaction(self):
+        """Run reads and writes as one transaction.
+
+        The transaction takes the write lock when it begins, so the
+        values read in it can't be changed by another process before
+        they are written. It is committed when the block ends, or rolled
+        back if the block raises.
+
+        :raise LockError: If another process held the write lock for
+            longer than the timeout.
+        """
+        try:
+            self._connection.execute('BEGIN IMMEDIATE')
+        except sqlite3.OperationalError as e:
+            raise LockError(f'Could not lock state database {self.path}, '
+                            f'{e}')
+        try:
+            yield self
+        except BaseException:
+            self._connection.rollback()
+            raise
+        self._connection.commit()
+
+    def close(self):
+        self._connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def read_state(path: str) -> Dict[str, Value]:
+    """Get the saved part values of a state database.
+
+    :param path: The path of the database.
+    :return: The values, which is empty if the database does not exist.
+    :raise ConfigError: If the database could not be read.
+    """
+    if not os.path.exists(path):
+        return {}
+    with StateStore(path) as store:
+        try:
+            return store.values()
+        except sqlite3.Error as e:
+            raise ConfigError(f'Could not read state database {path}, {e}')
@@ -0,0 +1,227 @@
+import contextlib
+import os
+import threading
+import time
+from logging import getLogger
+from typing import List, Optional, Tuple, Iterable
+
+from myver.error import MyverError
+
+log = getLogger(__name__)
+
+TRACE_ENV = 'MYVER_TRACE'
+CAPTURE_ENV = 'MYVER_TRACE_CAPTURE'
+CAPTURES = ['cprofile', 'tracemalloc']
+
+_tracer: Optional['Tracer'] = None
+# Spans recorded before tracing starts, such as the time spent on
+# imports, which are added to the trace if tracing is started.
+_pending: List[Tuple[str, int, int, dict]] = []
+
+
+class Tracer:
+    """Collects timed spans and writes them as a Chrome trace.
+
+    The trace is a JSON file in the Chrome trace event format, which can
+    be opened with `chrome://tracing`, Perfetto or speedscope.
+
+    :param path: The path to write the trace to.
+    :param capture: Extra data to capture, `cprofile` writes a profile
+        of the whole run to `<path>.prof`, and `tracemalloc` adds the
+        memory allocated within each span to its counters.
+    """
+
+    def __init__(self, path: str, capture: Iterable[str] = ()):
+        self.path: str = path
+        self.capture: List[str] = list(capture)
+        self.events: List[dict] = []
+        self._lock = threading.Lock()
+        self._profile = None
+        for name in self.capture:
+            if name not in CAPTURES:
+                raise MyverError(f'Unknown trace capture `{name}`, expected '
+                                 f'one of {", ".join(CAPTURES)}')
+
+    @property
+    def tracing_memory(self) -> bool:
+        return 'tracemalloc' in self.capture
+
+    def start(self):
+        if self.tracing_memory:
+            import tracemalloc
+            tracemalloc.start()
+        if 'cprofile' in self.capture:
+            import cProfile
+            self._profile = cProfile.Profile()
+            self._profile.enable()
+
+    def stop(self):
+        """Stop capturing and write the trace."""
+        if self._profile is not None:
+            self._profile.disable()
+            self._profile.dump_stats(f'{self.path}.prof')
+            log.info(f'Wrote profile {self.path}.prof')
+        if self.tracing_memory:
+            import tracemalloc
+            tracemalloc.stop()
+        self.write()
+
+    def add(self, name: str, start: int, end: int, args: dict = None):
+        """Add a span that has ended.
+
+        :param name: The name of the span.
+        :param start: The `time.perf_counter_ns` when the span started.
+        :param end: The `time.perf_counter_ns` when the span ended.
+        :param args: Counters and details of the span.
+        """
+        event = {
+            'name': name,
+            'ph': 'X',
+            'ts': start / 1000,
+            'dur': (end - start) / 1000,
+            'pid': os.getpid(),
+            'tid': threading.get_ident(),
+            'args': args or {},
+        }
+        with self._lock:
+            self.events.append(event)
+
+    def write(self):
+        import json
+
+        with self._lock:
+            events = sorted(self.events, key=lambda event: event['ts'])
+        with open(self.path, 'w') as file:
+            json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, file)
+        log.info(f'Wrote trace {self.path}')
+
+
+class Span:
+    """A timed span within a trace, see `span`."""
+
+    __slots__ = ('tracer', 'name', 'args', 'start', '_memory')
+
+    def __init__(self, tracer: Tracer, name: str, args: dict):
+        self.tracer: Tracer = tracer
+        self.name: str = name
+        self.args: dict = args
+        self.start: int = 0
+        self._memory: int = 0
+
+    def count(self, name: str, value: int = 1):
+        """Add to a counter of the span."""
+        self.args[name] = self.args.get(name, 0) + value
+
+    def set(self, **args):
+        """Set details of the span."""
+        self.args.update(args)
+
+    def __enter__(self):
+        if self.tracer.tracing_memory:
+            import tracemalloc
+            self._memory = tracemalloc.get_traced_memory()[0]
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc_info):
+        end = time.perf_counter_ns()
+        if self.tracer.tracing_memory:
+            import tracemalloc
+            current, peak = tracemalloc.get_traced_memory()
+            self.args['memory_allocated'] = current - self._memory
+            self.args['memory_peak'] = peak
+        self.tracer.add(self.name, self.start, end, self.args)
+
+
+class NullSpan:
+    """A span that does nothing, used when tracing is off."""
+
+    __slots__ = ()
+
+    def count(self, name: str, value: int = 1):
+        pass
+
+    def set(self, **args):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        pass
+
+
+NULL_SPAN = NullSpan()
+
+
+def span(name: str, **args):
+    """Time a block of code as a span of the trace.
+
+    When tracing is off this costs only a function call. The span has
+    `count` and `set` methods to record counters and details.
+
+    :param name: The name of the span.
+    :param args: Details of the span.
+    """
+    if _tracer is None:
+        return NULL_SPAN
+    return Span(_tracer, name, args)
+
+
+def record(name: str, start: int, end: int, **args):
+    """Add a span that was timed by the caller.
+
+    This is for work that happens before tracing can be started, such as
+    parsing the args that turn tracing on. The span is kept until tracing
+    starts, or is dropped if tracing is not started.
+
+    :param name: The name of the span.
+    :param start: The `time.perf_counter_ns` when the span started.
+    :param end: The `time.perf_counter_ns` when the span ended.
+    """
+    if _tracer is None:
+        _pending.append((name, start, end, args))
+    else:
+        _tracer.add(name, start, end, args)
+
+
+@contextlib.contextmanager
+def session(path: Optional[str], capture: Iterable[str] = ()):
+    """Trace everything within the block, if a path is given.
+
+    :param path: The path to write the trace to, or None to not trace.
+    :param capture: Extra data to capture, see `Tracer`.
+    :raise MyverError: If a capture is unknown.
+    """
+    global _tracer
+    if not path:
+        _pending.clear()
+        yield
+        return
+
+    tracer = Tracer(path, capture)
+    for name, start, end, args in _pending:
+        tracer.add(name, start, end, args)
+    _pending.clear()
+    _tracer = tracer
+    tracer.start()
+    try:
+        with span('run'):
+            yield
+    finally:
+        _tracer = None
+        tracer.stop()
+
+
+def settings(profile: Optional[str], capture: Optional[List[str]]) \
+        -> Tuple[Optional[str], List[str]]:
+    """Get the trace path and captures from the args or the environment.
+
+    :param profile: The `--profile` path.
+    :param capture: The `--profile-capture` names.
+    """
+    path = profile or os.environ.get(TRACE_ENV)
+    if capture is None:
+        capture = [name for name in os.environ.get(CAPTURE_ENV, '').split(',')
+                   if name]
+    return path, capture
@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from logging import getLogger
-from typing import List
+from typing import List, Iterable, Iterator, Union, Optional, Tuple
 
 from myver.error import ConfigError, BumpError
 from myver.part import Part
@@ -18,6 +18,8 @@ class Version:
     :param parts: The List of parts in the version.
     """
 
+    __slots__ = ('_parts',)
+
     def __init__(self, parts: List[Part] = None):
         self._parts: List[Part] = parts or []
         self.parts = parts or []
@@ -48,16 +50,8 @@ class Version:
         """
         log.debug('Starting version bump')
         for arg in args:
-            if arg.count('=') > 1:
-                raise BumpError(
-                    f'The bump arg `{arg}` contains more than 1 `=` symbol, '
-                    f'there can only be 0 or 1 `=` symbol in the bump arg')
-            elif arg.count('=') == 1:
-                key = arg.split('=')[0]
-                value_override = arg.split('=')[1]
-                self.part(key).bump(args, value_override)
-            else:
-                self.part(arg).bump(args)
+            key, value_override = split_bump_arg(arg)
+            self.part(key).bump(args, value_override)
 
     def reset(self, keys: List[str]):
         """Reset parts based on their keys.
@@ -70,6 +64,38 @@ class Version:
         for key in keys:
             self.part(key).reset()
 
+    def plan(self,
+             steps: Iterable[Union[str, List[str]]]) -> Iterator[str]:
+        """Lazily get the versions that a sequence of bumps would give.
+
+        The bumps are applied one after the other to a single copy of
+        this version, so this version is never changed. Since it is lazy,
+        `steps` can be an endless iterable (e.g. `itertools.cycle`).
+
+        For example, bumping `prenum` twice and then `pre` would be the
+        steps `['prenum', 'prenum', 'pre']`.
+
+        :param steps: The bump args for each step, in the same form as
+            the args of `bump`. A string is treated as a single arg.
+        :raise BumpError: When a bump fails.
+        :raise KeyError: If a step references an invalid part key.
+        :return: The version string after each step.
+        """
+        version = self.copy()
+        for step in steps:
+            if isinstance(step, str):
+                step = [step]
+            version.bump(step)
+            yield str(version)
+
+    def copy(self) -> Version:
+        """Get a copy of this version that can be changed independently.
+
+        Only the part values are copied, the configuration of each part
+        is shared with this version.
+        """
+        return Version([part.copy() for part in self._parts])
+
     def part(self, key: str) -> Part:
         """Gets a part based on its key.
 
@@ -107,11 +133,55 @@ class Version:
 
         return parsed
 
+    @property
+    def sort_key(self) -> Tuple[int, ...]:
+        """Get a key that orders versions of the same configuration.
+
+        The key has an integer for each part, in the order of the parts,
+        see `Part.sort_value`. Since a version can be changed, the key is
+        worked out each time, use `VersionSnapshot` to have it cached.
+
+        :raise ValueError: If a part has an invalid value.
+        """
+        return tuple([part.sort_value(part.value) for part in self._parts])
+
     def __eq__(self, other: Version):
-        for this_part, other_part in zip(self.parts, other.parts):
-            if not this_part == other_part:
-                return False
-        return True
+        if not isinstance(other, Version):
+            return NotImplemented
+        return self._items() == other._items()
+
+    def __hash__(self):
+        """Hash the current part values of the version.
+
+        A version must not be changed while it is in a set or used as a
+        dict key, since its hash changes with it. Use `VersionSnapshot`
+        for versions that need to be hashed.
+        """
+        return hash(self._items())
+
+    def _items(self) -> Tuple[Tuple[str, Optional[Union[str, int]]], ...]:
+        """Get the key and value of each part, what versions compare by."""
+        return tuple((part.key, part.value) for part in self._parts)
+
+    def __lt__(self, other: Version) -> bool:
+        if not isinstance(other, Version):
+            return NotImplemented
+        return self.sort_key < other.sort_key
+
+    def __le__(self, other: Version) -> bool:
+        if not isinstance(other, Version):
+            return NotImplemented
+        return self.sort_key <= other.sort_key
+
+    def __gt__(self, other: Version) -> bool:
+        if not isinstance(other, Version):
+            return NotImplemented
+        return self.sort_key > other.sort_key
+
+    def __ge__(self, other: Version) -> bool:
+        if not isinstance(other, Version):
+            return NotImplemented
+        return self.sort_key >= other.sort_key
 
     def __str__(self):
         version_str = ''
@@ -123,6 +193,24 @@ class Version:
         return version_str
 
 
+def split_bump_arg(arg: str) -> Tuple[str, Optional[str]]:
+    """Split a bump arg into its part key and value override.
+
+    :param arg: The bump arg, either `<key>` or `<key>=<value>`.
+    :raise BumpError: If the arg has more than one `=` symbol.
+    :return: The part key, and the value override (or None if there is
+        no override).
+    """
+    if arg.count('=') > 1:
+        raise BumpError(
+            f'The bump arg `{arg}` contains more than 1 `=` symbol, '
+            f'there can only be 0 or 1 `=` symbol in the bump arg')
+    elif arg.count('=') == 1:
+        key, value_override = arg.split('=')
+        return key, value_override
+    return arg, None
+
+
 def validate_requires(parts: List[Part]):
     """Validates that parts require other valid parts.
 
@@ -0,0 +1,329 @@
+import glob
+import json
+import os
+import select
+import struct
+import sys
+import time
+from logging import getLogger
+from typing import List, Dict, Set, Optional, TextIO, Tuple
+
+from myver.config import Config
+from myver.error import MyverError
+from myver.files import compiled_patterns
+
+log = getLogger(__name__)
+
+# The inotify events, see `man 7 inotify`.
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_Q_OVERFLOW = 0x00004000
+IN_ONLYDIR = 0x01000000
+DIRECTORY_EVENTS = (IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE
+                    | IN_DELETE | IN_DELETE_SELF | IN_ONLYDIR)
+EVENT_HEADER = struct.Struct('iIII')
+
+FileStat = Tuple[int, int, int]
+
+
+class Inotify:
+    """Waits for changes to directories with inotify.
+
+    Directories are watched rather than files, since editors often save
+    by writing a new file and renaming it over the old one, which a
+    watch on the old file would not see.
+
+    :raise OSError: If inotify is not available.
+    """
+
+    def __init__(self):
+        # Only imported when watching, since nothing else needs ctypes.
+        import ctypes
+        import ctypes.util
+
+        self._libc = ctypes.CDLL(ctypes.util.find_library('c'),
+                                 use_errno=True)
+        self._fd: int = self._libc.inotify_init1(os.O_CLOEXEC)
+        if self._fd < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, os.strerror(errno))
+        self._directories: Dict[int, str] = {}
+
+    def watch(self, directories: Set[str], files: Set[str]):
+        """Start watching directories, if they are not watched already.
+
+        Files are seen through the events of their directory, so they do
+        not need their own watch.
+        """
+        watched = set(self._directories.values())
+        for directory in directories - watched:
+            descriptor = self._libc.inotify_add_watch(
+                self._fd, os.fsencode(directory), DIRECTORY_EVENTS)
+            if descriptor < 0:
+                log.warning(f'Could not watch directory <{directory}>')
+                continue
+            self._directories[descriptor] = directory
+
+    def wait(self, timeout: float = None) -> Optional[Set[str]]:
+        """Wait for changes.
+
+        :param timeout: Seconds to wait, or None to wait forever.
+        :return: The paths that changed, which is empty on a timeout, or
+            None if events were lost and everything should be checked.
+        """
+        changed: Set[str] = set()
+        overflow = False
+        ready, _, _ = select.select([self._fd], [], [], timeout)
+        while ready:
+            data = os.read(self._fd, 64 * 1024)
+            offset = 0
+            while offset < len(data):
+                descriptor, mask, _, length = EVENT_HEADER.unpack_from(
+                    data, offset)
+                offset += EVENT_HEADER.size
+                name = data[offset:offset + length].rstrip(b'\0')
+                offset += length
+                if mask & IN_Q_OVERFLOW:
+                    overflow = True
+                directory = self._directories.get(descriptor)
+                if directory is not None:
+                    changed.add(os.path.join(directory, os.fsdecode(name))
+                                if name else directory)
+            # Saves often come as a burst of events, which are handled
+            # together.
+            ready, _, _ = select.select([self._fd], [], [], 0)
+        return None if overflow else changed
+
+    def close(self):
+        os.close(self._fd)
+
+
+class Poller:
+    """Waits for changes by checking the stat of files and directories.
+
+    This is used where inotify is not available. A file that is created
+    or deleted changes the stat of its directory.
+
+    :param interval: Seconds between each check.
+    """
+
+    def __init__(self, interval: float = 1.0):
+        self.interval: float = interval
+        self._stats: Dict[str, Optional[FileStat]] = {}
+
+    def watch(self, directories: Set[str], files: Set[str]):
+        """Set the directories and files to check."""
+        self._stats = {path: stat_key(path) for path in directories | files}
+
+    def wait(self, timeout: float = None) -> Optional[Set[str]]:
+        """Wait for changes, see `Inotify.wait`."""
+        end = None if timeout is None else time.monotonic() + timeout
+        while True:
+            time.sleep(self.interval if end is None
+                       else max(0.0, min(self.interval,
+                                         end - time.monotonic())))
+            changed = set()
+            for path, stat in self._stats.items():
+                new_stat = stat_key(path)
+                if new_stat != stat:
+                    self._stats[path] = new_stat
+                    changed.add(path)
+            if changed:
+                return changed
+            if end is not None and time.monotonic() >= end:
+                return set()
+
+    def close(self):
+        pass
+
+
+class Watcher:
+    """Keeps an index of where each file has the current version.
+
+    The patterns of each file are compiled once, and each file is only
+    read again when it changes, so a change is reported without checking
+    any other file. The config is reloaded when it, a file it extends,
+    or its state database changes.
+
+    :param config_path: The path of the config file.
+    :param output: Where to write a JSON line for each change, defaults
+        to stdout.
+    :param poll: Seconds between checks when polling, or None to use
+        inotify where it is available.
+    :raise ConfigError: If the config is invalid.
+    """
+
+    def __init__(self, config_path: str, output: TextIO = None,
+                 poll: float = None):
+        self.config_path: str = os.path.abspath(config_path)
+        self.output: TextIO = output or sys.stdout
+        self.backend = None if poll is None else Poller(poll)
+        if self.backend is None:
+            try:
+                self.backend = Inotify()
+            except (OSError, AttributeError) as e:
+                log.info(f'Inotify is not available, polling instead, {e}')
+                self.backend = Poller()
+        self.config: Optional[Config] = None
+        self.version: str = ''
+        # The line numbers of the version in each file, which is empty
+        # when a file does not have the version.
+        self.index: Dict[str, List[int]] = {}
+        self.patterns: Dict[str, list] = {}
+        try:
+            self.load()
+        except Exception:
+            self.backend.close()
+            raise
+
+    def load(self):
+        """Load the config and scan every file."""
+        config = Config(self.config_path)
+        self.config = config
+        self.version = str(config.version)
+        old_index = self.index
+        self.index = {}
+        self.expand()
+        drift = sum(not lines for lines in self.index.values())
+        self.emit({'event': 'version', 'version': self.version,
+                   'files': len(self.index), 'drift': drift})
+        # Only files with drift are reported, and files that had drift
+        # before the reload.
+        for path, lines in sorted(self.index.items()):
+            if not lines or old_index.get(path) == []:
+                self.report(path)
+
+    def expand(self) -> List[str]:
+        """Expand the path globs, scanning files that are new.
+
+        :return: The paths of the new files.
+        """
+        patterns: Dict[str, list] = {}
+        for file_updater in self.config.files:
+            compiled = compiled_patterns(tuple(file_updater.patterns),
+                                         self.version)
+            for path in glob.glob(file_updater.path):
+                patterns.setdefault(os.path.abspath(path), []).extend(compiled)
+        self.patterns = patterns
+
+        for path in sorted(set(self.index) - set(patterns)):
+            del self.index[path]
+            self.emit({'event': 'removed', 'path': path})
+        added = sorted(set(patterns) - set(self.index))
+        for path in added:
+            self.index[path] = self.scan(path)
+
+        config_paths = {self.config_path, *self.config.includes,
+                        *state_paths(self.config.state)}
+        directories = {os.path.dirname(path) for path in config_paths}
+        directories.update(os.path.dirname(path) for path in patterns)
+        directories.update(
+            base_directory(file_updater.path)
+            for file_updater in self.config.files)
+        directories = {directory for directory in directories
+                       if os.path.isdir(directory)}
+        self.backend.watch(directories, set(patterns) | config_paths)
+        return added
+
+    def scan(self, path: str) -> List[int]:
+        """Get the line numbers of the version in a file."""
+        try:
+            with open(path, 'r') as file:
+                data = file.read()
+        except OSError as e:
+            log.error(f'Error {e.errno} reading <{path}>, {e.strerror}')
+            return []
+        lines = set()
+        for pattern in self.patterns[path]:
+            for match in pattern.finditer(data):
+                lines.add(data.count('\n', 0, match.start()) + 1)
+        return sorted(lines)
+
+    def handle(self, changed: Optional[Set[str]]):
+        """Handle changed paths, see `Inotify.wait`."""
+        if changed is None or self.config_path in changed \
+                or changed.intersection(self.config.includes) \
+                or changed.intersection(state_paths(self.config.state)):
+            try:
+                self.load()
+            except MyverError as e:
+                self.emit({'event': 'error', 'error': e.message})
+            return
+
+        # Files that are created or deleted can change what the globs
+        # match, anything else is a file that is already known.
+        added = []
+        if any(path not in self.index or not os.path.isfile(path)
+               for path in changed):
+            added = self.expand()
+        for path in added:
+            self.report(path)
+        for path in sorted(changed.intersection(self.index) - set(added)):
+            old_lines = self.index[path]
+            self.index[path] = self.scan(path)
+            if self.index[path] != old_lines:
+                self.report(path)
+
+    def report(self, path: str):
+        """Emit whether a file has the version, and on which lines."""
+        lines = self.index[path]
+        self.emit({'event': 'ok' if lines else 'drift', 'path': path,
+                   'lines': lines})
+
+    def emit(self, event: dict):
+        self.output.write(json.dumps(event) + '\n')
+        self.output.flush()
+
+    def run(self, stop=None, timeout: float = 0.1):
+        """Watch for changes until interrupted.
+
+        :param stop: A `threading.Event` that stops watching when set.
+        :param timeout: How often to check `stop`, in seconds.
+        """
+        try:
+            while stop is None or not stop.is_set():
+                changed = self.backend.wait(None if stop is None else timeout)
+                if changed is None or changed:
+                    self.handle(changed)
+        finally:
+            self.backend.close()
+
+
+def base_directory(pattern: str) -> str:
+    """Get the directory of a glob up to its first magic component."""
+    parts = []
+    for part in os.path.abspath(pattern).split(os.sep):
+        if glob.has_magic(part):
+            break
+        parts.append(part)
+    else:
+        parts.pop()
+    return os.sep.join(parts) or os.sep
+
+
+def state_paths(path: Optional[str]) -> List[str]:
+    """Get the files that change when a state database is written."""
+    return [path, f'{path}-wal'] if path else []
+
+
+def stat_key(path: str) -> Optional[FileStat]:
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size, stat.st_ino
+
+
+def watch(config_path: str, poll: float = None):
+    """Watch a config and its files, writing a JSON line for each change.
+
+    :param config_path: The path of the config file.
+    :param poll: Seconds between checks when polling, or None to use
+        inotify where it is available.
+    :raise ConfigError: If the config is invalid.
+    """
+    Watcher(config_path, poll=poll).run()
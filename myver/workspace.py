@@ -0,0 +1,184 @@
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from glob import glob
+from logging import getLogger
+from typing import List, Dict, Set, TextIO
+
+from myver.config import Config
+from myver.error import MyverError
+from myver.files import FileId, resolve_globs
+from myver.service import VersionService, is_ok
+
+log = getLogger(__name__)
+
+WRITE_OPS = {'bump', 'reset'}
+
+
+def find_configs(pattern: str) -> List[str]:
+    """Get the config files matching a glob, `**` matches any directories.
+
+    :param pattern: The glob of the config files.
+    :return: The paths of the configs, in sorted order.
+    """
+    return sorted(path for path in glob(pattern, recursive=True)
+                  if os.path.isfile(path))
+
+
+def file_ids(config_path: str) -> Set[FileId]:
+    """Get the (device, inode) of a config and each file it updates.
+
+    Paths that are links to the same file have the same id, so configs
+    that share a file can be found by comparing their ids. Relative
+    globs are expanded from the directory of the config, the same as
+    `VersionService` does.
+
+    :raise ConfigError: If the config is invalid.
+    """
+    paths = [config_path]
+    file_updaters = resolve_globs(
+        Config(config_path).files,
+        os.path.dirname(os.path.abspath(config_path)))
+    for file_updater in file_updaters:
+        paths.extend(glob(file_updater.path))
+
+    ids = set()
+    for path in paths:
+        try:
+            stat = os.stat(path)
+        except OSError:
+            continue
+        ids.add((stat.st_dev, stat.st_ino))
+    return ids
+
+
+def group_configs(configs: List[str], ids: List[Set[FileId]]) \
+        -> List[List[str]]:
+    """Group configs that share any file, directly or through others.
+
+    :param configs: The config paths, in sorted order.
+    :param ids: The file ids of each config, see `file_ids`.
+    :return: The groups, each in the order of `configs`.
+    """
+    parents = list(range(len(configs)))
+
+    def root(index: int) -> int:
+        while parents[index] != index:
+            parents[index] = parents[parents[index]]
+            index = parents[index]
+        return index
+
+    owners: Dict[FileId, int] = {}
+    for index, config_ids in enumerate(ids):
+        for file_id in config_ids:
+            owner = owners.setdefault(file_id, index)
+            parents[root(index)] = root(owner)
+
+    groups: Dict[int, List[str]] = {}
+    for index, config in enumerate(configs):
+        groups.setdefault(root(index), []).append(config)
+    return list(groups.values())
+
+
+def run_configs(configs: List[str], requests: List[dict]) -> List[dict]:
+    """Run requests against each config in turn.
+
+    :param configs: The config paths.
+    :param requests: The requests to run, see `VersionService`.
+    :return: A result for each config, with the `config` path, whether
+        every request was `ok`, and the `responses` to the requests.
+    """
+    results = []
+    for config in configs:
+        try:
+            service = VersionService(config)
+        except MyverError as e:
+            responses = [{'ok': False, 'error': e.message}]
+        except OSError as e:
+            responses = [{'ok': False,
+                          'error': f'{e.strerror} <{e.filename}>'}]
+        else:
+            responses = [service.handle(request) for request in requests]
+        results.append({
+            'config': config,
+            'ok': all(is_ok(response) for response in responses),
+            'responses': responses,
+        })
+    return results
+
+
+def run_workspace(pattern: str, requests: List[dict],
+                  processes: int = None, output: TextIO = None):
+    """Run requests against every config matching a glob.
+
+    The configs are run in parallel with a process pool. When the
+    requests change versions, configs that share a file (including
+    through links) are run one after the other in the same process, so
+    that their writes never race.
+
+    :param pattern: The glob of the config files.
+    :param requests: The requests to run against each config, see
+        `VersionService`.
+    :param processes: The number of processes, defaults to the number of
+        CPUs.
+    :param output: Where to write a JSON line with the result of each
+        config, in the order of the config paths. Defaults to stdout.
+    :raise MyverError: If no configs match, or after every config has
+        run if any request failed.
+    """
+    output = output or sys.stdout
+    configs = find_configs(pattern)
+    if not configs:
+        raise MyverError(f'No configs found matching `{pattern}`')
+    log.info(f'Found {len(configs)} configs in workspace')
+
+    with ProcessPoolExecutor(processes) as executor:
+        if any(request['op'] in WRITE_OPS for request in requests):
+            ids = list(executor.map(safe_file_ids, configs))
+            groups = group_configs(configs, ids)
+        else:
+            groups = [[config] for config in configs]
+        log.info(f'Running {len(groups)} groups of configs')
+        chunks = executor.map(
+            run_configs, groups, [requests] * len(groups))
+        results = [result for chunk in chunks for result in chunk]
+
+    results.sort(key=lambda result: result['config'])
+    failures = 0
+    for result in results:
+        output.write(json.dumps(result) + '\n')
+        failures += not result['ok']
+    output.flush()
+
+    if failures:
+        raise MyverError(f'{failures} of {len(results)} configs failed')
+
+
+def safe_file_ids(config_path: str) -> Set[FileId]:
+    """Get the file ids of a config, an invalid config only has its own id.
+
+    The error of an invalid config is reported when it is run.
+    """
+    try:
+        return file_ids(config_path)
+    except (MyverError, OSError):
+        stat = os.stat(config_path)
+        return {(stat.st_dev, stat.st_ino)}
+
+
+def requests_from_args(args) -> List[dict]:
+    """Get the requests that the command line args ask for.
+
+    The requests are in the same order that a single config runs them.
+    """
+    requests = []
+    if args.current is not None:
+        requests.append({'op': 'current', 'keys': args.current})
+    if args.bump:
+        requests.append({'op': 'bump', 'args': args.bump})
+    if args.reset:
+        requests.append({'op': 'reset', 'keys': args.reset})
+    if args.command == 'check':
+        requests.append({'op': 'check'})
+    return requests
@@ -33,4 +33,7 @@ setuptools.setup(
         'ruamel.yaml==0.17.17',
         'jinja2==3.0.3',
     ],
+    extras_require={
+        'numpy': ['numpy>=1.17'],
+    },
 )
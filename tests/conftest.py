@@ -1,8 +1,22 @@
+import os
+import subprocess
 import textwrap
 from pathlib import Path
 
 import pytest
 
+from myver.cache import CACHE_ENV
+from myver.part import NumberPart, IdentifierPart
+from myver.version import Version
+
+
+@pytest.fixture(autouse=True)
+def cache_dir(tmp_path_factory, monkeypatch) -> Path:
+    """Keep the caches of each test out of the user's cache directory."""
+    path = tmp_path_factory.mktemp('cache')
+    monkeypatch.setenv(CACHE_ENV, str(path))
+    return path
+
 
 @pytest.fixture
 def sample_config(tmp_path) -> Path:
@@ -88,3 +102,127 @@ def semver_config(tmp_path) -> Path:
         file.write(config)
 
     return path
+
+
+@pytest.fixture
+def semver() -> Version:
+    parts = [
+        NumberPart(
+            key='major',
+            value=3,
+            requires='minor',
+        ),
+        NumberPart(
+            key='minor',
+            value=9,
+            prefix='.',
+            requires='patch',
+        ),
+        NumberPart(
+            key='patch',
+            value=2,
+            prefix='.',
+        ),
+        IdentifierPart(
+            key='pre',
+            value='alpha',
+            prefix='-',
+            requires='prenum',
+            strings=['alpha', 'beta', 'rc'],
+        ),
+        NumberPart(
+            key='prenum',
+            value=1,
+            prefix='.',
+            start=1,
+        ),
+        NumberPart(
+            key='dev',
+            value=None,
+            prefix='+',
+            label='dev',
+            label_suffix='.',
+            start=1,
+            show_start=False,
+        ),
+    ]
+    return Version(parts)
+
+
+def run_git(path: Path, *args: str) -> str:
+    return subprocess.run(
+        ['git', *args], cwd=path, check=True, capture_output=True,
+        text=True, env={
+            **os.environ,
+            'GIT_AUTHOR_NAME': 'test',
+            'GIT_AUTHOR_EMAIL': 'test@example.com',
+            'GIT_COMMITTER_NAME': 'test',
+            'GIT_COMMITTER_EMAIL': 'test@example.com',
+        }).stdout
+
+
+@pytest.fixture
+def git():
+    return run_git
+
+
+@pytest.fixture
+def git_identity(monkeypatch):
+    """Set the identity that git commands run by myver commit as."""
+    for role in ['AUTHOR', 'COMMITTER']:
+        monkeypatch.setenv(f'GIT_{role}_NAME', 'test')
+        monkeypatch.setenv(f'GIT_{role}_EMAIL', 'test@example.com')
+
+
+@pytest.fixture
+def git_repo(tmp_path) -> Path:
+    path = tmp_path / 'repo'
+    path.mkdir()
+    run_git(path, 'init', '-q')
+    run_git(path, 'commit', '-q', '--allow-empty', '-m', 'initial')
+    return path
+
+
+@pytest.fixture
+def extended_config(tmp_path) -> Path:
+    """A config that extends a shared schema, which extends another."""
+    shared = tmp_path / 'shared'
+    shared.mkdir()
+    (shared / 'semver.yml').write_text(textwrap.dedent("""\
+        parts:
+            major:
+                value: 0
+                requires: minor
+            minor:
+                value: 0
+                prefix: '.'
+                requires: patch
+            patch:
+                value: 0
+                prefix: '.'
+    """))
+    (shared / 'build.yml').write_text(textwrap.dedent("""\
+        extends: semver.yml
+        parts:
+            build:
+                value: null
+                prefix: '+'
+                number:
+                    label: 'build'
+                    label-suffix: '.'
+                    start: 1
+    """))
+    project = tmp_path / 'project'
+    project.mkdir()
+    path = project / 'myver.yml'
+    path.write_text(textwrap.dedent("""\
+        extends: ../shared/build.yml
+        parts:
+            major:
+                value: 1
+            minor:
+                value: 2
+            patch:
+                value: 3
+    """))
+    return path
@@ -0,0 +1,77 @@
+import threading
+
+import pytest
+
+from myver import api
+from myver.config import Config
+from myver.error import BumpError
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    api.clear_cache()
+    yield
+    api.clear_cache()
+
+
+def test_current(semver_config):
+    assert api.current(str(semver_config)) == '3.9.2-alpha.1'
+    assert api.current(str(semver_config), ['major', 'minor']) == '3.9'
+    assert api.version(str(semver_config)).value('pre') == 'alpha'
+
+
+def test_bump_and_reset(semver_config):
+    assert api.bump(str(semver_config), ['minor']) == '3.10.0'
+    assert str(Config(str(semver_config)).version) == '3.10.0'
+    assert api.reset(str(semver_config), ['minor']) == '3.0.0'
+    assert api.current(str(semver_config)) == '3.0.0'
+
+
+def test_bump_invalid(semver_config):
+    with pytest.raises(KeyError):
+        api.bump(str(semver_config), ['wrong'])
+    with pytest.raises(BumpError):
+        api.bump(str(semver_config), ['pre=wrong'])
+    assert api.current(str(semver_config)) == '3.9.2-alpha.1'
+
+
+def test_plan(semver_config):
+    assert api.plan(str(semver_config), ['prenum', 'pre', ['minor']]) == [
+        '3.9.2-alpha.2', '3.9.2-beta.1', '3.10.0']
+    assert api.current(str(semver_config)) == '3.9.2-alpha.1'
+
+
+def test_check(sample_config, tmp_path):
+    (tmp_path / 'setup.py').write_text("version='1'")
+    (tmp_path / 'my' / 'path').mkdir(parents=True)
+    (tmp_path / 'my' / 'path' / 'a.md').write_text('MyVer 1')
+    assert api.check(str(sample_config)) == []
+    (tmp_path / 'setup.py').write_text("version='2'")
+    assert api.check(str(sample_config)) == [str(tmp_path / 'setup.py')]
+
+
+def test_cache(semver_config):
+    assert api.service(str(semver_config)) is api.service(str(semver_config))
+    config = Config(str(semver_config))
+    config.version.bump(['major'])
+    config.save()
+    assert api.current(str(semver_config)) == '4.0.0'
+
+
+def test_reloads_extended_config(extended_config):
+    assert api.current(str(extended_config)) == '1.2.3'
+    semver = extended_config.parent.parent / 'shared' / 'semver.yml'
+    semver.write_text(semver.read_text().replace("'.'", "'-'"))
+    assert api.current(str(extended_config)) == '1-2-3'
+
+
+def test_concurrent_bumps(semver_config):
+    threads = [
+        threading.Thread(target=api.bump, args=(str(semver_config), ['build']))
+        for _ in range(20)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert api.current(str(semver_config)) == '3.9.2-alpha.1+build.20'
@@ -0,0 +1,129 @@
+import itertools
+import random
+
+import pytest
+
+from myver.error import BumpError
+from myver.part import IdentifierPart
+from myver.snapshot import VersionSnapshot
+from myver.version import Version
+
+np = pytest.importorskip('numpy')
+from myver.array import VersionArray  # noqa: E402
+
+
+@pytest.fixture
+def snapshots(semver):
+    """A spread of versions reachable by bumping the semver fixture."""
+    rng = random.Random(0)
+    snapshot = VersionSnapshot.from_version(semver)
+    keys = ['major', 'minor', 'patch', 'pre', 'prenum', 'dev', 'pre=rc']
+    found = [snapshot]
+    for _ in range(300):
+        snapshot = rng.choice(found).bump([rng.choice(keys)])
+        found.append(snapshot)
+    return found
+
+
+@pytest.fixture
+def array(snapshots) -> VersionArray:
+    return VersionArray.from_snapshots(snapshots)
+
+
+def test_round_trip(array, snapshots):
+    assert array.snapshots() == snapshots
+    assert array[3] == snapshots[3]
+    assert len(array) == len(snapshots)
+
+
+def test_from_values(semver):
+    snapshot = VersionSnapshot.from_version(semver)
+    array = VersionArray.from_values(snapshot.schema, [snapshot.values])
+    assert array[0] == snapshot
+
+
+@pytest.mark.parametrize('args', [
+    ['prenum'],
+    ['minor'],
+    ['patch', 'dev'],
+    ['patch', 'pre', 'dev'],
+    ['dev'],
+    ['pre'],
+    ['minor', 'pre=rc'],
+    ['prenum=7'],
+])
+def test_bump_matches_snapshots(args, array, snapshots):
+    bumped = array.bump(args)
+    assert bumped.snapshots() == [s.bump(args) for s in snapshots]
+
+
+@pytest.mark.parametrize('keys', [
+    ['prenum'],
+    ['pre'],
+    ['minor'],
+    ['major'],
+    ['dev'],
+])
+def test_reset_matches_snapshots(keys, array, snapshots):
+    reset = array.reset(keys)
+    assert reset.snapshots() == [s.reset(keys) for s in snapshots]
+
+
+def test_bump_invalid_override(array):
+    with pytest.raises(BumpError):
+        array.bump(['pre=wrong'])
+    with pytest.raises(KeyError):
+        array.bump(['bad'])
+
+
+def test_compare_matches_snapshots(array, snapshots):
+    threshold = snapshots[len(snapshots) // 2]
+    assert list(array < threshold) == [s < threshold for s in snapshots]
+    assert list(array >= threshold) == [s >= threshold for s in snapshots]
+    assert list(array == threshold) == [s == threshold for s in snapshots]
+
+
+def test_compare_row_by_row(array, snapshots):
+    other = array.bump(['prenum'])
+    assert list(array < other) == [
+        s < s.bump(['prenum']) for s in snapshots]
+
+
+def test_sorting(array, snapshots):
+    assert array.sort().snapshots() == sorted(snapshots)
+    assert array.min() == min(snapshots)
+    assert array.max() == max(snapshots)
+
+
+def test_between(array, snapshots):
+    lower, upper = sorted(snapshots)[10], sorted(snapshots)[-10]
+    mask = array.between(lower, upper)
+    assert array[mask].snapshots() == [
+        s for s in snapshots if lower <= s < upper]
+
+
+def test_identifier_successors_with_duplicates():
+    version = Version([
+        IdentifierPart(key='one', value='b', strings=['a', 'b', 'a', 'c']),
+    ])
+    snapshot = VersionSnapshot.from_version(version)
+    array = VersionArray.from_snapshots([snapshot])
+    for _ in range(3):
+        snapshot = snapshot.bump(['one'])
+        array = array.bump(['one'])
+        assert array[0] == snapshot
+
+
+def test_empty_array(semver):
+    snapshot = VersionSnapshot.from_version(semver)
+    array = VersionArray.from_snapshots([], schema=snapshot.schema)
+    assert len(array.bump(['minor'])) == 0
+    with pytest.raises(ValueError):
+        array.max()
+
+
+def test_bump_many_steps(array, snapshots):
+    for step in itertools.islice(itertools.cycle(['prenum', 'pre']), 6):
+        array = array.bump([step])
+        snapshots = [s.bump([step]) for s in snapshots]
+    assert array.snapshots() == snapshots
@@ -0,0 +1,105 @@
+import pytest
+
+import myver.auto
+from myver.auto import commit_types, AutoBump, auto_bump, AUTO_CACHE
+from myver.config import Config
+from myver.error import ConfigError, MyverError
+
+RULES = {'breaking': 'major', 'feat': 'minor', 'fix': 'patch'}
+
+
+@pytest.fixture
+def auto_repo(semver_config, git, git_identity):
+    with open(semver_config, 'a') as file:
+        file.write('auto:\n')
+        for commit_type, key in RULES.items():
+            file.write(f'    {commit_type}: {key}\n')
+    repo = semver_config.parent
+    git(repo, 'init', '-q')
+    git(repo, 'commit', '-q', '--allow-empty', '-m', 'feat: before the tag')
+    git(repo, 'tag', '3.9.2-alpha.1')
+    return repo
+
+
+@pytest.fixture
+def scanned(monkeypatch):
+    """Records the revisions that each scan of the history reads."""
+    revisions = []
+    iter_commits = myver.auto.iter_commits
+
+    def record(args, cwd=None):
+        revisions.append(args)
+        return iter_commits(args, cwd)
+    monkeypatch.setattr(myver.auto, 'iter_commits', record)
+    return revisions
+
+
+def commit(git, repo, message):
+    git(repo, 'commit', '-q', '--allow-empty', '-m', message)
+
+
+@pytest.mark.parametrize('message, expected', [
+    ('feat: add a thing', ['feat']),
+    ('Fix(parser): handle spaces', ['fix']),
+    ('feat!: drop the old option', ['feat', 'breaking']),
+    ('refactor: tidy\n\nBREAKING CHANGE: renamed', ['refactor', 'breaking']),
+    ('feat:no space', []),
+    ('Merge branch main', []),
+])
+def test_commit_types(message, expected):
+    assert commit_types(message) == expected
+
+
+def test_auto_bump_scan():
+    auto = AutoBump(RULES, ['major', 'minor', 'patch'])
+    assert auto.top == 'major'
+    assert auto.scan([('a', 'fix: a'), ('b', 'docs: b')]) == ('patch', 2)
+    assert auto.scan([('a', 'fix: a'), ('b', 'feat: b')]) == ('minor', 2)
+    assert auto.scan([('a', 'chore: a')], 'patch') == ('patch', 1)
+    # Stops once nothing could be more significant.
+    assert auto.scan([('a', 'feat!: a'), ('b', 'fix: b')]) == ('major', 1)
+
+
+def test_auto_bump(auto_repo, semver_config, git):
+    commit(git, auto_repo, 'fix: a bug')
+    commit(git, auto_repo, 'docs: words')
+    config = Config(str(semver_config))
+    assert auto_bump(config, cwd=str(auto_repo)) == 'patch'
+
+    commit(git, auto_repo, 'feat(cli): an option')
+    assert auto_bump(config, cwd=str(auto_repo)) == 'minor'
+
+
+def test_auto_bump_nothing_to_bump(auto_repo, semver_config, git):
+    commit(git, auto_repo, 'docs: words')
+    with pytest.raises(MyverError):
+        auto_bump(Config(str(semver_config)), cwd=str(auto_repo))
+
+
+def test_auto_bump_without_rules(sample_config, git_repo):
+    with pytest.raises(ConfigError):
+        auto_bump(Config(str(sample_config)), cwd=str(git_repo))
+
+
+def test_auto_bump_checkpoint(auto_repo, semver_config, git, scanned):
+    cwd = str(auto_repo)
+    config = Config(str(semver_config))
+    commit(git, auto_repo, 'fix: a bug')
+    assert auto_bump(config, cwd=cwd) == 'patch'
+    assert (auto_repo / '.git' / 'myver' / AUTO_CACHE).exists()
+    head = git(auto_repo, 'rev-parse', 'HEAD').strip()
+
+    # Nothing new, so the history is not read again.
+    assert auto_bump(config, cwd=cwd) == 'patch'
+    assert len(scanned) == 1
+
+    # Only the new commits are read.
+    commit(git, auto_repo, 'feat: a thing')
+    assert auto_bump(config, cwd=cwd) == 'minor'
+    assert scanned[-1][-1] == f'^{head}'
+
+    # A rewritten history is read in full.
+    git(auto_repo, 'reset', '-q', '--hard', 'HEAD~2')
+    commit(git, auto_repo, 'fix: another bug')
+    assert auto_bump(config, cwd=cwd) == 'patch'
+    assert not any(revision == f'^{head}' for revision in scanned[-1])
@@ -0,0 +1,121 @@
+import io
+import json
+import os
+import shutil
+
+import pytest
+
+from myver.batch import Batch, run_batch
+from myver.cli import cli_entry
+from myver.config import Config
+from myver.error import MyverError
+
+
+def run(batch, *requests):
+    return list(batch.run(json.dumps(request) for request in requests))
+
+
+def test_batch_requests(semver_config):
+    batch = Batch(str(semver_config))
+    assert run(
+        batch,
+        {'op': 'current'},
+        {'op': 'current', 'keys': ['major', 'minor']},
+        {'op': 'bump', 'args': ['minor'], 'id': 1},
+        {'op': 'reset', 'keys': ['minor']},
+        {'op': 'check'},
+    ) == [
+        {'ok': True, 'version': '3.9.2-alpha.1'},
+        {'ok': True, 'version': '3.9'},
+        {'ok': True, 'old': '3.9.2-alpha.1', 'new': '3.10.0', 'id': 1},
+        {'ok': True, 'old': '3.10.0', 'new': '3.0.0'},
+        {'ok': True, 'version': '3.0.0', 'missing': [], 'report': []},
+    ]
+    assert str(Config(str(semver_config)).version) == '3.0.0'
+    assert batch.failures == 0
+
+
+def test_batch_other_config(semver_config, tmp_path):
+    other = tmp_path / 'other.yml'
+    shutil.copy(semver_config, other)
+    batch = Batch(str(semver_config))
+    responses = run(
+        batch,
+        {'op': 'bump', 'args': ['major'], 'config': str(other)},
+        {'op': 'current'},
+        {'op': 'current', 'config': str(other)},
+    )
+    assert [response.get('version') for response in responses] == [
+        None, '3.9.2-alpha.1', '4.0.0']
+
+
+def test_batch_failures_continue(semver_config, tmp_path):
+    batch = Batch(str(semver_config))
+    responses = run(
+        batch,
+        {'op': 'bump', 'args': ['wrong']},
+        {'op': 'current', 'config': str(tmp_path / 'missing.yml')},
+        {'op': 'nothing'},
+        {'op': 'parse', 'version': '4.0'},
+        {'op': 'parse', 'version': '4.0.1'},
+    )
+    assert [response['ok'] for response in responses] == [
+        False, False, False, False, True]
+    assert batch.failures == 4
+    assert list(batch.run(['', 'not json'])) == [
+        {'ok': False, 'error': 'Invalid request, Expecting value: line 1 '
+                               'column 1 (char 0)'}]
+
+
+def test_batch_check_missing(sample_config, tmp_path):
+    (tmp_path / 'setup.py').write_text("version='1'\nversion='0'\n")
+    batch = Batch(str(sample_config))
+    md = tmp_path / 'my' / 'path' / '*.md'
+    assert run(batch, {'op': 'check'}) == [
+        {'ok': True, 'version': '1',
+         'missing': [str(md)],
+         'report': [f'{md}: no such file']}]
+    md.parent.mkdir(parents=True)
+    (md.parent / 'a.md').write_text('MyVer 0\n')
+    assert run(batch, {'op': 'check'}) == [
+        {'ok': True, 'version': '1',
+         'missing': [str(md.parent / 'a.md')],
+         'report': [f'{md.parent / "a.md"}:1: stale version 0, expected 1']}]
+    assert batch.failures == 2
+
+
+def test_run_batch_file(semver_config, tmp_path, capsys):
+    requests = tmp_path / 'requests.jsonl'
+    requests.write_text('{"op": "current"}\n{"op": "bump", "args": ["x"]}\n')
+    output = io.StringIO()
+    with pytest.raises(MyverError):
+        run_batch(str(requests), str(semver_config), output)
+    lines = output.getvalue().splitlines()
+    assert json.loads(lines[0]) == {'ok': True, 'version': '3.9.2-alpha.1'}
+    assert not json.loads(lines[1])['ok']
+
+
+def test_batch_option(semver_config, monkeypatch, capsys):
+    monkeypatch.setattr('sys.stdin', io.StringIO('{"op": "current"}\n'))
+    cli_entry(['--config', str(semver_config), '--batch'])
+    captured = capsys.readouterr()
+    assert captured.out == '{"version": "3.9.2-alpha.1", "ok": true}\n'
+
+
+def test_batch_relative_paths(tmp_path, monkeypatch):
+    package = tmp_path / 'package'
+    package.mkdir()
+    (package / 'version.txt').write_text('1\n')
+    (tmp_path / 'version.txt').write_text('1\n')
+    config = package / 'myver.yml'
+    config.write_text(
+        "files:\n  - path: 'version.txt'\nparts:\n  major:\n    value: 1\n")
+    monkeypatch.chdir(tmp_path)
+
+    batch = Batch(os.path.join('package', 'myver.yml'))
+    assert run(batch, {'op': 'bump', 'args': ['major']},
+               {'op': 'check'}) == [
+        {'ok': True, 'old': '1', 'new': '2'},
+        {'ok': True, 'version': '2', 'missing': [], 'report': []}]
+    assert (package / 'version.txt').read_text() == '2\n'
+    assert (tmp_path / 'version.txt').read_text() == '1\n'
@@ -0,0 +1,118 @@
+import pytest
+
+from myver.check import Checker, FileCheck, Occurrence, check_files, \
+    file_patterns, format_check, LineIndex
+from myver.config import Config
+from myver.files import FileUpdater
+from myver.parser import VersionParser
+
+
+@pytest.fixture
+def checker(semver) -> Checker:
+    return Checker(str(semver), VersionParser.from_version(semver))
+
+
+def test_check_has_version(checker, tmp_path):
+    path = tmp_path / 'setup.py'
+    path.write_text("name='x'\nversion='3.9.2-alpha.1'\n")
+    assert checker.check(str(path), ["version='{{ version }}'"]) == \
+        FileCheck(str(path), 2, [])
+
+
+def test_check_stale(checker, tmp_path):
+    path = tmp_path / 'setup.py'
+    path.write_text("version='3.9.1'\nother='3.9.0'\n\nversion='3.8.0'\n")
+    result = checker.check(str(path), ["version='{{ version }}'"])
+    assert not result.ok
+    assert result.stale == [Occurrence(1, '3.9.1'), Occurrence(4, '3.8.0')]
+    assert format_check(result, '3.9.2-alpha.1') == [
+        f"{path}:1: stale version 3.9.1, expected 3.9.2-alpha.1",
+        f"{path}:4: stale version 3.8.0, expected 3.9.2-alpha.1",
+    ]
+
+
+def test_check_missing(checker, tmp_path):
+    path = tmp_path / 'setup.py'
+    # The version as plain text, but not within the pattern.
+    path.write_text("3.9.2-alpha.1 and 3.9.1\n")
+    result = checker.check(str(path), ['{{ version }}!'])
+    assert result == FileCheck(str(path), None, [])
+    result = checker.check(str(path), ['{{ version }}'])
+    assert result.ok
+    path.write_text("1.0.0\n")
+    result = checker.check(str(path), ['{{ version }}'])
+    # The default pattern does not look for stale versions.
+    assert result == FileCheck(str(path), None, [])
+    assert format_check(result, '3.9.2-alpha.1') == \
+        [f'{path}: missing version 3.9.2-alpha.1']
+
+
+def test_check_stale_version_twice(checker, tmp_path):
+    path = tmp_path / 'CHANGELOG.md'
+    path.write_text("from 3.9.0 to 3.9.1\n")
+    result = checker.check(str(path), ['from {{ version }} to {{ version }}'])
+    assert result.stale == [Occurrence(1, '3.9.0')]
+
+
+def test_check_invalid_pattern(checker, tmp_path):
+    path = tmp_path / 'setup.py'
+    path.write_text("version='3.9.1'\n")
+    result = checker.check(str(path), ["version='{{ version }}'("])
+    assert not result.ok
+    assert result.error.startswith('invalid pattern')
+
+
+def test_check_unreadable(checker, tmp_path):
+    result = checker.check(str(tmp_path / 'nope'), ['{{ version }}'])
+    assert result.error is not None
+    assert not result.ok
+
+
+def test_file_patterns(tmp_path):
+    (tmp_path / 'a.txt').write_text('')
+    (tmp_path / 'b.txt').write_text('')
+    (tmp_path / 'dir.txt').mkdir()
+    patterns, unmatched = file_patterns([
+        FileUpdater(str(tmp_path / '*.txt'), ['x {{ version }}']),
+        FileUpdater(str(tmp_path / 'a.txt')),
+        FileUpdater(str(tmp_path / 'dir.txt')),
+        FileUpdater(str(tmp_path / '*.md')),
+    ])
+    assert patterns == {
+        str(tmp_path / 'a.txt'): ['x {{ version }}', '{{ version }}'],
+        str(tmp_path / 'b.txt'): ['x {{ version }}'],
+    }
+    assert unmatched == [str(tmp_path / 'dir.txt'), str(tmp_path / '*.md')]
+
+
+def test_check_files(sample_config, tmp_path):
+    (tmp_path / 'setup.py').write_text('1')
+    (tmp_path / 'my' / 'path').mkdir(parents=True)
+    for index in range(20):
+        text = 'MyVer 1' if index % 2 else 'MyVer 0'
+        (tmp_path / 'my' / 'path' / f'{index:02}.md').write_text(text)
+    results = check_files(Config(str(sample_config)), workers=4)
+    assert [result.path for result in results] == sorted(
+        [str(tmp_path / 'setup.py')]
+        + [str(tmp_path / 'my' / 'path' / f'{index:02}.md')
+           for index in range(20)])
+    assert sum(not result.ok for result in results) == 10
+    stale = [result for result in results if result.stale]
+    assert len(stale) == 10
+    assert stale[0].stale == [Occurrence(1, '0')]
+
+
+def test_check_files_missing(sample_config, tmp_path):
+    (tmp_path / 'setup.py').write_text('1')
+    results = check_files(Config(str(sample_config)))
+    missing = FileCheck(str(tmp_path / 'my' / 'path' / '*.md'), None, [],
+                        missing=True)
+    assert results == [missing, FileCheck(str(tmp_path / 'setup.py'), 1, [])]
+    assert not missing.ok
+    assert format_check(missing, '1') == [f'{missing.path}: no such file']
+
+
+def test_line_index():
+    index = LineIndex('a\nb\n\nc')
+    assert [index.line(position) for position in [0, 1, 2, 4, 5]] == \
+        [1, 1, 2, 3, 4]
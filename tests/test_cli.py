@@ -1,3 +1,5 @@
+import json
+import shutil
 import textwrap
 
 import pytest
@@ -11,15 +13,35 @@ def test_help_option(semver_config, capsys):
                '--help'])
     captured = capsys.readouterr()
     assert captured.out == textwrap.dedent('''\
-    Usage: myver [OPTIONS]
+    Usage: myver [OPTIONS] [COMMAND]
+    
+    Commands:
+      check                    Check the files have the current version
+      export                   Write the state values to the config file
+      serve                    Serve version requests over a Unix socket
+      watch                    Report files that drift from the version
     
     Options:
       -h, --help               Show this help message and exit
+          --batch [file]       Run JSON lines requests from a file or stdin
       -b, --bump strings       Bump version parts
+          --commit             Commit the changed files after a bump
           --config string      Config file path
       -c, --current [strings]  Get the current version or version parts
+          --in-place           Only write the changed bytes of each file
+          --latest-tag [min [max]]
+                               Get the git tag with the highest version,
+                               optionally at or above min and below max
+          --poll seconds       Poll for changes when watching
+          --profile [file]     Write a trace of the run to a file
+          --profile-capture {cprofile,tracemalloc}
+                               Also capture a profile or memory usage
+          --tag-prefix string  Prefix of version git tags (e.g. v)
       -r, --reset strings      Reset version parts
-      -v, --verbose            Log more details\n''')
+          --tag                Commit and tag the new version
+          --socket string      Unix socket of the myver server
+      -v, --verbose            Log more details
+          --workspace glob     Run on every config matching a glob\n''')
 
 
 def test_current_option(semver_config, capsys):
@@ -66,3 +88,112 @@ def test_debug_option(semver_config, caplog):
     cli_entry(['--config', str(semver_config.absolute()),
                '--debug'])
     assert 'DEBUG ' in caplog.text
+
+
+def test_latest_tag_option(semver_config, git_repo, git, monkeypatch,
+                           capsys):
+    for tag in ['v3.9.1', 'v3.9.2-alpha.1', 'v4.0.0', 'v3.x']:
+        git(git_repo, 'tag', tag)
+    # The tags are read from the repository of the config, not the one
+    # that myver is run from.
+    monkeypatch.chdir(semver_config.parent)
+    config = str(git_repo / semver_config.name)
+    shutil.copy(semver_config, config)
+
+    cli_entry(['--config', config, '--latest-tag', '--tag-prefix', 'v'])
+    assert capsys.readouterr().out == 'v4.0.0\n'
+
+    cli_entry(['--config', config, '--latest-tag', '3.0.0', '4.0.0',
+               '--tag-prefix', 'v'])
+    assert capsys.readouterr().out == 'v3.9.2-alpha.1\n'
+
+    with pytest.raises(MyverError):
+        cli_entry(['--config', config, '--latest-tag', '5.0.0'])
+
+
+def test_check_command(sample_config, tmp_path, capsys):
+    (tmp_path / 'setup.py').write_text("version='1'")
+    (tmp_path / 'my' / 'path').mkdir(parents=True)
+    (tmp_path / 'my' / 'path' / 'a.md').write_text('MyVer 1')
+    cli_entry(['--config', str(sample_config), 'check'])
+    (tmp_path / 'setup.py').write_text("version='2'")
+    with pytest.raises(MyverError):
+        cli_entry(['--config', str(sample_config), 'check'])
+    captured = capsys.readouterr()
+    assert captured.out == f'{tmp_path / "setup.py"}: missing version 1\n'
+
+
+def test_check_command_no_file(sample_config, tmp_path, capsys):
+    (tmp_path / 'setup.py').write_text("version='1'")
+    with pytest.raises(MyverError):
+        cli_entry(['--config', str(sample_config), 'check'])
+    captured = capsys.readouterr()
+    assert captured.out == f'{tmp_path / "my" / "path" / "*.md"}: ' \
+                           f'no such file\n'
+
+
+@pytest.mark.parametrize('option', ['--commit', '--tag', '--in-place'])
+def test_workspace_option_invalid(semver_config, option):
+    with pytest.raises(MyverError):
+        cli_entry(['--workspace', str(semver_config), '-b', 'major', option])
+    assert 'value: 3' in semver_config.read_text()
+
+
+def test_workspace_option(semver_config, capsys):
+    cli_entry(['--workspace', str(semver_config), '-c', 'major'])
+    captured = capsys.readouterr()
+    assert json.loads(captured.out) == {
+        'config': str(semver_config),
+        'ok': True,
+        'responses': [{'version': '3', 'ok': True}],
+    }
+
+
+def test_profile_option(sample_config, tmp_path, capsys):
+    (tmp_path / 'setup.py').write_text("version='1'")
+    trace_path = tmp_path / 'trace.json'
+    cli_entry(['--config', str(sample_config), '--bump', 'core',
+               '--profile', str(trace_path)])
+    assert capsys.readouterr().out == '1  >>  2\n'
+    events = json.loads(trace_path.read_text())['traceEvents']
+    names = {event['name'] for event in events}
+    assert {'parse args', 'run', 'load config', 'load yaml',
+            'validate version', 'bump', 'save config', 'update files',
+            'expand glob', 'update file'} <= names
+
+
+def test_tag_option(semver_config, git, git_identity, capsys):
+    repo = semver_config.parent
+    git(repo, 'init', '-q')
+    git(repo, 'add', semver_config.name)
+    git(repo, 'commit', '-q', '-m', 'initial')
+    cli_entry(['--config', str(semver_config), '--bump', 'minor', '--tag',
+               '--tag-prefix', 'v'])
+    assert capsys.readouterr().out == '3.9.2-alpha.1  >>  3.10.0\n'
+    assert git(repo, 'log', '-1', '--format=%s').strip() == \
+        'Bump version 3.9.2-alpha.1 to 3.10.0'
+    assert git(repo, 'cat-file', '-t', 'v3.10.0').strip() == 'tag'
+    assert git(repo, 'status', '--porcelain') == ''
+
+
+def test_commit_option_without_bump(semver_config):
+    with pytest.raises(MyverError):
+        cli_entry(['--config', str(semver_config), '--commit'])
+
+
+def test_bump_auto_option(semver_config, git, git_identity, capsys):
+    with open(semver_config, 'a') as file:
+        file.write('auto:\n    feat: minor\n    fix: patch\n')
+    repo = semver_config.parent
+    git(repo, 'init', '-q')
+    git(repo, 'commit', '-q', '--allow-empty', '-m', 'feat: a thing')
+    cli_entry(['--config', str(semver_config), '--bump', 'auto'])
+    assert capsys.readouterr().out == '3.9.2-alpha.1  >>  3.10.0\n'
+
+
+def test_in_place_option(sample_config, tmp_path, capsys):
+    (tmp_path / 'setup.py').write_text("version='1'")
+    cli_entry(['--config', str(sample_config), '--bump', 'core',
+               '--in-place'])
+    assert capsys.readouterr().out == '1  >>  2\n'
+    assert (tmp_path / 'setup.py').read_text() == "version='2'"
@@ -4,6 +4,8 @@ import pytest
 
 from myver.config import (
     part_from_dict, version_from_dict, dict_from_yaml, files_from_dict, Config,
+    load_version, read_parts_section, auto_from_dict, load_read_only,
+    resolve_config, merge_dicts,
 )
 from myver.error import ConfigError
 from myver.files import FileUpdater
@@ -304,6 +306,27 @@ def test_files_from_dict_missing_requires_attribute():
         ]})
 
 
+def test_load_read_only(sample_config, semver_config):
+    for path in [sample_config, semver_config]:
+        config = load_read_only(str(path))
+        full = Config(str(path))
+        assert config.files == full.files
+        assert str(config.version) == str(full.version)
+
+
+def test_auto_from_dict(semver):
+    auto = auto_from_dict({'auto': {'Feat': 'minor', 'fix': 'patch'}},
+                          semver)
+    assert auto == {'feat': 'minor', 'fix': 'patch'}
+    assert auto_from_dict({}, semver) == {}
+
+
+@pytest.mark.parametrize('auto', [{'feat': 'nope'}, ['feat']])
+def test_auto_from_dict_invalid(semver, auto):
+    with pytest.raises(ConfigError):
+        auto_from_dict({'auto': auto}, semver)
+
+
 def test_update_files(tmp_path, sample_config):
     with open(tmp_path / 'setup.py', 'w') as file:
         file.write('1')
@@ -315,3 +338,167 @@ def test_update_files(tmp_path, sample_config):
 
     with open(tmp_path / 'setup.py', 'r') as file:
         assert file.readlines()[0] == '2.2'
+
+
+def test_load_version(sample_config, semver_config):
+    assert load_version(str(sample_config)) == Config(
+        str(sample_config)).version
+    assert load_version(str(semver_config)) == Config(
+        str(semver_config)).version
+
+
+def test_load_version_ignores_files(tmp_path):
+    path = tmp_path / 'config.yml'
+    path.write_text(textwrap.dedent("""\
+        files:
+            - patterns: [ 'missing path' ]
+        parts:
+            major:
+                value: 2
+    """))
+    assert str(load_version(str(path))) == '2'
+    with pytest.raises(ConfigError):
+        Config(str(path))
+
+
+def test_load_version_falls_back_to_full_file(tmp_path):
+    path = tmp_path / 'config.yml'
+    path.write_text(textwrap.dedent("""\
+        defaults: &minor
+            value: 4
+            prefix: '.'
+        parts:
+            major:
+                value: 2
+                requires: minor
+            minor: *minor
+    """))
+    assert str(load_version(str(path))) == '2.4'
+
+
+def test_read_parts_section(sample_config):
+    section = read_parts_section(str(sample_config))
+    assert section.startswith('parts:')
+    assert 'files' not in section
+
+
+def test_extends(extended_config):
+    shared = extended_config.parent.parent / 'shared'
+    config = Config(str(extended_config))
+    assert str(config.version) == '1.2.3'
+    assert [part.key for part in config.version.parts] == [
+        'major', 'minor', 'patch', 'build']
+    assert config.includes == [str(shared / 'build.yml'),
+                               str(shared / 'semver.yml')]
+    assert load_version(str(extended_config)) == config.version
+    read_only = load_read_only(str(extended_config))
+    assert read_only.version == config.version
+    assert read_only.includes == config.includes
+    assert read_parts_section(str(extended_config)).startswith('extends:')
+
+
+def test_extends_save_writes_local_file(extended_config):
+    shared = extended_config.parent.parent / 'shared'
+    shared_text = (shared / 'semver.yml').read_text()
+    config = Config(str(extended_config))
+    config.version.bump(['patch'])
+    config.save()
+    assert str(Config(str(extended_config)).version) == '1.2.4'
+    assert (shared / 'semver.yml').read_text() == shared_text
+
+
+def test_extends_save_inherited_value(extended_config):
+    shared = extended_config.parent.parent / 'shared'
+    shared_text = (shared / 'build.yml').read_text()
+    config = Config(str(extended_config))
+    config.version.bump(['build'])
+    config.save()
+    assert extended_config.read_text() == textwrap.dedent("""\
+        extends: ../shared/build.yml
+        parts:
+            build:
+                value: 1
+            major:
+                value: 1
+            minor:
+                value: 2
+            patch:
+                value: 3
+    """)
+    assert (shared / 'build.yml').read_text() == shared_text
+    config = Config(str(extended_config))
+    assert str(config.version) == '1.2.3+build.1'
+    assert [part.key for part in config.version.parts] == [
+        'major', 'minor', 'patch', 'build']
+    assert load_version(str(extended_config)) == config.version
+
+    config.version.bump(['build'])
+    config.save()
+    assert str(Config(str(extended_config)).version) == '1.2.3+build.2'
+
+
+@pytest.mark.parametrize('text, expected', [
+    ('extends: base.yml\n',
+     'extends: base.yml\nparts:\n  build:\n    value: 1\n'),
+    ('extends: base.yml\nparts:\n  major:\n    value: 2\n',
+     'extends: base.yml\nparts:\n  build:\n    value: 1\n'
+     '  major:\n    value: 2\n'),
+    ('extends: base.yml\nparts:\n  build:\n    prefix: \'-\'\n',
+     'extends: base.yml\nparts:\n  build:\n    value: 1\n'
+     '    prefix: \'-\'\n'),
+])
+def test_extends_save_inherited_value_layouts(tmp_path, text, expected):
+    (tmp_path / 'base.yml').write_text(
+        'parts:\n  major:\n    value: 0\n    requires: build\n'
+        '  build:\n    value: null\n    number:\n      start: 1\n')
+    path = tmp_path / 'myver.yml'
+    path.write_text(text)
+    config = Config(str(path))
+    config.version.bump(['build'])
+    config.save()
+    assert path.read_text() == expected
+    assert Config(str(path)).version.part('build').value == 1
+
+
+def test_resolve_config_cache(extended_config, monkeypatch):
+    assert resolve_config(str(extended_config)).config_dict['parts'][
+        'patch']['prefix'] == '.'
+
+    def fail(*args):
+        raise AssertionError('parsed a cached config')
+
+    with monkeypatch.context() as patch:
+        patch.setattr('myver.config.plain_dict_from_yaml', fail)
+        resolved = resolve_config(str(extended_config))
+    assert resolved.config_dict['parts']['patch']['value'] == 3
+    assert len(resolved.includes) == 2
+
+    semver = extended_config.parent.parent / 'shared' / 'semver.yml'
+    semver.write_text(semver.read_text().replace("'.'", "'-'"))
+    assert str(Config(str(extended_config)).version) == '1-2-3'
+
+
+def test_resolve_config_cycle(tmp_path):
+    (tmp_path / 'a.yml').write_text('extends: b.yml\n')
+    (tmp_path / 'b.yml').write_text('extends: a.yml\n')
+    with pytest.raises(ConfigError):
+        resolve_config(str(tmp_path / 'a.yml'))
+
+
+def test_resolve_config_missing_file(tmp_path):
+    (tmp_path / 'a.yml').write_text('extends: [ missing.yml ]\n')
+    with pytest.raises(ConfigError):
+        Config(str(tmp_path / 'a.yml'))
+
+
+def test_merge_dicts():
+    base = {'parts': {'major': {'value': 0, 'prefix': 'v'}},
+            'files': [{'path': 'a'}]}
+    override = {'parts': {'major': {'value': 2}, 'minor': {'value': 1}},
+                'files': [{'path': 'b'}]}
+    assert merge_dicts(base, override) == {
+        'parts': {'major': {'value': 2, 'prefix': 'v'},
+                  'minor': {'value': 1}},
+        'files': [{'path': 'b'}],
+    }
+    assert base['parts']['major']['value'] == 0
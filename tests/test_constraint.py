@@ -0,0 +1,95 @@
+import pytest
+
+from myver.constraint import Constraint, compile_constraint
+from myver.error import ParseError
+from myver.parser import VersionParser
+from myver.part import NumberPart, IdentifierPart
+from myver.version import Version
+
+VERSIONS = [
+    '1.0.0',
+    '1.2.0-alpha.1',
+    '1.2.0',
+    '1.4.0',
+    '1.4.3-rc.1',
+    '1.4.3',
+    '1.10.0',
+    '2.0.0-alpha.1',
+    '2.0.0',
+]
+
+
+@pytest.fixture
+def parser(semver) -> VersionParser:
+    return VersionParser.from_version(semver)
+
+
+@pytest.mark.parametrize('expression, expected', [
+    ('>=1.2.0,<2.0.0-alpha.1,!=1.4.*', ['1.2.0', '1.10.0']),
+    (' >=1.2.0, <2.0.0-alpha.1, !=1.4.* ', ['1.2.0', '1.10.0']),
+    ('<2.0.0', VERSIONS[:8]),
+    ('<=2.0.0-alpha.1', VERSIONS[:8]),
+    ('>1.4.3-rc.1', ['1.4.3', '1.10.0', '2.0.0-alpha.1', '2.0.0']),
+    ('==1.4.*', ['1.4.0', '1.4.3-rc.1', '1.4.3']),
+    ('==1.4.3-*', ['1.4.3-rc.1', '1.4.3']),
+    ('1.2.0', ['1.2.0']),
+    ('!=1.*', ['2.0.0-alpha.1', '2.0.0']),
+    ('==*', VERSIONS),
+])
+def test_constraint(expression, expected, parser):
+    constraint = Constraint(expression, parser)
+    snapshots = [parser.parse(version) for version in VERSIONS]
+    assert [str(s) for s in constraint.filter(snapshots)] == expected
+    assert [constraint(s) for s in snapshots] == [
+        v in expected for v in VERSIONS]
+    assert constraint.matches_strings(VERSIONS + ['bad']) == [
+        v in expected for v in VERSIONS] + [False]
+
+
+@pytest.mark.parametrize('expression', [
+    '>=1.2.0,',
+    '>=',
+    '>=1.2',
+    '>=1.*',
+    '~1.2.0',
+    '==x.*',
+])
+def test_invalid_constraint(expression, parser):
+    with pytest.raises(ParseError):
+        Constraint(expression, parser)
+
+
+def test_constraint_custom_identifier_order():
+    version = Version([
+        NumberPart(key='major', value=1),
+        IdentifierPart(key='channel', value=None, prefix='-',
+                       strings=['nightly', 'beta', 'stable']),
+    ])
+    parser = VersionParser.from_version(version)
+    constraint = Constraint('>=1-beta', parser)
+    assert constraint.matches_strings(['1-nightly', '1-beta', '1-stable',
+                                       '1']) == [False, True, True, True]
+
+
+def test_constraint_version(semver, parser):
+    assert Constraint('>=3.9.2-alpha.1,<3.9.2', parser)(semver)
+    semver.bump(['patch'])
+    assert not Constraint('>=3.9.2-alpha.1,<3.9.2', parser)(semver)
+
+
+def test_compile_constraint_is_cached(parser):
+    assert compile_constraint('>=1.0.0', parser) \
+        is compile_constraint('>=1.0.0', parser)
+
+
+def test_constraint_mask(parser):
+    np = pytest.importorskip('numpy')
+    from myver.array import VersionArray
+    array = VersionArray.from_snapshots(
+        [parser.parse(version) for version in VERSIONS])
+    for expression in ['>=1.2.0,<2.0.0,!=1.4.*', '==1.4.*', '>1.4.3-rc.1',
+                       '!=1.*', '<=2.0.0-alpha.1']:
+        constraint = Constraint(expression, parser)
+        assert list(constraint.mask(array)) == \
+            constraint.matches_strings(VERSIONS)
+    assert isinstance(constraint.mask(array), np.ndarray)
@@ -1,9 +1,11 @@
+import os
 import textwrap
 from pathlib import Path
 
 import pytest
 
-from myver.files import FileUpdater
+from myver.files import FileUpdater, group_targets, update_files, \
+    update_data, patch_file, write_journal, journal_path, recover_journal
 
 
 @pytest.fixture
@@ -43,3 +45,104 @@ def test_file_updater_update_with_pattern(updating_file):
             We are currently at version 2.2, although we want to get to 3.8
             soon. We depend on Something 1.0. Support OurProject 2.2!
         """)
+
+
+def test_file_updater_update_repeated_version(tmp_path):
+    path = tmp_path / 'repeated.md'
+    path.write_text('1.0 and 1.0\n')
+    FileUpdater(path=str(path)).update('1.0', '1.0.1')
+    assert path.read_text() == '1.0.1 and 1.0.1\n'
+
+
+def test_update_files_overlapping_globs(tmp_path):
+    path = tmp_path / 'setup.py'
+    path.write_text("version='1.0'\nother 1.0\n")
+    written = update_files([
+        FileUpdater(str(tmp_path / '*.py')),
+        FileUpdater(str(path), ["version='{{ version }}'"]),
+    ], '1.0', '1.0.1')
+    # Updated once, a second update would change `1.0.1` to `1.0.1.1`.
+    assert path.read_text() == "version='1.0.1'\nother 1.0.1\n"
+    assert written == [str(path)]
+
+
+def test_update_files_links(tmp_path):
+    path = tmp_path / 'version.txt'
+    path.write_text('1.0\n')
+    os.link(path, tmp_path / 'hard.txt')
+    (tmp_path / 'soft.txt').symlink_to(path)
+    updaters = [FileUpdater(str(tmp_path / name))
+                for name in ['version.txt', 'hard.txt', 'soft.txt']]
+    targets = group_targets(updaters)
+    assert len(targets) == 1
+    assert targets[0].paths == [str(tmp_path / name) for name in
+                                ['version.txt', 'hard.txt', 'soft.txt']]
+
+    written = update_files(updaters, '1.0', '1.0.1')
+    assert path.read_text() == '1.0.1\n'
+    assert (tmp_path / 'hard.txt').samefile(path)
+    assert len(written) == 3
+
+
+@pytest.mark.parametrize('data, patterns', [
+    ('version 1.0.0\nother 1.0.0 and 1.0.0\n', ['{{ version }}']),
+    ('version 1.0.0\nother 1.0.0\n', ['version {{ version }}']),
+    ('a 1.0.0 b 1.0.0\n1.0.0 c', ['a {{ version }}', '{{ version }} c']),
+    ('résumé 1.0.0 ünïcode\n', ['é {{ version }}']),
+    ('', ['{{ version }}']),
+])
+def test_patch_file_same_as_rewrite(tmp_path, data, patterns):
+    path = tmp_path / 'file.txt'
+    path.write_bytes(data.encode())
+    patched = patch_file(str(path), patterns, '1.0.0', '1.0.1')
+    expected = update_data(data, patterns, '1.0.0', '1.0.1')
+    assert path.read_bytes().decode() == expected
+    assert patched == (expected != data)
+    assert not (tmp_path / '.file.txt.myver-journal').exists()
+
+
+def test_patch_file_different_length(tmp_path):
+    path = tmp_path / 'file.txt'
+    path.write_text('version 1.9\n')
+    assert patch_file(str(path), ['{{ version }}'], '1.9', '1.10')
+    assert path.read_text() == 'version 1.10\n'
+
+
+def test_patch_file_keeps_links(tmp_path):
+    path = tmp_path / 'file.txt'
+    path.write_text('version 1.0.0\n')
+    os.link(path, tmp_path / 'link.txt')
+    inode = path.stat().st_ino
+    patch_file(str(tmp_path / 'link.txt'), ['{{ version }}'], '1.0.0',
+               '1.0.1')
+    assert path.stat().st_ino == inode
+    assert path.read_text() == 'version 1.0.1\n'
+
+
+def test_recover_journal(tmp_path):
+    path = tmp_path / 'file.txt'
+    # Interrupted after the first of two positions was patched.
+    path.write_text('1.0.1 and 1.0.0\n')
+    write_journal(str(path), '1.0.0', '1.0.1', [0, 10])
+    assert recover_journal(str(path))
+    assert path.read_text() == '1.0.1 and 1.0.1\n'
+    assert not os.path.exists(journal_path(str(path)))
+    assert not recover_journal(str(path))
+
+
+def test_recover_journal_changed_file(tmp_path):
+    path = tmp_path / 'file.txt'
+    path.write_text('edited by hand\n')
+    write_journal(str(path), '1.0.0', '1.0.1', [0])
+    assert not recover_journal(str(path))
+    assert path.read_text() == 'edited by hand\n'
+    assert os.path.exists(journal_path(str(path)))
+
+
+def test_update_files_recovers_journal(tmp_path):
+    path = tmp_path / 'file.txt'
+    path.write_text('1.0.0 and 1.0.0\n')
+    write_journal(str(path), '1.0.0', '1.0.1', [0, 10])
+    update_files([FileUpdater(str(tmp_path / '*.txt'))], '1.0.1', '1.0.2',
+                 in_place=True)
+    assert path.read_text() == '1.0.2 and 1.0.2\n'
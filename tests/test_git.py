@@ -0,0 +1,124 @@
+import os
+
+import pytest
+
+from myver.error import GitError
+from myver.git import version_tags, latest_tag, iter_tags, TAGS_CACHE, \
+    commit_files, create_tag, head_commit
+from myver.parser import VersionParser
+
+
+@pytest.fixture
+def parser(semver) -> VersionParser:
+    return VersionParser.from_version(semver)
+
+
+@pytest.fixture
+def tagged_repo(git_repo, git):
+    for tag in ['1.0.0', '1.2.0-rc.1', '1.2.0', '1.10.0-alpha.1',
+                'not-a-version', 'v2.0.0']:
+        git(git_repo, 'tag', tag)
+    return git_repo
+
+
+def test_iter_tags(tagged_repo):
+    assert sorted(iter_tags(str(tagged_repo))) == sorted([
+        '1.0.0', '1.2.0-rc.1', '1.2.0', '1.10.0-alpha.1', 'not-a-version',
+        'v2.0.0'])
+
+
+def test_iter_tags_not_a_repo(tmp_path):
+    with pytest.raises(GitError):
+        list(iter_tags(str(tmp_path)))
+
+
+def test_version_tags(tagged_repo, parser):
+    tags = dict(version_tags(parser, cwd=str(tagged_repo)))
+    assert sorted(tags) == ['1.0.0', '1.10.0-alpha.1', '1.2.0', '1.2.0-rc.1']
+    assert tags['1.2.0-rc.1'].values == (1, 2, 0, 'rc', 1, None)
+
+
+def test_version_tags_prefix(tagged_repo, parser):
+    tags = version_tags(parser, tag_prefix='v', cwd=str(tagged_repo))
+    assert [tag for tag, _ in tags] == ['v2.0.0']
+
+
+def test_latest_tag(tagged_repo, parser):
+    cwd = str(tagged_repo)
+    assert latest_tag(parser, cwd=cwd)[0] == '1.10.0-alpha.1'
+    lower = parser.parse('1.1.0')
+    upper = parser.parse('1.10.0-alpha.1')
+    assert latest_tag(parser, lower, upper, cwd=cwd)[0] == '1.2.0'
+    assert latest_tag(parser, upper=parser.parse('1.2.0'), cwd=cwd)[0] \
+        == '1.2.0-rc.1'
+    assert latest_tag(parser, lower=parser.parse('3.0.0'), cwd=cwd) is None
+
+
+def test_latest_tag_cache(tagged_repo, parser, git):
+    cwd = str(tagged_repo)
+    assert latest_tag(parser, cwd=cwd)[0] == '1.10.0-alpha.1'
+    assert os.path.exists(tagged_repo / '.git' / 'myver' / TAGS_CACHE)
+
+    git(tagged_repo, 'tag', '1.11.0')
+    assert latest_tag(parser, cwd=cwd)[0] == '1.11.0'
+
+    git(tagged_repo, 'pack-refs', '--all')
+    assert latest_tag(parser, cwd=cwd)[0] == '1.11.0'
+
+    git(tagged_repo, 'tag', '-d', '1.11.0')
+    assert latest_tag(parser, cwd=cwd)[0] == '1.10.0-alpha.1'
+
+
+def test_latest_tag_cache_layout(git_repo, git, semver):
+    cwd = str(git_repo)
+    for tag in ['1.0.0-alpha.1', '1.0.0-rc.1']:
+        git(git_repo, 'tag', tag)
+    assert latest_tag(VersionParser.from_version(semver), cwd=cwd)[0] == \
+        '1.0.0-rc.1'
+
+    semver.part('pre').strings = ['rc', 'beta', 'alpha']
+    assert latest_tag(VersionParser.from_version(semver), cwd=cwd)[0] == \
+        '1.0.0-alpha.1'
+
+
+def test_commit_files(git_repo, git, git_identity):
+    cwd = str(git_repo)
+    parent = head_commit(cwd)
+    (git_repo / 'a.txt').write_text('a')
+    (git_repo / 'sub').mkdir()
+    (git_repo / 'sub' / 'b.txt').write_text('b')
+    (git_repo / 'untracked.txt').write_text('c')
+
+    commit = commit_files(
+        [str(git_repo / 'a.txt'), 'sub/b.txt'], 'Bump\n\nDetails', cwd)
+    assert head_commit(cwd) == commit
+    assert git(git_repo, 'rev-parse', 'HEAD~').strip() == parent
+    assert git(git_repo, 'log', '-1', '--format=%B').strip() == \
+        'Bump\n\nDetails'
+    assert git(git_repo, 'show', '--name-only', '--format=', 'HEAD') \
+        .split() == ['a.txt', 'sub/b.txt']
+    assert git(git_repo, 'status', '--porcelain').strip() == \
+        '?? untracked.txt'
+
+
+def test_commit_files_first_commit(tmp_path, git, git_identity):
+    git(tmp_path, 'init', '-q')
+    (tmp_path / 'a.txt').write_text('a')
+    commit = commit_files(['a.txt'], 'First', str(tmp_path))
+    assert head_commit(str(tmp_path)) == commit
+
+
+def test_commit_files_not_a_repo(tmp_path):
+    (tmp_path / 'a.txt').write_text('a')
+    with pytest.raises(GitError):
+        commit_files(['a.txt'], 'Bump', str(tmp_path))
+
+
+def test_create_tag(git_repo, git, git_identity):
+    cwd = str(git_repo)
+    create_tag('v1.0.0', 'Version 1.0.0', cwd=cwd)
+    assert git(git_repo, 'cat-file', '-t', 'v1.0.0').strip() == 'tag'
+    assert git(git_repo, 'rev-parse', 'v1.0.0^{}').strip() == \
+        head_commit(cwd)
+    with pytest.raises(GitError):
+        create_tag('v1.0.0', 'Version 1.0.0', cwd=cwd)
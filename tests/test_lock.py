@@ -0,0 +1,75 @@
+import fcntl
+import os
+import subprocess
+import sys
+import textwrap
+
+import pytest
+
+from myver.config import Config
+from myver.error import LockError
+from myver.lock import lock_file
+
+PROCESSES = 8
+BUMPS = 10
+
+
+@pytest.fixture
+def counter_config(tmp_path):
+    path = tmp_path / 'myver.yml'
+    path.write_text(textwrap.dedent("""\
+        files:
+            - path: 'version.txt'
+        parts:
+            core:
+                value: 0
+    """))
+    (tmp_path / 'version.txt').write_text('0\n')
+    return path
+
+
+def test_lock_file_held(tmp_path):
+    path = tmp_path / 'file'
+    path.write_text('')
+    with open(path) as file:
+        fcntl.flock(file, fcntl.LOCK_EX)
+        with pytest.raises(LockError):
+            with lock_file(str(path), attempts=3):
+                pass
+    with lock_file(str(path), attempts=1):
+        pass
+
+
+def test_lock_applies_change_to_latest_version(counter_config):
+    first = Config(str(counter_config))
+    second = Config(str(counter_config))
+    with first.lock():
+        first.version.bump(['core'])
+        first.save()
+    with second.lock():
+        assert str(second.version) == '1'
+        second.version.bump(['core'])
+        second.save()
+    assert str(Config(str(counter_config)).version) == '2'
+
+
+def test_concurrent_bumps(counter_config):
+    script = textwrap.dedent(f"""\
+        from myver.cli import cli_entry
+        for _ in range({BUMPS}):
+            cli_entry(['--config', 'myver.yml', '--bump', 'core'])
+    """)
+    env = dict(os.environ, PYTHONPATH=os.getcwd())
+    processes = [
+        subprocess.Popen([sys.executable, '-c', script],
+                         cwd=counter_config.parent, env=env,
+                         stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+        for _ in range(PROCESSES)
+    ]
+    for process in processes:
+        _, error = process.communicate()
+        assert process.returncode == 0, error.decode()
+
+    total = PROCESSES * BUMPS
+    assert str(Config(str(counter_config)).version) == str(total)
+    assert (counter_config.parent / 'version.txt').read_text() == f'{total}\n'
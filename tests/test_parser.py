@@ -0,0 +1,89 @@
+import itertools
+
+import pytest
+
+from myver.error import ParseError
+from myver.parser import VersionParser
+from myver.part import NumberPart, IdentifierPart
+from myver.snapshot import VersionSnapshot
+from myver.version import Version
+
+
+@pytest.fixture
+def parser(semver) -> VersionParser:
+    return VersionParser.from_version(semver)
+
+
+def test_parse(parser):
+    snapshot = parser.parse('3.9.2-alpha.1')
+    assert snapshot.values == (3, 9, 2, 'alpha', 1, None)
+
+
+def test_parse_show_start(parser):
+    assert parser.parse('3.9.2+dev').values == (3, 9, 2, None, None, 1)
+    assert parser.parse('3.9.2+dev.4').values == (3, 9, 2, None, None, 4)
+
+
+@pytest.mark.parametrize('string', [
+    '',
+    '3',
+    '3.9',
+    'v3.9.2',
+    '3.9.2 ',
+    '3.09.2',
+    '3.9.2-alpha',
+    '3.9.2-gamma.1',
+    '3.9.2+dev.1',
+])
+def test_parse_invalid(string, parser):
+    assert parser.match(string) is None
+    with pytest.raises(ParseError):
+        parser.parse(string)
+
+
+def test_parse_round_trip(semver, parser):
+    """Every version reachable by bumping must parse back to itself."""
+    snapshot = VersionSnapshot.from_version(semver)
+    steps = [
+        ['major'], ['minor'], ['patch'], ['pre'], ['prenum'], ['dev'],
+        ['patch', 'pre'], ['patch', 'dev'], ['pre=rc'], ['prenum=0'],
+    ]
+    seen = set()
+    for plan in itertools.product(steps, repeat=3):
+        for bumped in snapshot.plan(plan):
+            if bumped in seen:
+                continue
+            seen.add(bumped)
+            parsed = parser.parse(str(bumped))
+            assert parsed == bumped
+            assert str(parsed) == str(bumped)
+    assert len(seen) > 50
+
+
+def test_parse_many(parser):
+    strings = ['3.9.2', 'bad', '4.0.0-rc.2']
+    snapshots = parser.parse_many(strings)
+    assert [str(s) if s else None for s in snapshots] == [
+        '3.9.2', None, '4.0.0-rc.2']
+
+
+def test_parse_identifier_strings_sharing_a_start():
+    version = Version([
+        NumberPart(key='major', value=1),
+        IdentifierPart(key='pre', value=None, strings=['a', 'ab', 'abc']),
+        NumberPart(key='num', value=None),
+    ])
+    parser = VersionParser.from_version(version)
+    assert parser.parse('1abc').values == (1, 'abc', None)
+    assert parser.parse('1ab2').values == (1, 'ab', 2)
+
+
+def test_parse_large_identifier_strings():
+    strings = [f'codename{i}' for i in range(10_000)]
+    version = Version([
+        IdentifierPart(key='codename', value='codename0', strings=strings),
+        NumberPart(key='build', value=0, prefix='-'),
+    ])
+    parser = VersionParser.from_version(version)
+    assert parser.parse('codename9999-4').values == ('codename9999', 4)
+    assert parser.match('codename10000-4') is None
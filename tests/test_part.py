@@ -238,3 +238,87 @@ def test_number_set_negative_start():
             key='one',
             value=None,
             start=-1)
+
+
+def test_identifier_part_bump_large_strings():
+    strings = [f'codename{i}' for i in range(10_000)]
+    part = IdentifierPart(
+        key='one',
+        value='codename9998',
+        strings=strings)
+    part.bump()
+    assert part.value == 'codename9999'
+    part.bump()
+    assert part.value is None
+
+
+def test_identifier_part_index():
+    part = IdentifierPart(
+        key='one',
+        value=None,
+        strings=['alpha', 'beta', 'rc'])
+    assert part.index('alpha') == 0
+    assert part.index('rc') == 2
+    with pytest.raises(ValueError):
+        part.index('bad')
+
+
+def test_identifier_part_set_strings_reindexes():
+    part = IdentifierPart(
+        key='one',
+        value='beta',
+        strings=['alpha', 'beta', 'rc'])
+    part.strings = ['beta', 'gamma']
+    assert part.index('gamma') == 1
+    part.bump()
+    assert part.value == 'gamma'
+    with pytest.raises(ConfigError):
+        part.start = 'alpha'
+
+
+def test_identifier_part_duplicate_strings():
+    part = IdentifierPart(
+        key='one',
+        value='beta',
+        strings=['alpha', 'beta', 'rc', 'beta'])
+    assert part.index('beta') == 1
+    part.bump()
+    assert part.value == 'rc'
+
+
+def test_parts_use_slots():
+    number = NumberPart(key='one', value=5)
+    identifier = IdentifierPart(key='two', value=None, strings=['alpha'])
+    assert not hasattr(number, '__dict__')
+    assert not hasattr(identifier, '__dict__')
+
+
+def test_identifier_parts_share_string_tables():
+    part1 = IdentifierPart(
+        key='one',
+        value=None,
+        strings=['alpha', 'beta', 'rc'])
+    part2 = IdentifierPart(
+        key='two',
+        value=None,
+        strings=['alpha', 'beta', 'rc'])
+    assert part1._successors is part2._successors
+
+
+def test_identifier_part_sort_value():
+    part = IdentifierPart(
+        key='one',
+        value=None,
+        strings=['alpha', 'beta', 'rc'])
+    assert part.sort_value('alpha') < part.sort_value('rc')
+    assert part.sort_value('rc') < part.sort_value(None)
+    with pytest.raises(ValueError):
+        part.sort_value('bad')
+
+
+def test_number_part_sort_value():
+    part = NumberPart(
+        key='one',
+        value=None)
+    assert part.sort_value(None) < part.sort_value(0)
+    assert part.sort_value(2) < part.sort_value(10)
@@ -0,0 +1,124 @@
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from myver import client
+from myver.client import Client
+from myver.config import Config
+from myver.error import MyverError
+from myver.server import VersionServer
+
+
+@pytest.fixture
+def server(semver_config):
+    socket_path = f'{semver_config}.sock'
+    server = VersionServer(socket_path, str(semver_config))
+    thread = threading.Thread(
+        target=server.serve_forever, args=(0.01,), daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+    thread.join()
+
+
+@pytest.fixture
+def connection(server):
+    with Client(server.server_address) as connection:
+        yield connection
+
+
+def test_current(connection):
+    assert connection.current() == '3.9.2-alpha.1'
+    assert connection.current(['major', 'minor']) == '3.9'
+
+
+def test_current_invalid_key(connection):
+    with pytest.raises(MyverError) as error:
+        connection.current(['major', 'wrong'])
+    assert error.value.message == 'Invalid part key `wrong`'
+
+
+def test_parse(connection):
+    assert connection.parse('4.0.0-rc.2') == {
+        'major': 4, 'minor': 0, 'patch': 0, 'pre': 'rc', 'prenum': 2,
+        'build': None, 'dev': None,
+    }
+    with pytest.raises(MyverError):
+        connection.parse('4.0')
+
+
+def test_bump_saves_config(semver_config, connection):
+    assert connection.bump(['minor']) == {
+        'ok': True, 'old': '3.9.2-alpha.1', 'new': '3.10.0'}
+    assert connection.current() == '3.10.0'
+    assert str(Config(str(semver_config)).version) == '3.10.0'
+
+
+def test_reset(connection):
+    assert connection.reset(['pre'])['new'] == '3.9.2'
+
+
+def test_failed_bump_keeps_version(semver_config, connection):
+    with pytest.raises(MyverError):
+        connection.bump(['wrong'])
+    assert connection.current() == '3.9.2-alpha.1'
+    assert str(Config(str(semver_config)).version) == '3.9.2-alpha.1'
+
+
+def test_unknown_op(connection):
+    with pytest.raises(MyverError):
+        connection.request('nothing')
+
+
+def test_reloads_changed_config(semver_config, connection):
+    assert connection.current() == '3.9.2-alpha.1'
+    config = Config(str(semver_config))
+    config.version.bump(['major'])
+    config.save()
+    assert connection.current() == '4.0.0'
+
+
+def test_concurrent_requests(server):
+    def bump_and_read(_):
+        with Client(server.server_address) as connection:
+            connection.bump(['build'])
+            return connection.current()
+
+    with ThreadPoolExecutor(8) as executor:
+        list(executor.map(bump_and_read, range(40)))
+
+    with Client(server.server_address) as connection:
+        assert connection.current() == '3.9.2-alpha.1+build.40'
+
+
+def test_second_server_fails(server, semver_config):
+    with pytest.raises(MyverError):
+        VersionServer(server.server_address, str(semver_config))
+
+
+def test_stale_socket_removed(semver_config):
+    socket_path = f'{semver_config}.sock'
+    stale = VersionServer(socket_path, str(semver_config))
+    stale.socket.close()
+    VersionServer(socket_path, str(semver_config)).server_close()
+    assert not os.path.exists(socket_path)
+
+
+def test_client_run(semver_config, server, capsys):
+    assert client.run(['--config', str(semver_config),
+                       '-c', '-b', 'major', '-r', 'pre'])
+    captured = capsys.readouterr()
+    assert captured.out == ('3.9.2-alpha.1\n'
+                            '3.9.2-alpha.1  >>  4.0.0\n'
+                            '4.0.0  >>  4.0.0\n')
+
+
+def test_client_run_without_server(semver_config):
+    assert not client.run(['--config', str(semver_config), '-c'])
+
+
+def test_client_run_local_only_args(semver_config, server):
+    assert not client.run(['--config', str(semver_config), '-c', '-v'])
@@ -0,0 +1,67 @@
+import textwrap
+
+import pytest
+import ruamel.yaml
+
+from myver import simple_yaml
+
+
+def safe_load(text):
+    return ruamel.yaml.YAML(typ='safe').load(text)
+
+
+@pytest.mark.parametrize('text', [
+    '',
+    'parts:',
+    textwrap.dedent("""\
+        # comment
+        parts:
+            core:
+                value: 1   # trailing comment
+
+            pre:
+                value: null
+                prefix: '-#'
+                identifier: # in-line comment
+                    strings: [ 'alpha', "beta", rc ]
+                    start: ~
+            prenum:
+                value: -3
+                number:
+                    label: 'it''s'
+                    show-start: false
+            empty:
+    """),
+    'a:\n  b:\n    c: 1\n  d: []\ne: True\n',
+])
+def test_load_matches_safe_loader(text):
+    assert simple_yaml.load(text) == (safe_load(text) or {})
+
+
+@pytest.mark.parametrize('text', [
+    'a: 1.0',
+    'a: 010',
+    'a: 0x1f',
+    'a: .inf',
+    'a: &anchor 1',
+    'a: *anchor',
+    'a: {b: 1}',
+    'a: [[1]]',
+    'a: [1, ]',
+    'a: "\\n"',
+    'a: |\n  text',
+    '- a',
+    '---\na: 1',
+    'a: 1\na: 2',
+    'a:\n    b: 1\n  c: 2',
+    'a: 1\n  b: 2',
+    '"a": 1',
+    'a:\n\tb: 1',
+    '1: a',
+    'a:\n  true: 1',
+    'null: a',
+    '1.0: a',
+    '.inf: a',
+])
+def test_load_unsupported(text):
+    assert simple_yaml.load(text) is None
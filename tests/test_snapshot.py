@@ -0,0 +1,170 @@
+import itertools
+import threading
+from operator import attrgetter
+
+import pytest
+
+from myver.error import BumpError, ConfigError
+from myver.part import NumberPart
+from myver.snapshot import VersionSchema, VersionSnapshot
+
+
+@pytest.fixture
+def snapshot(semver) -> VersionSnapshot:
+    return VersionSnapshot.from_version(semver)
+
+
+def test_snapshot_str(snapshot):
+    assert str(snapshot) == '3.9.2-alpha.1'
+
+
+def test_snapshot_value(snapshot):
+    assert snapshot.value('pre') == 'alpha'
+    with pytest.raises(KeyError):
+        snapshot.value('bad')
+
+
+@pytest.mark.parametrize('args', [
+    ['prenum'],
+    ['minor'],
+    ['minor', 'patch'],
+    ['patch', 'dev'],
+    ['patch', 'pre', 'dev'],
+    ['dev'],
+    ['minor', 'pre=rc'],
+    ['pre', 'prenum=7'],
+])
+def test_snapshot_bump_matches_version(args, semver, snapshot):
+    bumped = snapshot.bump(args)
+    semver.bump(args)
+    assert bumped.values == tuple(part.value for part in semver.parts)
+    assert str(bumped) == str(semver)
+
+
+@pytest.mark.parametrize('keys', [
+    ['prenum'],
+    ['pre'],
+    ['minor'],
+    ['major'],
+])
+def test_snapshot_reset_matches_version(keys, semver, snapshot):
+    reset = snapshot.reset(keys)
+    semver.reset(keys)
+    assert reset.values == tuple(part.value for part in semver.parts)
+    assert str(reset) == str(semver)
+
+
+def test_snapshot_bump_does_not_mutate(snapshot):
+    bumped = snapshot.bump(['minor'])
+    assert str(snapshot) == '3.9.2-alpha.1'
+    assert str(bumped) == '3.10.0'
+    assert bumped.schema is snapshot.schema
+
+
+def test_snapshot_bump_errors(snapshot):
+    with pytest.raises(BumpError):
+        snapshot.bump(['pre=wrong'])
+    with pytest.raises(BumpError):
+        snapshot.bump(['pre=rc=alpha'])
+    with pytest.raises(KeyError):
+        snapshot.bump(['bad'])
+
+
+def test_snapshot_is_immutable(snapshot):
+    with pytest.raises(AttributeError):
+        snapshot.values = (1, 2, 3)
+
+
+def test_snapshot_hash(snapshot):
+    same = snapshot.bump(['prenum']).bump(['prenum=1'])
+    assert same == snapshot
+    assert len({snapshot, same, snapshot.bump(['prenum'])}) == 2
+    assert hash(same) == hash(snapshot)
+
+
+def test_snapshot_hash_invalid_value(snapshot):
+    values = list(snapshot.values)
+    values[snapshot.schema.index('pre')] = 'nope'
+    invalid = snapshot.schema.snapshot(values)
+    with pytest.raises(ValueError):
+        invalid.sort_key
+    assert invalid in {invalid}
+
+
+def test_snapshot_parse(semver, snapshot):
+    keys = ['major', 'minor', 'prenum']
+    assert snapshot.parse(keys) == semver.parse(keys)
+    assert snapshot.parse(['major', 'minor']) == '3.9'
+    assert snapshot.bump(['patch']).parse(keys) == '3.9'
+    assert snapshot.parse(['dev']) == semver.parse(['dev'])
+
+
+def test_snapshot_plan(semver, snapshot):
+    steps = ['prenum', 'prenum', 'pre', ['minor', 'dev']]
+    planned = list(snapshot.plan(steps))
+    assert [str(s) for s in planned] == list(semver.plan(steps))
+    assert str(snapshot) == '3.9.2-alpha.1'
+
+
+def test_snapshot_to_version(snapshot):
+    version = snapshot.bump(['minor']).to_version()
+    assert str(version) == '3.10.0'
+    version.bump(['major'])
+    assert str(snapshot) == '3.9.2-alpha.1'
+
+
+def test_snapshot_wrong_values_length(snapshot):
+    with pytest.raises(ValueError):
+        snapshot.schema.snapshot([1, 2])
+
+
+def test_schema_invalid_parts():
+    with pytest.raises(ConfigError):
+        VersionSchema([
+            NumberPart(key='one', value=3),
+            NumberPart(key='one', value=9),
+        ])
+
+
+def test_snapshot_shared_between_threads(snapshot):
+    results = []
+
+    def worker():
+        plan = snapshot.plan(itertools.repeat('prenum'))
+        results.append(str(list(itertools.islice(plan, 100))[-1]))
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert results == ['3.9.2-alpha.101'] * 8
+    assert str(snapshot) == '3.9.2-alpha.1'
+
+
+def test_snapshot_ordering(snapshot):
+    versions = [
+        snapshot.bump(['minor']),
+        snapshot.bump(['patch', 'dev']),
+        snapshot.bump(['pre']),
+        snapshot,
+        snapshot.bump(['patch']),
+        snapshot.reset(['pre']),
+        snapshot.reset(['pre']).bump(['dev']),
+    ]
+    assert [str(v) for v in sorted(versions)] == [
+        '3.9.2-alpha.1',
+        '3.9.2-beta.1',
+        '3.9.2',
+        '3.9.2+dev',
+        '3.9.3',
+        '3.9.3+dev',
+        '3.10.0',
+    ]
+    assert sorted(versions, key=attrgetter('sort_key')) == sorted(versions)
+    assert max(versions) == snapshot.bump(['minor'])
+
+
+def test_snapshot_sort_key_is_cached(snapshot):
+    assert snapshot.sort_key is snapshot.sort_key
@@ -0,0 +1,136 @@
+import os
+import sqlite3
+import subprocess
+import sys
+import textwrap
+
+import pytest
+
+from myver import api
+from myver.cli import cli_entry
+from myver.config import Config, load_version, load_read_only
+from myver.error import ConfigError, LockError
+from myver.state import StateStore, read_state
+
+PROCESSES = 8
+BUMPS = 10
+
+
+@pytest.fixture
+def state_config(tmp_path):
+    path = tmp_path / 'myver.yml'
+    path.write_text(textwrap.dedent(f"""\
+        state: 'state/myver.db'
+        files:
+            - path: '{tmp_path}/version.txt'
+        parts:
+            major:
+                value: 1
+                requires: build
+            build:
+                value: 5
+                prefix: '+'
+    """))
+    (tmp_path / 'version.txt').write_text('1+5\n')
+    return path
+
+
+def test_store(tmp_path):
+    path = str(tmp_path / 'state.db')
+    with StateStore(path) as store:
+        assert store.values() == {}
+        with store.transaction():
+            store.save({'major': 1, 'pre': 'alpha', 'build': None})
+        with pytest.raises(ValueError):
+            with store.transaction():
+                store.save({'major': 2})
+                raise ValueError()
+    assert read_state(path) == {'major': 1, 'pre': 'alpha', 'build': None}
+    with sqlite3.connect(path) as connection:
+        assert connection.execute('PRAGMA journal_mode').fetchone() == \
+            ('wal',)
+
+
+def test_store_busy(tmp_path):
+    path = str(tmp_path / 'state.db')
+    with StateStore(path) as store, store.transaction():
+        with StateStore(path, timeout=0.01) as other:
+            with pytest.raises(LockError):
+                with other.transaction():
+                    pass
+
+
+def test_read_state_missing(tmp_path):
+    assert read_state(str(tmp_path / 'missing.db')) == {}
+    assert not (tmp_path / 'missing.db').exists()
+
+
+def test_bump_saves_state(state_config):
+    text = state_config.read_text()
+    cli_entry(['--config', str(state_config), '--bump', 'build'])
+    assert read_state(str(state_config.parent / 'state' / 'myver.db')) == {
+        'major': 1, 'build': 6}
+    assert state_config.read_text() == text
+    assert (state_config.parent / 'version.txt').read_text() == '1+6\n'
+    assert str(Config(str(state_config)).version) == '1+6'
+    assert str(load_version(str(state_config))) == '1+6'
+    assert str(load_read_only(str(state_config)).version) == '1+6'
+
+
+def test_export(state_config, capsys):
+    cli_entry(['--config', str(state_config), '--bump', 'major'])
+    capsys.readouterr()
+    cli_entry(['--config', str(state_config), 'export'])
+    assert capsys.readouterr().out == \
+        f'Exported 2+0 to {state_config}\n'
+    text = state_config.read_text()
+    assert 'value: 2' in text and 'value: 0' in text
+    os.remove(state_config.parent / 'state' / 'myver.db')
+    assert str(Config(str(state_config)).version) == '2+0'
+
+
+def test_export_without_state(semver_config):
+    with pytest.raises(ConfigError):
+        Config(str(semver_config)).export()
+
+
+def test_invalid_state(tmp_path):
+    path = tmp_path / 'myver.yml'
+    path.write_text('state: [ a, b ]\nparts:\n    major:\n        value: 1\n')
+    with pytest.raises(ConfigError):
+        Config(str(path))
+
+
+def test_service_reloads_state(state_config):
+    api.clear_cache()
+    try:
+        assert api.current(str(state_config)) == '1+5'
+        cli_entry(['--config', str(state_config), '--bump', 'build'])
+        assert api.current(str(state_config)) == '1+6'
+        assert api.bump(str(state_config), ['build']) == '1+7'
+        assert str(Config(str(state_config)).version) == '1+7'
+    finally:
+        api.clear_cache()
+
+
+def test_concurrent_bumps(state_config):
+    script = textwrap.dedent(f"""\
+        from myver.cli import cli_entry
+        for _ in range({BUMPS}):
+            cli_entry(['--config', 'myver.yml', '--bump', 'build'])
+    """)
+    env = dict(os.environ, PYTHONPATH=os.getcwd())
+    processes = [
+        subprocess.Popen([sys.executable, '-c', script],
+                         cwd=state_config.parent, env=env,
+                         stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+        for _ in range(PROCESSES)
+    ]
+    for process in processes:
+        _, error = process.communicate()
+        assert process.returncode == 0, error.decode()
+
+    build = 5 + PROCESSES * BUMPS
+    assert str(Config(str(state_config)).version) == f'1+{build}'
+    assert (state_config.parent / 'version.txt').read_text() == \
+        f'1+{build}\n'
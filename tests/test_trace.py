@@ -0,0 +1,83 @@
+import json
+
+import pytest
+
+from myver import trace
+from myver.error import MyverError
+
+
+def read_events(path):
+    with open(path, 'r') as file:
+        return json.load(file)['traceEvents']
+
+
+def test_span_without_session():
+    with trace.span('nothing') as span:
+        span.count('items')
+        span.set(detail='ignored')
+    assert span is trace.NULL_SPAN
+
+
+def test_session_writes_spans(tmp_path):
+    path = tmp_path / 'trace.json'
+    with trace.session(str(path)):
+        with trace.span('outer', key='value') as span:
+            span.count('items')
+            span.count('items', 2)
+            with trace.span('inner'):
+                pass
+
+    events = {event['name']: event for event in read_events(path)}
+    assert set(events) == {'run', 'outer', 'inner'}
+    assert events['outer']['args'] == {'key': 'value', 'items': 3}
+    assert events['outer']['ph'] == 'X'
+    inner, outer = events['inner'], events['outer']
+    assert outer['ts'] <= inner['ts']
+    assert inner['ts'] + inner['dur'] <= outer['ts'] + outer['dur']
+
+
+def test_record_before_session(tmp_path):
+    path = tmp_path / 'trace.json'
+    trace.record('early', 1000, 3000, count=1)
+    with trace.session(str(path)):
+        pass
+    events = {event['name']: event for event in read_events(path)}
+    assert events['early']['ts'] == 1
+    assert events['early']['dur'] == 2
+    assert events['early']['args'] == {'count': 1}
+
+
+def test_record_dropped_without_session(tmp_path):
+    path = tmp_path / 'trace.json'
+    trace.record('early', 1000, 3000)
+    with trace.session(None):
+        pass
+    with trace.session(str(path)):
+        pass
+    assert [event['name'] for event in read_events(path)] == ['run']
+
+
+def test_session_captures(tmp_path):
+    path = tmp_path / 'trace.json'
+    with trace.session(str(path), ['cprofile', 'tracemalloc']):
+        with trace.span('allocate'):
+            data = [object() for _ in range(1000)]
+    del data
+    events = {event['name']: event for event in read_events(path)}
+    assert events['allocate']['args']['memory_allocated'] > 0
+    assert (tmp_path / 'trace.json.prof').exists()
+
+
+def test_session_bad_capture(tmp_path):
+    with pytest.raises(MyverError):
+        with trace.session(str(tmp_path / 'trace.json'), ['wrong']):
+            pass
+
+
+def test_settings_from_env(monkeypatch):
+    monkeypatch.setenv(trace.TRACE_ENV, 'env.json')
+    monkeypatch.setenv(trace.CAPTURE_ENV, 'cprofile,tracemalloc')
+    assert trace.settings(None, None) == \
+        ('env.json', ['cprofile', 'tracemalloc'])
+    assert trace.settings('arg.json', ['cprofile']) == \
+        ('arg.json', ['cprofile'])
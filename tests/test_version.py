@@ -1,3 +1,5 @@
+import itertools
+
 import pytest
 
 from myver.error import ConfigError, BumpError
@@ -8,51 +10,6 @@ from myver.version import (
 )
 
 
-@pytest.fixture
-def semver() -> Version:
-    parts = [
-        NumberPart(
-            key='major',
-            value=3,
-            requires='minor',
-        ),
-        NumberPart(
-            key='minor',
-            value=9,
-            prefix='.',
-            requires='patch',
-        ),
-        NumberPart(
-            key='patch',
-            value=2,
-            prefix='.',
-        ),
-        IdentifierPart(
-            key='pre',
-            value='alpha',
-            prefix='-',
-            requires='prenum',
-            strings=['alpha', 'beta', 'rc'],
-        ),
-        NumberPart(
-            key='prenum',
-            value=1,
-            prefix='.',
-            start=1,
-        ),
-        NumberPart(
-            key='dev',
-            value=None,
-            prefix='+',
-            label='dev',
-            label_suffix='.',
-            start=1,
-            show_start=False,
-        ),
-    ]
-    return Version(parts)
-
-
 def test_version_str(semver):
     assert str(semver) == '3.9.2-alpha.1'
 
@@ -224,3 +181,70 @@ def test_set_relationships():
     assert parts[0].parent is None
     assert parts[1].parent == parts[0]
     assert parts[2].parent == parts[1]
+
+
+def test_plan(semver):
+    plan = semver.plan(['prenum', 'prenum', 'pre', ['minor', 'dev']])
+    assert list(plan) == [
+        '3.9.2-alpha.2',
+        '3.9.2-alpha.3',
+        '3.9.2-beta.1',
+        '3.10.0+dev',
+    ]
+    assert str(semver) == '3.9.2-alpha.1'
+
+
+def test_plan_is_lazy(semver):
+    plan = semver.plan(itertools.repeat('prenum'))
+    assert list(itertools.islice(plan, 50))[-1] == '3.9.2-alpha.51'
+    assert str(semver) == '3.9.2-alpha.1'
+
+
+def test_plan_bad_key(semver):
+    with pytest.raises(KeyError):
+        list(semver.plan(['prenum', 'bad']))
+
+
+def test_copy(semver):
+    version = semver.copy()
+    version.bump(['minor'])
+    assert str(version) == '3.10.0'
+    assert str(semver) == '3.9.2-alpha.1'
+    assert version.part('minor').parent is version.part('major')
+
+
+def test_version_ordering(semver):
+    release = semver.copy()
+    release.bump(['pre=rc', 'pre'])
+    assert str(release) == '3.9.2'
+    assert semver < release
+    assert release > semver
+    assert semver <= semver.copy()
+    assert release >= semver
+    assert hash(semver) == hash(semver.copy())
+    assert len({semver, semver.copy(), release}) == 2
+
+    semver.part('pre').value = 'nope'
+    assert hash(semver) == hash(semver.copy())
+
+
+def test_version_eq_part_count(semver):
+    shorter = Version(semver.copy().parts[:-1])
+    assert shorter != semver
+    assert semver != shorter
+    assert len({semver, shorter}) == 2
+    assert semver.copy() in {semver: 1}
+    assert shorter not in {semver: 1}
+    assert semver != '3.9.2-alpha.1'
+
+
+def test_version_sort_key_custom_identifier_order():
+    parts = [
+        NumberPart(key='one', value=1),
+        IdentifierPart(key='two', value='zeta', strings=['zeta', 'alpha']),
+    ]
+    zeta = Version(parts)
+    alpha = zeta.copy()
+    alpha.bump(['two'])
+    assert str(alpha) == '1alpha'
+    assert zeta < alpha
@@ -0,0 +1,136 @@
+import io
+import json
+import os
+import threading
+import time
+
+import pytest
+
+from myver.watch import Watcher, Inotify, Poller, base_directory
+
+
+def events(output: io.StringIO):
+    return [json.loads(line) for line in output.getvalue().splitlines()]
+
+
+def inotify_available():
+    try:
+        Inotify().close()
+    except (OSError, AttributeError):
+        return False
+    return True
+
+
+@pytest.fixture
+def files(tmp_path):
+    (tmp_path / 'setup.py').write_text("version='1'\n")
+    (tmp_path / 'my' / 'path').mkdir(parents=True)
+    (tmp_path / 'my' / 'path' / 'a.md').write_text('# MyVer 1\n')
+    return tmp_path
+
+
+def test_watcher_load(sample_config, files):
+    (files / 'my' / 'path' / 'b.md').write_text('old\n')
+    output = io.StringIO()
+    watcher = Watcher(str(sample_config), output, poll=0.01)
+    assert events(output) == [
+        {'event': 'version', 'version': '1', 'files': 3, 'drift': 1},
+        {'event': 'drift', 'path': str(files / 'my' / 'path' / 'b.md'),
+         'lines': []},
+    ]
+    assert watcher.index[str(files / 'setup.py')] == [1]
+
+
+def test_watcher_handle(sample_config, files):
+    output = io.StringIO()
+    watcher = Watcher(str(sample_config), output, poll=0.01)
+    setup = str(files / 'setup.py')
+    output.seek(0)
+    output.truncate()
+
+    (files / 'setup.py').write_text("nothing\n")
+    watcher.handle({setup})
+    (files / 'setup.py').write_text("\nversion='1'\n")
+    watcher.handle({setup})
+    # Unchanged lines are not reported again.
+    watcher.handle({setup})
+
+    new_file = files / 'my' / 'path' / 'new.md'
+    new_file.write_text('nothing\n')
+    watcher.handle({str(new_file)})
+    new_file.unlink()
+    watcher.handle({str(new_file)})
+
+    assert events(output) == [
+        {'event': 'drift', 'path': setup, 'lines': []},
+        {'event': 'ok', 'path': setup, 'lines': [2]},
+        {'event': 'drift', 'path': str(new_file), 'lines': []},
+        {'event': 'removed', 'path': str(new_file)},
+    ]
+
+
+def test_watcher_config_change(sample_config, files):
+    output = io.StringIO()
+    watcher = Watcher(str(sample_config), output, poll=0.01)
+    output.seek(0)
+    output.truncate()
+
+    text = sample_config.read_text()
+    sample_config.write_text(text.replace('value: 1', 'value: 2'))
+    watcher.handle({str(sample_config)})
+    assert events(output)[0] == \
+        {'event': 'version', 'version': '2', 'files': 2, 'drift': 2}
+
+    sample_config.write_text('parts: [')
+    watcher.handle({str(sample_config)})
+    assert events(output)[-1]['event'] == 'error'
+    assert watcher.version == '2'
+
+
+def test_watcher_extended_config_change(extended_config):
+    output = io.StringIO()
+    watcher = Watcher(str(extended_config), output, poll=0.01)
+    semver = extended_config.parent.parent / 'shared' / 'semver.yml'
+    semver.write_text(semver.read_text().replace("'.'", "'-'"))
+    watcher.handle({str(semver)})
+    assert events(output)[-1]['version'] == '1-2-3'
+
+
+@pytest.mark.parametrize('backend', [
+    'poll',
+    pytest.param('inotify', marks=pytest.mark.skipif(
+        not inotify_available(), reason='inotify is not available')),
+])
+def test_watcher_run(sample_config, files, backend):
+    output = io.StringIO()
+    watcher = Watcher(str(sample_config), output,
+                      poll=0.01 if backend == 'poll' else None)
+    assert isinstance(watcher.backend,
+                      Poller if backend == 'poll' else Inotify)
+    stop = threading.Event()
+    thread = threading.Thread(target=watcher.run, args=(stop, 0.01))
+    thread.start()
+    try:
+        # Saves the way editors do, by renaming a new file over the old.
+        temp = files / 'setup.py.tmp'
+        temp.write_text("version='2'\n")
+        os.replace(temp, files / 'setup.py')
+        expected = {'event': 'drift', 'path': str(files / 'setup.py'),
+                    'lines': []}
+        deadline = time.monotonic() + 5
+        while expected not in events(output):
+            assert time.monotonic() < deadline
+            time.sleep(0.01)
+    finally:
+        stop.set()
+        thread.join()
+
+
+@pytest.mark.parametrize('pattern, expected', [
+    ('/a/b/*.md', '/a/b'),
+    ('/a/*/c.md', '/a'),
+    ('/a/b/c.md', '/a/b'),
+    ('/*.md', '/'),
+])
+def test_base_directory(pattern, expected):
+    assert base_directory(pattern) == expected
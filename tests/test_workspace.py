@@ -0,0 +1,114 @@
+import io
+import json
+import os
+import textwrap
+
+import pytest
+
+from myver.error import MyverError
+from myver.workspace import (
+    find_configs, file_ids, group_configs, run_workspace,
+)
+
+
+def write_package(root, name: str, value: int, files=()):
+    path = root / 'packages' / name
+    path.mkdir(parents=True)
+    files_yaml = ''.join(f"\n    - path: '{file}'" for file in files)
+    config = path / 'myver.yml'
+    config.write_text(f'files:{files_yaml or " []"}\n' + textwrap.dedent(f"""\
+        parts:
+            major:
+                value: {value}
+    """))
+    return config
+
+
+@pytest.fixture
+def workspace(tmp_path):
+    shared = tmp_path / 'CHANGELOG.md'
+    shared.write_text('version 1\n')
+    link = tmp_path / 'LINK.md'
+    os.link(shared, link)
+    write_package(tmp_path, 'b', 1, [shared])
+    write_package(tmp_path, 'a', 1, [link])
+    write_package(tmp_path, 'c', 7)
+    return tmp_path
+
+
+def run(pattern, requests):
+    output = io.StringIO()
+    run_workspace(pattern, requests, processes=2, output=output)
+    return [json.loads(line) for line in output.getvalue().splitlines()]
+
+
+def test_find_configs(workspace):
+    pattern = str(workspace / '**' / 'myver.yml')
+    assert find_configs(pattern) == [
+        str(workspace / 'packages' / name / 'myver.yml')
+        for name in ['a', 'b', 'c']
+    ]
+
+
+def test_group_configs_shared_files(workspace):
+    configs = find_configs(str(workspace / 'packages' / '*' / 'myver.yml'))
+    ids = [file_ids(config) for config in configs]
+    assert group_configs(configs, ids) == [configs[:2], configs[2:]]
+
+
+def test_group_configs_transitive():
+    configs = ['a', 'b', 'c', 'd']
+    ids = [{(0, 1)}, {(0, 2)}, {(0, 1), (0, 2)}, {(0, 3)}]
+    assert group_configs(configs, ids) == [['a', 'b', 'c'], ['d']]
+
+
+def test_run_workspace_current(workspace):
+    results = run(str(workspace / 'packages' / '*' / 'myver.yml'),
+                  [{'op': 'current'}])
+    assert [result['responses'][0]['version'] for result in results] == [
+        '1', '1', '7']
+    assert [os.path.basename(os.path.dirname(result['config']))
+            for result in results] == ['a', 'b', 'c']
+
+
+def test_run_workspace_bump_shared(workspace):
+    results = run(str(workspace / 'packages' / '*' / 'myver.yml'),
+                  [{'op': 'bump', 'args': ['major']}])
+    assert [result['responses'][0]['new'] for result in results] == [
+        '2', '2', '8']
+    # The first config updates the shared file, the second then finds
+    # nothing left to change.
+    assert (workspace / 'CHANGELOG.md').read_text() == 'version 2\n'
+
+
+def test_run_workspace_failures(workspace):
+    (workspace / 'CHANGELOG.md').write_text('no version\n')
+    with pytest.raises(MyverError):
+        run(str(workspace / 'packages' / '*' / 'myver.yml'),
+            [{'op': 'check'}])
+
+
+def test_run_workspace_no_configs(tmp_path):
+    with pytest.raises(MyverError):
+        run(str(tmp_path / '*.yml'), [{'op': 'current'}])
+
+
+def test_run_workspace_relative_paths(tmp_path, monkeypatch):
+    (tmp_path / 'version.txt').write_text('1\n')
+    for name in ['a', 'b']:
+        config = write_package(tmp_path, name, 1, ['version.txt'])
+        (config.parent / 'version.txt').write_text('1\n')
+    monkeypatch.chdir(tmp_path)
+
+    configs = find_configs('packages/*/myver.yml')
+    ids = [file_ids(config) for config in configs]
+    assert group_configs(configs, ids) == [[configs[0]], [configs[1]]]
+
+    results = run('packages/*/myver.yml', [{'op': 'bump', 'args': ['major']},
+                                           {'op': 'check'}])
+    assert all(result['ok'] for result in results)
+    assert (tmp_path / 'version.txt').read_text() == '1\n'
+    for name in ['a', 'b']:
+        assert (tmp_path / 'packages' / name / 'version.txt').read_text() \
+            == '2\n'
+    assert os.getcwd() == str(tmp_path)